@@ -0,0 +1,117 @@
+# backend/app/config.py
+"""
+Application settings read from environment variables
+"""
+import os
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """
+    Read a true/false flag from the environment.
+    Accepts 1/0, true/false, yes/no, on/off.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+# Recipe matching engine used by /api/recipes/suggestions
+# "sql"    - aggregate query against Postgres on every request (default)
+# "memory" - in-process inverted index with per-recipe ingredient bitsets
+MATCHING_ENGINE = os.getenv("MATCHING_ENGINE", "sql").strip().lower()
+
+# Seconds before the in-memory recipe index is reloaded from the database.
+# Recipes created through this process are added right away, so this only
+# matters for changes made by other workers or scripts. 0 = never reload.
+MATCHING_INDEX_TTL = env_int("MATCHING_INDEX_TTL", 300)
+
+# Directory for the shared recipe snapshot (app/services/recipe_snapshot.py).
+# When set, the "memory" engine maps one read-only CSR file shared by all
+# workers instead of building a RecipeIndex in each of them.
+RECIPE_SNAPSHOT_DIR = os.getenv("RECIPE_SNAPSHOT_DIR", "")
+
+# LSH shape of the recipe similarity index (app/services/similarity.py).
+# Signatures have BANDS * ROWS MinHash slots; recipes become candidates
+# above roughly (1 / BANDS) ** (1 / ROWS) Jaccard similarity. More bands
+# raise recall at the cost of more candidates per query.
+SIMILARITY_BANDS = env_int("SIMILARITY_BANDS", 32)
+SIMILARITY_ROWS = env_int("SIMILARITY_ROWS", 3)
+
+# Per-user cache of suggestion results. Entries are dropped when the
+# user's inventory changes or a recipe is added - but only in the worker
+# that handled the write, so with several workers the TTL bounds how long
+# the others can serve results from before it. Size 0 disables it.
+SUGGESTION_CACHE_SIZE = env_int("SUGGESTION_CACHE_SIZE", 1024)
+SUGGESTION_CACHE_TTL = env_int("SUGGESTION_CACHE_TTL", 60)
+
+# Request coalescing for suggestions (app/services/single_flight.py)
+# SINGLE_FLIGHT          - identical concurrent requests share one computation
+# SINGLE_FLIGHT_DIR      - also share across the workers on this host through
+#                          a lock file and result files in this directory
+# SINGLE_FLIGHT_TIMEOUT  - seconds to wait for another computation before
+#                          running the query anyway
+SINGLE_FLIGHT = env_bool("SINGLE_FLIGHT", True)
+SINGLE_FLIGHT_DIR = os.getenv("SINGLE_FLIGHT_DIR", "")
+SINGLE_FLIGHT_TIMEOUT = env_int("SINGLE_FLIGHT_TIMEOUT", 10)
+
+# Ingredient autocomplete backend for /api/ingredients/search
+# "sql"    - ranked ILIKE query (trigram GIN index on Postgres) (default)
+# "memory" - in-process prefix + n-gram index
+INGREDIENT_SEARCH_ENGINE = os.getenv("INGREDIENT_SEARCH_ENGINE", "sql").strip().lower()
+INGREDIENT_INDEX_TTL = env_int("INGREDIENT_INDEX_TTL", 300)
+
+# "sync"  - routers run as threadpool `def` handlers on SessionLocal (default)
+# "async" - recipe, ingredient and inventory endpoints run as `async def`
+#           handlers on an asyncpg engine; anything without an async
+#           version still falls through to the sync handler
+DB_MODE = os.getenv("DB_MODE", "sync").strip().lower()
+
+# Connection pool settings (ignored for SQLite)
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = env_int("DB_POOL_TIMEOUT", 30)      # seconds to wait for a free connection
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)    # seconds before a connection is replaced, -1 = never
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)  # test connections on checkout
+
+# Connections opened at startup so the first requests don't pay for them
+# (capped at DB_POOL_SIZE; 0 = open lazily)
+DB_POOL_WARMUP = env_int("DB_POOL_WARMUP", DB_POOL_SIZE)
+
+# Read replicas (DATABASE_READ_URL, see app/database.py): for this many
+# seconds after a client writes, its reads stay on the primary. Keep it
+# above the worst replication lag. 0 = always read from the replicas.
+READ_AFTER_WRITE_WINDOW = env_int("READ_AFTER_WRITE_WINDOW", 5)
+
+# Set when connecting through PgBouncer in transaction pooling mode:
+# turns off server-side prepared statement caching
+DB_PGBOUNCER = env_bool("DB_PGBOUNCER", False)
+
+# HTTP caching of catalog endpoints (see app/http_cache.py)
+# CATALOG_VERSION_TTL   - seconds a worker trusts its cached catalog versions;
+#                         writes made by other workers show up after this
+# HTTP_CACHE_MAX_AGE    - Cache-Control max-age for catalog responses (0 = always revalidate)
+CATALOG_VERSION_TTL = env_int("CATALOG_VERSION_TTL", 2)
+HTTP_CACHE_MAX_AGE = env_int("HTTP_CACHE_MAX_AGE", 60)
+
+# Hot read endpoints (suggestions, search, recipe detail) return pre-built
+# dicts without response_model validation, encoded with orjson if installed
+FAST_JSON = env_bool("FAST_JSON", False)
+
+# Per-request SQL statistics (see app/query_stats.py)
+# QUERY_DEBUG           - add X-Query-* response headers
+# QUERY_BUDGET          - warn when a request runs more statements than this (0 = off)
+# QUERY_BUDGET_STRICT   - raise instead of warning (use in test runs)
+# N_PLUS_ONE_THRESHOLD  - same statement this many times in one request = N+1
+QUERY_DEBUG = env_bool("QUERY_DEBUG", False)
+QUERY_BUDGET = env_int("QUERY_BUDGET", 0)
+QUERY_BUDGET_STRICT = env_bool("QUERY_BUDGET_STRICT", False)
+N_PLUS_ONE_THRESHOLD = env_int("N_PLUS_ONE_THRESHOLD", 3)
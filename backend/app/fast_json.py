@@ -0,0 +1,44 @@
+# backend/app/fast_json.py
+"""
+Opt-in fast JSON responses for the hot read endpoints (FAST_JSON=1).
+
+Normally FastAPI validates a handler's return value against its
+response_model, converts it to JSON-compatible data and encodes it with
+the stdlib json module. Handlers on the fast path build plain dicts that
+are already in the response shape and return fast_response(), which
+skips the validation and encodes with orjson when it is installed.
+
+benchmarks/serialization.py measures the difference.
+"""
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON; content must already be JSON types (no Decimal, datetime...)"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """
+    Wrap pre-built content. Pass the handler's injected `response` so
+    headers set by dependencies (ETags) are kept - FastAPI only merges
+    them into responses it builds itself.
+    """
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content, headers=headers)
@@ -0,0 +1,143 @@
+# backend/app/http_cache.py
+"""
+ETags and conditional GETs for the catalog endpoints.
+
+Every write to the recipe or ingredient catalog bumps a counter in
+catalog_versions. Catalog responses carry a strong ETag derived from the
+request URL and the versions of the tables they read, so the ETag only
+changes when the data behind the response does.
+
+Workers keep the versions in memory for CATALOG_VERSION_TTL seconds, so
+a request with a matching If-None-Match gets its 304 without touching
+the database. A worker's own writes refresh its copy immediately.
+"""
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.config import CATALOG_VERSION_TTL, HTTP_CACHE_MAX_AGE
+from app.database import SessionLocal
+from app.models.recipe import CatalogVersion
+from app.services.inventory_sync import INSERT_DIALECTS
+
+RECIPES = "recipes"
+INGREDIENTS = "ingredients"
+
+
+class CatalogVersions:
+    """In-process copy of the catalog_versions table, reloaded after a TTL"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        # When this worker last saw a version move (see app/read_routing.py)
+        self.changed_at: Optional[float] = None
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            fresh = self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+            if fresh:
+                return self._versions.get(name, 0)
+
+        db = SessionLocal()
+        try:
+            versions = dict(db.execute(select(CatalogVersion.name, CatalogVersion.version)).all())
+        finally:
+            db.close()
+
+        with self._lock:
+            if self._loaded_at is not None and versions != self._versions:
+                self.changed_at = time.monotonic()
+            self._versions = versions
+            self._loaded_at = time.monotonic()
+        return versions.get(name, 0)
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+            self.changed_at = time.monotonic()
+
+    def changed_within(self, seconds: float) -> bool:
+        changed_at = self.changed_at
+        return changed_at is not None and time.monotonic() - changed_at < seconds
+
+
+catalog_versions = CatalogVersions(ttl=CATALOG_VERSION_TTL)
+
+
+def bump_catalog_version(db: Session, *names: str):
+    """
+    Increment the version of each catalog table in `names`.
+    Runs in the caller's transaction; this worker's cached versions are
+    dropped when it commits. An upsert, so two transactions creating the
+    same table's first row don't collide.
+    """
+    insert = INSERT_DIALECTS[db.get_bind().dialect.name]
+    for name in sorted(set(names)):
+        stmt = insert(CatalogVersion).values(name=name, version=1)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[CatalogVersion.name],
+            set_={"version": CatalogVersion.version + 1},
+        ))
+    db.info["catalog_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session):
+    if session.info.pop("catalog_changed", False):
+        catalog_versions.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("catalog_changed", None)
+
+
+def make_etag(request: Request, tables) -> str:
+    """Strong ETag for this URL at the current catalog versions"""
+    versions = ",".join(f"{name}={catalog_versions.get(name)}" for name in tables)
+    key = f"{request.url.path}?{request.url.query}|{versions}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:24] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cache_control() -> str:
+    if HTTP_CACHE_MAX_AGE > 0:
+        return f"public, max-age={HTTP_CACHE_MAX_AGE}"
+    return "no-cache"
+
+
+def catalog_etag(*tables: str):
+    """
+    Dependency for catalog GET endpoints.
+
+    Adds ETag and Cache-Control headers, and answers 304 Not Modified
+    before the endpoint runs when the client's copy is current.
+
+        @router.get("/", dependencies=[Depends(catalog_etag(RECIPES))])
+    """
+    def dependency(request: Request, response: Response):
+        etag = make_etag(request, tables)
+        headers = {"ETag": etag, "Cache-Control": cache_control()}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
@@ -1,14 +1,59 @@
-from app.database import engine, Base
-from app.models.recipe import Recipe,Ingredient, RecipeIngredient, UserInventory
+"""
+Schema migration step - run before starting the API (the app itself
+never creates or alters tables):
+
+    python -m app.init_db
+"""
+from sqlalchemy import text
+from app.database import get_engine, Base, SessionLocal
+from app.models.recipe import (
+    Recipe, Ingredient, RecipeIngredient, UserInventory, RecipeSummary, RECIPE_SEARCH_DDL
+)
+from app.services.recipe_summary import refresh_recipe_summaries
+
+# Indexes added after the first release; create_all() skips tables that
+# already exist, so they are applied here as well (Postgres)
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_ingredients_name_trgm ON ingredients USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_recipe_ingredients_ingredient_id ON recipe_ingredients (ingredient_id)",
+    "CREATE INDEX IF NOT EXISTS ix_recipe_ingredients_recipe_id ON recipe_ingredients (recipe_id)",
+    "CREATE INDEX IF NOT EXISTS ix_recipes_name_id ON recipes (name, id)",
+    # Drop duplicate inventory rows before enforcing one row per user+ingredient
+    """
+    DELETE FROM user_inventory a USING user_inventory b
+    WHERE a.user_id = b.user_id AND a.ingredient_id = b.ingredient_id AND a.id > b.id
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_user_inventory_user_ingredient ON user_inventory (user_id, ingredient_id)",
+    *RECIPE_SEARCH_DDL,
+]
 
 def init_db():
     """
     Create all database tables
     """
 
+    engine = get_engine()
+
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for statement in POSTGRES_DDL:
+                conn.execute(text(statement))
+
     print("✅ Tables created successfully!")
 
+    # Backfill summaries for recipes written before the table existed
+    print("Rebuilding recipe summaries...")
+    db = SessionLocal()
+    try:
+        refresh_recipe_summaries(db)
+        db.commit()
+    finally:
+        db.close()
+    print("✅ Recipe summaries rebuilt!")
+
 if __name__ == "__main__":
     init_db()
\ No newline at end of file
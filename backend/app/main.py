@@ -1,16 +1,34 @@
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routers import recipes, ingredients, inventory
+from fastapi.responses import JSONResponse
+from app.config import DB_MODE
+from app.query_stats import QueryStatsMiddleware
+from app.read_routing import ReadYourWritesMiddleware
+from app.routers import recipes, ingredients, inventory, metrics
+from app.startup import startup_state, readiness
+
+# Tables are created and migrated by `python -m app.init_db`, not on import
 
-# Create database tables on startup
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up connections and indexes before serving; failures don't stop the worker"""
+    started = time.perf_counter()
+    await startup_state.warm_up()
+    startup_state.record("startup_total", started)
+    print(startup_state.report(), flush=True)
+    yield
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Dinner Tonight! API",
     description="App for matching recipes to your ingredient inventory",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Config CORS - allows frontend to call backend
@@ -26,10 +44,26 @@ app.add_middleware(
     allow_headers=["*"],            # Allow all headers
 )
 
+# Count/time SQL per request and flag N+1 query patterns
+app.add_middleware(QueryStatsMiddleware)
+
+# Keep a client's reads on the primary right after it writes (read replicas)
+app.add_middleware(ReadYourWritesMiddleware)
+
 # Include routers
+if DB_MODE == "async":
+    # Registered first so they take precedence; anything they don't
+    # define is still served by the sync routers below
+    from app.routers import recipes_async, ingredients_async, inventory_async
+
+    app.include_router(recipes_async.router, prefix="/api/recipes", tags=["recipes"])
+    app.include_router(ingredients_async.router, prefix="/api/ingredients", tags=["ingredients"])
+    app.include_router(inventory_async.router, prefix="/api/inventory", tags=["inventory"])
+
 app.include_router(recipes.router, prefix="/api/recipes", tags=["recipes"])
 app.include_router(ingredients.router, prefix="/api/ingredients", tags=["ingredients"])
 app.include_router(inventory.router, prefix="/api/inventory", tags=["inventory"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
 
 @app.get("/")
 def read_root():
@@ -41,6 +75,18 @@ def read_root():
     }
 
 @app.get("/health")
+@app.get("/health/live")
 def health_check():
-    """Health check endpoint"""
-    return {"ststus": "healthy"}
+    """Liveness - the process is up and serving requests"""
+    return {"status": "healthy"}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness - the database answers and warm-up has finished (503 otherwise)"""
+    ready, details = await readiness()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not ready", **details}
+    )
+
+startup_state.record("import", _import_started)
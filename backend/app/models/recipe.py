@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Numeric
+from sqlalchemy import (
+    ARRAY, JSON, Column, Integer, String, Text, ForeignKey, Numeric, DDL, Index, UniqueConstraint, event
+)
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -7,6 +9,10 @@ class Recipe(Base):
     Recipes table - stores recipe information
     """
     __tablename__ = "recipes"
+    __table_args__ = (
+        # Keyset pagination by name walks (name, id)
+        Index("ix_recipes_name_id", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
@@ -30,6 +36,42 @@ class Ingredient(Base):
     category = Column(String(50)) # e.g. "protien", "vegetable", "spice"
 
 
+# Trigram index so substring searches (name ILIKE '%q%') don't scan the table.
+# Postgres only - pg_trgm has to be enabled before the index can be built.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+event.listen(
+    Ingredient.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_ingredients_name_trgm "
+        "ON ingredients USING gin (name gin_trgm_ops)"
+    ).execute_if(dialect="postgresql")
+)
+
+
+# Full-text search (app/services/recipe_search.py). The tsvector is a stored
+# generated column - name weighted A, description B, instructions C - kept
+# out of the ORM model so it is never loaded with a recipe. Postgres only.
+RECIPE_SEARCH_DDL = [
+    """
+    ALTER TABLE recipes ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(instructions, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_recipes_search_vector ON recipes USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_recipes_cooking_time ON recipes (cooking_time)",
+]
+for statement in RECIPE_SEARCH_DDL:
+    event.listen(Recipe.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
 class RecipeIngredient(Base):
     """
     Junction table linking recipes to ingredients with quantities
@@ -37,8 +79,8 @@ class RecipeIngredient(Base):
     __tablename__ = "recipe_ingredients"
 
     id = Column(Integer, primary_key=True)
-    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False)
-    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), nullable=False)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    ingredient_id = Column(Integer, ForeignKey("ingredients.id"), nullable=False, index=True)
     quantity = Column(Numeric(10, 2)) # e.g., 2.5
     unit = Column(String(20)) # e.g., "cups", "tbsp"
     notes = Column(String(100)) # e.g., "diced", "minced"
@@ -48,11 +90,40 @@ class RecipeIngredient(Base):
     ingredient = relationship("Ingredient")
 
 
+class RecipeSummary(Base):
+    """
+    Denormalized per-recipe ingredient data used by recipe matching.
+    Rebuilt by app.services.recipe_summary whenever a recipe's
+    recipe_ingredients rows are written.
+    """
+    __tablename__ = "recipe_summaries"
+
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True)
+    total_ingredients = Column(Integer, nullable=False, index=True) # recipe_ingredients rows
+    ingredient_ids = Column(ARRAY(Integer).with_variant(JSON(), "sqlite"), nullable=False) # sorted
+    cooking_time = Column(Integer)
+
+
+class CatalogVersion(Base):
+    """
+    Change counter per catalog table, bumped on every write.
+    Drives the ETags of the catalog endpoints (app/http_cache.py).
+    """
+    __tablename__ = "catalog_versions"
+
+    name = Column(String(50), primary_key=True) # e.g. "recipes", "ingredients"
+    version = Column(Integer, nullable=False, default=0)
+
+
 class UserInventory(Base):
     """
     User's ingredient inventory - what thwy currently have
     """
     __tablename__ = "user_inventory"
+    __table_args__ = (
+        # One row per ingredient per user - also the ON CONFLICT target for syncs
+        UniqueConstraint("user_id", "ingredient_id", name="uq_user_inventory_user_ingredient"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, default=1)
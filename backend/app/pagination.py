@@ -0,0 +1,98 @@
+# backend/app/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort key of the last
+row on the previous page. The next page is fetched with
+WHERE (sort columns) > (cursor values), which an index can seek to
+directly, unlike OFFSET which has to walk every skipped row.
+"""
+import base64
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Pack a sort key into an opaque cursor string"""
+    payload = json.dumps({"s": sort, "k": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Optional[List[Any]]:
+    """
+    Unpack a cursor made by encode_cursor().
+    An empty cursor means "first page" and returns None.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        cursor_sort = payload["s"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Sort keys are plain scalars; anything else wasn't made by encode_cursor()
+    if not isinstance(values, list) or not all(isinstance(value, (str, int, float)) for value in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor was created with a different sort order")
+    return values
+
+
+def keyset_filter(query, columns: Sequence, sort: str, cursor: str, limit: int):
+    """
+    Restrict a Query or select() to the page after `cursor`.
+    Fetches one extra row so keyset_result() can tell if there is a next page.
+    """
+    values = decode_cursor(cursor, sort)
+    if values is not None:
+        if len(values) != len(columns):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(*columns) > tuple_(*values))
+    return query.order_by(*columns).limit(limit + 1)
+
+
+def keyset_result(
+    rows: list,
+    sort: str,
+    limit: int,
+    key: Callable[[Any], Sequence[Any]]
+) -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row and build the next cursor"""
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(sort, key(rows[-1]))
+
+
+def keyset_page(
+    query: Query,
+    columns: Sequence,
+    sort: str,
+    cursor: str,
+    limit: int,
+    key: Callable[[Any], Sequence[Any]]
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page of `query` ordered by `columns`.
+
+    Args:
+        columns: Sort columns - the last one must be unique (e.g. id)
+        sort: Name of the sort order, stored in the cursor
+        cursor: Cursor from the previous page, or "" for the first page
+        limit: Page size
+        key: Returns the sort values for a row, matching `columns`
+
+    Returns:
+        (rows, next_cursor) - next_cursor is None on the last page
+    """
+    rows = keyset_filter(query, columns, sort, cursor, limit).all()
+    return keyset_result(rows, sort, limit, key)
@@ -0,0 +1,148 @@
+# backend/app/pool_metrics.py
+"""
+Connection pool instrumentation.
+
+The engines use InstrumentedQueuePool, which times how long each checkout
+waits for a connection. Pool events count checkouts and connection churn
+(connections opened, closed and invalidated).
+"""
+import bisect
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is +Inf
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000]
+
+
+class PoolMetrics:
+    """Counters and a wait-time histogram for one engine's pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        ms = seconds * 1000
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum_ms += ms
+            self.wait_max_ms = max(self.wait_max_ms, ms)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, ms)] += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool=None) -> dict:
+        """Current counters, plus live pool state when `pool` is given"""
+        with self._lock:
+            histogram = {}
+            cumulative = 0
+            for bound, count in zip(WAIT_BUCKETS_MS + ["+Inf"], self.wait_buckets):
+                cumulative += count
+                histogram[f"le_{bound}"] = cumulative
+
+            data = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connections_opened": self.connects,
+                "connections_closed": self.closes,
+                "connections_invalidated": self.invalidations,
+                "checkout_timeouts": self.timeouts,
+                "wait_ms": {
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum_ms, 3),
+                    "max": round(self.wait_max_ms, 3),
+                    "histogram": histogram,
+                },
+            }
+
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "status": pool.status(),
+            })
+        return data
+
+
+class _TimedCheckoutMixin:
+    """Times the wait for a pooled connection"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics:
+            self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool - keep reporting to the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Metrics for every instrumented engine, by name
+_registry: Dict[str, tuple] = {}
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """
+    Attach metrics to an engine created with one of the instrumented pools
+    (sync Engine or the sync_engine of an AsyncEngine).
+    """
+    metrics = PoolMetrics(name)
+    engine.pool.metrics = metrics
+
+    event.listen(engine, "checkout", lambda *args: metrics.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *args: metrics.increment("checkins"))
+    event.listen(engine, "connect", lambda *args: metrics.increment("connects"))
+    event.listen(engine, "close", lambda *args: metrics.increment("closes"))
+    event.listen(engine, "close_detached", lambda *args: metrics.increment("closes"))
+    event.listen(engine, "invalidate", lambda *args: metrics.increment("invalidations"))
+
+    _registry[name] = (engine, metrics)
+    return metrics
+
+
+def pool_stats() -> dict:
+    """Snapshot of every instrumented pool, for the metrics endpoint"""
+    return {
+        name: metrics.snapshot(engine.pool)
+        for name, (engine, metrics) in _registry.items()
+    }
@@ -0,0 +1,129 @@
+# backend/app/query_stats.py
+"""
+Per-request SQL statement counting and N+1 detection.
+
+Engine-level cursor events count and time every statement executed while
+a QueryStats collector is active for the current context. Statements are
+grouped by shape (the SQL text with IN-lists and literals collapsed), so
+the same query run once per row shows up as a repeated shape.
+
+QueryStatsMiddleware opens a collector per request, logs N+1 patterns
+and budget overruns, and in debug mode adds X-Query-* headers.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config import QUERY_DEBUG, QUERY_BUDGET, QUERY_BUDGET_STRICT, N_PLUS_ONE_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\([^)]*\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\([^)]*\)s|\$\d+|:\w+))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more statements than allowed"""
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats with different parameters compare equal"""
+    shape = _STRING.sub("?", statement)
+    shape = _NUMBER.sub("N", shape)
+    shape = _IN_LIST.sub("(...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements executed within one request (or track_queries block)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_ms += elapsed * 1000
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statement shapes run at least `threshold` times - likely N+1"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect statement stats for everything run inside the block.
+
+        with track_queries() as stats:
+            service.find_matching_recipes(user_id=1)
+        assert stats.count <= 2
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    started = conn.info.get("query_started")
+    elapsed = time.perf_counter() - started.pop() if started else 0.0
+    stats.record(statement, elapsed)
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Tracks the statements each request runs.
+
+    - logs repeated statement shapes (N+1) and budget overruns
+    - QUERY_DEBUG: adds X-Query-Count, X-Query-Time-Ms and X-Query-Repeated headers
+    - QUERY_BUDGET_STRICT: raises QueryBudgetExceeded so test runs fail
+    """
+
+    async def dispatch(self, request, call_next):
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        path = request.url.path
+        repeated = stats.repeated()
+        for shape, n in repeated:
+            logger.warning("Possible N+1 on %s: %d x %s", path, n, shape[:200])
+
+        if QUERY_BUDGET and stats.count > QUERY_BUDGET:
+            message = f"{request.method} {path} ran {stats.count} SQL statements (budget {QUERY_BUDGET})"
+            if QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        if QUERY_DEBUG:
+            response.headers["X-Query-Count"] = str(stats.count)
+            response.headers["X-Query-Time-Ms"] = f"{stats.total_ms:.2f}"
+            response.headers["X-Query-Repeated"] = str(len(repeated))
+
+        return response
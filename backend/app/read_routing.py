@@ -0,0 +1,94 @@
+# backend/app/read_routing.py
+"""
+Read-your-writes protection for replica reads.
+
+Reads served by get_read_db go to a replica (DATABASE_READ_URL), which
+can lag the primary. For READ_AFTER_WRITE_WINDOW seconds after a write,
+that client's reads go to the primary instead. A write is any successful
+POST/PUT/PATCH/DELETE request, and is remembered two ways:
+
+- a cookie with the write time, so any worker sees it
+- an in-process record per user_id, for clients that drop cookies
+  (only the worker that handled the write knows about it)
+
+Catalog writes affect everyone, and catalog ETags come from the primary's
+catalog_versions, so after a worker sees a catalog version move all of
+its reads stay on the primary for the window too - otherwise a replica
+could serve old data under the new ETag.
+"""
+import threading
+import time
+from typing import Dict
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.config import READ_AFTER_WRITE_WINDOW
+
+COOKIE_NAME = "db_last_write"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# POST endpoints that only read
+READ_ONLY_PATHS = {"/api/recipes/suggestions/batch", "/api/recipes/shopping-list"}
+
+
+class RecentWrites:
+    """user_id -> time until which that user's reads stay on the primary"""
+
+    def __init__(self, window: float):
+        self.window = window
+        self._lock = threading.Lock()
+        self._until: Dict[str, float] = {}
+
+    def mark(self, user_id: str):
+        now = time.monotonic()
+        with self._lock:
+            self._until[user_id] = now + self.window
+            if len(self._until) > 10000:
+                self._until = {key: until for key, until in self._until.items() if until > now}
+
+    def active(self, user_id: str) -> bool:
+        with self._lock:
+            until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+
+recent_writes = RecentWrites(READ_AFTER_WRITE_WINDOW)
+
+
+def _user_key(request: Request) -> str:
+    # Endpoints take user_id as a query parameter, defaulting to user 1
+    return request.query_params.get("user_id", "1")
+
+
+def prefers_primary(request: Request) -> bool:
+    """True while this client's last write may not have reached the replicas"""
+    if READ_AFTER_WRITE_WINDOW <= 0:
+        return False
+    try:
+        written_at = float(request.cookies.get(COOKIE_NAME, ""))
+    except ValueError:
+        written_at = None
+    if written_at is not None and time.time() - written_at < READ_AFTER_WRITE_WINDOW:
+        return True
+    if recent_writes.active(_user_key(request)):
+        return True
+
+    from app.http_cache import catalog_versions  # imports app.database
+
+    return catalog_versions.changed_within(READ_AFTER_WRITE_WINDOW)
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Records successful writes and sets the last-write cookie"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        wrote = request.method in WRITE_METHODS and request.url.path not in READ_ONLY_PATHS
+        if wrote and response.status_code < 400 and READ_AFTER_WRITE_WINDOW > 0:
+            recent_writes.mark(_user_key(request))
+            response.set_cookie(
+                COOKIE_NAME, f"{time.time():.3f}",
+                max_age=READ_AFTER_WRITE_WINDOW, httponly=True, samesite="lax"
+            )
+        return response
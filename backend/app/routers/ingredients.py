@@ -1,38 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List
-from app.database import get_db
-from app.schemas.recipe import Ingredient, IngredientCreate
+from typing import List, Literal, Optional, Union
+from app.database import get_db, get_read_db
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version, catalog_etag
+from app.pagination import keyset_page
+from app.schemas.recipe import Ingredient, IngredientCreate, IngredientPage
 from app.models.recipe import Ingredient as IngredientModel
+from app.services.ingredient_search import search_ingredients as run_ingredient_search, index_ingredient
 
 router = APIRouter()
 
-@router.get("/search")
+@router.get("/search", dependencies=[Depends(catalog_etag(INGREDIENTS, RECIPES))])
 def search_ingredients(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(default=10, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Search for ingredients by name.
-    Returns ingredients that match the search query.
+    Returns ingredients that match the search query, names starting with
+    the query first, then the most used ingredients.
     """
-    # Case-intensive search
-    search_pattern = f"%{q.lower()}%"
-
-    ingredients = db.query(IngredientModel).filter(
-        IngredientModel.name.ilike(search_pattern)
-    ).limit(limit).all()
-
-    return [
-        {
-            "id": ing.id,
-            "name": ing.name,
-            "category": ing.category
-        }
-        for ing in ingredients
-    ]
+    return run_ingredient_search(db, q, limit)
 
 @router.post("/", response_model=Ingredient, status_code=201)
 def create_ingredient(ingredient: IngredientCreate, db: Session = Depends(get_db)):
@@ -52,19 +41,36 @@ def create_ingredient(ingredient: IngredientCreate, db: Session = Depends(get_db
         category=ingredient.category
     )
     db.add(db_ingredient)
+    bump_catalog_version(db, INGREDIENTS)
     db.commit()
     db.refresh(db_ingredient)
+    index_ingredient(db_ingredient)
 
     return db_ingredient
 
-@router.get("/", response_model=List[Ingredient])
+@router.get("/", response_model=Union[IngredientPage, List[Ingredient]], dependencies=[Depends(catalog_etag(INGREDIENTS))])
 def list_ingredients(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(default=None, description="Pass an empty cursor to start cursor pagination"),
+    sort: Literal["id", "name"] = Query(default="id", description="Sort order for cursor pagination"),
+    db: Session = Depends(get_read_db)
 ):
     """
     List all ingredients with pagination.
+    - Without **cursor**: offset pagination with skip/limit, returns a list
+    - With **cursor**: keyset pagination, returns {items, next_cursor}
     """
-    ingredients = db.query(IngredientModel).offset(skip).limit(limit).all()
-    return ingredients
\ No newline at end of file
+    if cursor is None:
+        ingredients = db.query(IngredientModel).offset(skip).limit(limit).all()
+        return ingredients
+
+    if sort == "name":
+        columns = [IngredientModel.name, IngredientModel.id]
+        key = lambda i: [i.name, i.id]
+    else:
+        columns = [IngredientModel.id]
+        key = lambda i: [i.id]
+
+    ingredients, next_cursor = keyset_page(db.query(IngredientModel), columns, sort, cursor, limit, key)
+    return IngredientPage(items=ingredients, next_cursor=next_cursor)
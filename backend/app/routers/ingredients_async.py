@@ -0,0 +1,80 @@
+# backend/app/routers/ingredients_async.py
+"""
+async def versions of the ingredient endpoints, mounted when DB_MODE=async.
+Routes not defined here fall through to app/routers/ingredients.py.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
+from app.database import get_async_db, get_async_read_db
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version, catalog_etag
+from app.pagination import keyset_filter, keyset_result
+from app.schemas.recipe import Ingredient, IngredientCreate, IngredientPage
+from app.models.recipe import Ingredient as IngredientModel
+from app.services.ingredient_search import search_ingredients as run_ingredient_search, index_ingredient
+
+router = APIRouter()
+
+@router.get("/search", dependencies=[Depends(catalog_etag(INGREDIENTS, RECIPES))])
+async def search_ingredients(
+    q: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Search for ingredients by name.
+    Returns ingredients that match the search query, names starting with
+    the query first, then the most used ingredients.
+    """
+    return await db.run_sync(lambda sync_db: run_ingredient_search(sync_db, q, limit))
+
+@router.post("/", response_model=Ingredient, status_code=201)
+async def create_ingredient(ingredient: IngredientCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a new ingredient
+    """
+    existing = await db.scalar(
+        select(IngredientModel).where(IngredientModel.name == ingredient.name.lower())
+    )
+    if existing:
+        raise HTTPException(status_code=400, detail="Ingredient already exists")
+
+    db_ingredient = IngredientModel(
+        name=ingredient.name.lower(),
+        category=ingredient.category
+    )
+    db.add(db_ingredient)
+    await db.run_sync(lambda sync_db: bump_catalog_version(sync_db, INGREDIENTS))
+    await db.commit()
+    index_ingredient(db_ingredient)
+
+    return db_ingredient
+
+@router.get("/", response_model=Union[IngredientPage, List[Ingredient]], dependencies=[Depends(catalog_etag(INGREDIENTS))])
+async def list_ingredients(
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="Pass an empty cursor to start cursor pagination"),
+    sort: Literal["id", "name"] = Query(default="id", description="Sort order for cursor pagination"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    List all ingredients with pagination.
+    - Without **cursor**: offset pagination with skip/limit, returns a list
+    - With **cursor**: keyset pagination, returns {items, next_cursor}
+    """
+    if cursor is None:
+        result = await db.execute(select(IngredientModel).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    if sort == "name":
+        columns = [IngredientModel.name, IngredientModel.id]
+        key = lambda i: [i.name, i.id]
+    else:
+        columns = [IngredientModel.id]
+        key = lambda i: [i.id]
+
+    result = await db.execute(keyset_filter(select(IngredientModel), columns, sort, cursor, limit))
+    ingredients, next_cursor = keyset_result(result.scalars().all(), sort, limit, key)
+    return IngredientPage(items=ingredients, next_cursor=next_cursor)
@@ -1,34 +1,80 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.schemas.recipe import InventoryItem
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from typing import List, Literal, Optional, Union
+from app.database import get_db, get_read_db
+from app.pagination import keyset_page
+from app.schemas.recipe import InventoryItem, InventoryPage, InventorySync
 from app.models.recipe import UserInventory, Ingredient
+from app.services.suggestion_cache import suggestion_cache
+from app.services.inventory_sync import sync_inventory
 
 router = APIRouter()
 
-@router.get("/", response_model=List[InventoryItem])
+def _to_inventory_item(item: UserInventory) -> InventoryItem:
+    return InventoryItem(
+        id=item.id,
+        ingredient=item.ingredient.name,
+        ingredient_id=item.ingredient_id,
+        quantity=float(item.quantity) if item.quantity else None,
+        unit=item.unit
+    )
+
+@router.get("/", response_model=Union[InventoryPage, List[InventoryItem]])
 def get_inventory(
     user_id: int = 1,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(default=None, description="Pass an empty cursor to page through the inventory"),
+    limit: int = Query(default=100, ge=1, le=500, description="Page size for cursor pagination"),
+    sort: Literal["id", "name"] = Query(default="id", description="Sort order for cursor pagination"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get user's current inventory
+    - Without **cursor**: the whole inventory as a list
+    - With **cursor**: keyset pagination, returns {items, next_cursor}
     """
-    items = db.query(UserInventory).filter(
+    # Ingredient names are loaded in the same query - touching
+    # item.ingredient lazily would cost one SELECT per inventory row
+    query = db.query(UserInventory).filter(
         UserInventory.user_id == user_id
-    ).all()
+    )
 
-    return [
-        InventoryItem(
-            id=item.id,
-            ingredient=item.ingredient.name,
-            ingredient_id=item.ingredient_id,
-            quantity=float(item.quantity) if item.quantity else None,
-            unit=item.unit
-        )
-        for item in items
-    ]
+    if cursor is None:
+        items = query.options(joinedload(UserInventory.ingredient)).all()
+        return [_to_inventory_item(item) for item in items]
+
+    if sort == "name":
+        query = query.join(UserInventory.ingredient).options(contains_eager(UserInventory.ingredient))
+        columns = [Ingredient.name, UserInventory.id]
+        key = lambda item: [item.ingredient.name, item.id]
+    else:
+        query = query.options(joinedload(UserInventory.ingredient))
+        columns = [UserInventory.id]
+        key = lambda item: [item.id]
+
+    items, next_cursor = keyset_page(query, columns, sort, cursor, limit, key)
+    return InventoryPage(items=[_to_inventory_item(item) for item in items], next_cursor=next_cursor)
+
+@router.post("/sync", response_model=List[InventoryItem])
+def sync_inventory_items(
+    changes: InventorySync,
+    user_id: int = 1,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply many inventory changes at once, in a single transaction.
+    - **upsert**: items to add, or update if already in the inventory
+    - **remove**: ingredient IDs to remove
+    - **replace**: treat upsert as the full inventory and remove everything else
+
+    Returns the resulting inventory.
+    """
+    sync_inventory(db, user_id, changes)
+    suggestion_cache.invalidate_user(user_id)
+
+    items = db.query(UserInventory).options(joinedload(UserInventory.ingredient)).filter(
+        UserInventory.user_id == user_id
+    ).all()
+    return [_to_inventory_item(item) for item in items]
 
 @router.post("/", status_code=201)
 def add_to_inverntory(
@@ -65,6 +111,7 @@ def add_to_inverntory(
     db.add(item)
     db.commit()
     db.refresh(item)
+    suggestion_cache.invalidate_user(user_id)
 
     return {
         "message": "Added to inventory",
@@ -91,6 +138,7 @@ def remove_from_inventory(
     
     db.delete(item)
     db.commit()
+    suggestion_cache.invalidate_user(user_id)
 
     return {"message": "Removed from inventory"}
 
@@ -116,5 +164,6 @@ def update_inventory_item(
     item.quantity = quantity
     item.unit = unit
     db.commit()
+    suggestion_cache.invalidate_user(user_id)
 
     return {"message": "Inventory has been updated."}
@@ -0,0 +1,135 @@
+# backend/app/routers/inventory_async.py
+"""
+async def versions of the inventory endpoints, mounted when DB_MODE=async.
+Routes not defined here fall through to app/routers/inventory.py.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload
+from typing import List, Literal, Optional, Union
+from app.database import get_async_db, get_async_read_db
+from app.pagination import keyset_filter, keyset_result
+from app.schemas.recipe import InventoryItem, InventoryPage
+from app.models.recipe import UserInventory, Ingredient
+from app.routers.inventory import _to_inventory_item
+from app.services.suggestion_cache import suggestion_cache
+
+router = APIRouter()
+
+async def _get_item(db: AsyncSession, user_id: int, ingredient_id: int) -> Optional[UserInventory]:
+    return await db.scalar(
+        select(UserInventory).where(
+            UserInventory.user_id == user_id,
+            UserInventory.ingredient_id == ingredient_id
+        )
+    )
+
+@router.get("/", response_model=Union[InventoryPage, List[InventoryItem]])
+async def get_inventory(
+    user_id: int = 1,
+    cursor: Optional[str] = Query(default=None, description="Pass an empty cursor to page through the inventory"),
+    limit: int = Query(default=100, ge=1, le=500, description="Page size for cursor pagination"),
+    sort: Literal["id", "name"] = Query(default="id", description="Sort order for cursor pagination"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get user's current inventory
+    - Without **cursor**: the whole inventory as a list
+    - With **cursor**: keyset pagination, returns {items, next_cursor}
+    """
+    # Lazy loads aren't possible on an AsyncSession, so ingredient names
+    # are loaded with the inventory rows
+    query = select(UserInventory).where(UserInventory.user_id == user_id)
+
+    if cursor is None:
+        result = await db.execute(query.options(joinedload(UserInventory.ingredient)))
+        return [_to_inventory_item(item) for item in result.scalars().all()]
+
+    if sort == "name":
+        query = query.join(UserInventory.ingredient).options(contains_eager(UserInventory.ingredient))
+        columns = [Ingredient.name, UserInventory.id]
+        key = lambda item: [item.ingredient.name, item.id]
+    else:
+        query = query.options(joinedload(UserInventory.ingredient))
+        columns = [UserInventory.id]
+        key = lambda item: [item.id]
+
+    result = await db.execute(keyset_filter(query, columns, sort, cursor, limit))
+    items, next_cursor = keyset_result(result.scalars().all(), sort, limit, key)
+    return InventoryPage(items=[_to_inventory_item(item) for item in items], next_cursor=next_cursor)
+
+@router.post("/", status_code=201)
+async def add_to_inverntory(
+    ingredient_id: int = Query(..., description="Ingredient ID to add"),
+    quantity: float = Query(default=None, description="Quantity (optional)"),
+    unit: str = Query(default=None, description="Unit (optional)"),
+    user_id: int = 1,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Add an ingredient to the users inventory.
+    """
+    ingredient = await db.get(Ingredient, ingredient_id)
+    if not ingredient:
+        raise HTTPException(status_code=404, detail="Ingredient not found")
+
+    if await _get_item(db, user_id, ingredient_id):
+        raise HTTPException(status_code=400, detail="Ingredient already in inventory")
+
+    item = UserInventory(
+        user_id=user_id,
+        ingredient_id=ingredient_id,
+        quantity=quantity,
+        unit=unit
+    )
+    db.add(item)
+    await db.commit()
+    suggestion_cache.invalidate_user(user_id)
+
+    return {
+        "message": "Added to inventory",
+        "ingredient": ingredient.name,
+        "id": item.id
+    }
+
+@router.delete("/{ingredient_id:int}")
+async def remove_from_inventory(
+    ingredient_id: int,
+    user_id: int = 1,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Remove an ingredient from user's inventory
+    """
+    item = await _get_item(db, user_id, ingredient_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Ingredient not in inventory.")
+
+    await db.delete(item)
+    await db.commit()
+    suggestion_cache.invalidate_user(user_id)
+
+    return {"message": "Removed from inventory"}
+
+@router.put("/{ingredient_id:int}")
+async def update_inventory_item(
+    ingredient_id: int,
+    quantity: float = Query(..., description="New quantity"),
+    unit: str = Query(..., description="New unit"),
+    user_id: int = 1,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update quantity/units of an inventory item
+    """
+    item = await _get_item(db, user_id, ingredient_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Ingredient not in inventory.")
+
+    item.quantity = quantity
+    item.unit = unit
+    await db.commit()
+    suggestion_cache.invalidate_user(user_id)
+
+    return {"message": "Inventory has been updated."}
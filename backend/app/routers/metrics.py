@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from app.pool_metrics import pool_stats
+from app.services.single_flight import suggestion_flights
+from app.services.suggestion_cache import suggestion_cache
+from app.startup import startup_state
+
+router = APIRouter()
+
+@router.get("/")
+def get_metrics():
+    """
+    Runtime counters for scraping/monitoring
+    """
+    return {
+        "suggestion_cache": suggestion_cache.stats(),
+        "single_flight": suggestion_flights.stats(),
+        "db_pool": pool_stats(),
+        "startup": startup_state.as_dict()
+    }
@@ -1,10 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.schemas.recipe import Recipe, RecipeCreate, RecipeMatch
+from typing import List, Literal, Optional, Union
+import io
+import json
+from app.config import FAST_JSON
+from app.database import get_db, get_read_db, ReadSessionLocal
+from app.fast_json import fast_response
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version, catalog_etag
+from app.pagination import keyset_page
+from app.schemas.recipe import (
+    MealPlan, Recipe, RecipeCreate, RecipeDetail, RecipeMatch, SuggestionBatchRequest, RecipeImportReport, RecipePage, RecipeSearchResult,
+    ShoppingList, ShoppingListRequest, SimilarRecipe, UnlockReport
+)
 from app.models.recipe import Recipe as RecipeModel, RecipeIngredient, Ingredient
-from app.services.matching import RecipeMatchingService
+from app.services.matching import RecipeMatchingService, match_json
+from app.services.meal_plan import plan_meals
+from app.services.bulk_import import import_recipes, detect_format, PARSERS
+from app.services.catalog_export import export_ndjson, gzip_chunks
+from app.services.recipe_detail import load_recipe_detail
+from app.services.recipe_index import index_recipe
+from app.services.recipe_search import search_recipes
+from app.services.recipe_summary import refresh_recipe_summaries
+from app.services.shopping_list import build_shopping_list
+from app.services.similarity import find_similar_recipes, index_recipe_similarity
+from app.services.ingredient_search import record_ingredient_usage
+from app.services.suggestion_cache import suggestion_cache
+from app.services.unlocks import find_unlocks
 
 router = APIRouter()
 
@@ -12,19 +34,148 @@ router = APIRouter()
 def get_recipe_suggestions(
     max_missing: int = Query(default=2, ge=0, le= 5, description="Maximum missing ingredients"),
     limit: int = Query(default=10, ge=1, le=50, description="Number of suggestions to return"),
-    db: Session = Depends(get_db)
+    check_quantities: bool = Query(default=False, description="Count ingredients you don't have enough of as missing"),
+    servings: Optional[int] = Query(default=None, ge=1, le=100, description="Scale recipe quantities to this many servings"),
+    user_id: int = 1,
+    db: Session = Depends(get_read_db)
 ):
     """
     Get recipe suggestions based on user's ingredient inventory.
     - **max_missing**: Allow recipes with up to this many missing ingredients
     - **limit**: Maximum number of recipes to return
+    - **check_quantities**: Compare quantities (converting units) and list shortfalls
+    - **servings**: Servings to cook, used with check_quantities
     """
     service = RecipeMatchingService(db)
-    return service.find_matching_recipes(
-        user_id=1,
+    matches = service.find_matching_recipes(
+        user_id=user_id,
         max_missing=max_missing,
+        limit=limit,
+        check_quantities=check_quantities,
+        servings=servings
+    )
+    if FAST_JSON:
+        return fast_response([match_json(match) for match in matches])
+    return matches
+
+@router.get("/unlocks", response_model=UnlockReport)
+def get_ingredient_unlocks(
+    k: int = Query(default=10, ge=1, le=100, description="Number of ingredients (and pairs) to return"),
+    pairs: bool = Query(default=True, description="Also rank pairs of ingredients"),
+    user_id: int = 1,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Which ingredients to buy next.
+    Ranks single ingredients, and pairs, by how many extra recipes they would complete.
+    """
+    return find_unlocks(db, user_id=user_id, k=k, include_pairs=pairs)
+
+@router.get("/meal-plan", response_model=MealPlan)
+def get_meal_plan(
+    days: int = Query(default=5, ge=1, le=14, description="Number of dinners to plan"),
+    max_missing: int = Query(default=3, ge=0, le=5, description="Skip recipes missing more ingredients than this"),
+    max_cooking_time: Optional[int] = Query(default=None, ge=0, description="Only recipes ready in this many minutes"),
+    servings: Optional[int] = Query(default=None, ge=1, le=100, description="Only recipes serving at least this many"),
+    user_id: int = 1,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Plan several dinners from the user's inventory with the shortest combined shopping list.
+    """
+    return plan_meals(
+        db,
+        user_id=user_id,
+        count=days,
+        max_missing=max_missing,
+        max_cooking_time=max_cooking_time,
+        servings=servings
+    )
+
+@router.post("/shopping-list", response_model=ShoppingList)
+def get_shopping_list(
+    request: ShoppingListRequest,
+    user_id: int = 1,
+    db: Session = Depends(get_read_db)
+):
+    """
+    One shopping list for several recipes.
+    Quantities are converted and summed per ingredient, then what's in the
+    user's inventory is subtracted.
+    """
+    return build_shopping_list(
+        db,
+        [(item.recipe_id, item.servings, item.multiplier) for item in request.recipes],
+        user_id=user_id
+    )
+
+@router.get("/search", response_model=List[RecipeSearchResult], dependencies=[Depends(catalog_etag(RECIPES))])
+def search_recipe_catalog(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text; supports \"phrases\" and -exclusions"),
+    ingredient_id: List[int] = Query(default=[], description="Only recipes using these ingredients"),
+    max_cooking_time: Optional[int] = Query(default=None, ge=0, description="Only recipes ready in this many minutes"),
+    limit: int = Query(default=20, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text search over recipe names, descriptions and instructions.
+    Name matches rank highest, then description, then instructions.
+    """
+    results = search_recipes(
+        db, q,
+        ingredient_ids=ingredient_id,
+        max_cooking_time=max_cooking_time,
         limit=limit
     )
+    if FAST_JSON:
+        return fast_response(results, response)
+    return results
+
+@router.post("/suggestions/batch")
+def get_recipe_suggestions_batch(request: SuggestionBatchRequest):
+    """
+    Get recipe suggestions for many users at once.
+    Streams one JSON line per user: {"user_id": ..., "suggestions": [...]}
+    """
+    def stream():
+        # The stream outlives the request handler, so it owns its session
+        db = ReadSessionLocal()
+        try:
+            service = RecipeMatchingService(db)
+            for user_id, matches in service.find_matching_recipes_batch(
+                user_ids=request.user_ids,
+                max_missing=request.max_missing,
+                limit=request.limit
+            ):
+                suggestions = [RecipeMatch(**match).model_dump() for match in matches]
+                yield json.dumps({"user_id": user_id, "suggestions": suggestions}) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.get("/export")
+def export_recipe_catalog(
+    gzip: bool = Query(default=False, description="Gzip-compress the stream"),
+):
+    """
+    Export every recipe with its ingredients.
+    Streams one JSON line per recipe, in the format /import accepts.
+    """
+    def stream():
+        # The stream outlives the request handler, so it owns its session
+        db = ReadSessionLocal()
+        try:
+            chunks = export_ndjson(db)
+            yield from gzip_chunks(chunks) if gzip else chunks
+        finally:
+            db.close()
+
+    if gzip:
+        headers = {"Content-Disposition": 'attachment; filename="recipes.ndjson.gz"'}
+        return StreamingResponse(stream(), media_type="application/gzip", headers=headers)
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 @router.post("/", response_model=Recipe, status_code=201)
 def create_recipe(recipe: RecipeCreate, db: Session = Depends(get_db)):
@@ -40,39 +191,88 @@ def create_recipe(recipe: RecipeCreate, db: Session = Depends(get_db)):
         servings=recipe.servings
     )
     db.add(db_recipe)
-    db.commit()
-    db.refresh(db_recipe)
+    db.flush()  # assigns db_recipe.id without committing
 
     # Add recipe ingredients
-    for ing in recipe.ingredients:
-        recipe_ing = RecipeIngredient(
-            recipe_id=db.recipe.id,
+    db.add_all([
+        RecipeIngredient(
+            recipe_id=db_recipe.id,
             ingredient_id=ing.ingredient_id,
             quantity=ing.quantity,
             unit=ing.unit,
             notes=ing.notes
         )
-        db.add(recipe_ing)
+        for ing in recipe.ingredients
+    ])
+    db.flush()
+    refresh_recipe_summaries(db, [db_recipe.id])
+    bump_catalog_version(db, RECIPES)
 
     db.commit()
     db.refresh(db_recipe)
 
+    # Keep the in-memory matching index in step with the catalog
+    index_recipe(db, db_recipe)
+    index_recipe_similarity(db_recipe.id, [ing.ingredient_id for ing in recipe.ingredients])
+    record_ingredient_usage(ing.ingredient_id for ing in recipe.ingredients)
+    # A new recipe can show up in anyone's suggestions
+    suggestion_cache.invalidate_all()
+
     return db_recipe
 
-@router.get("/", response_model=List[Recipe])
+@router.post("/import", response_model=RecipeImportReport)
+def import_recipe_file(
+    file: UploadFile = File(..., description="NDJSON or CSV recipe file"),
+    format: str = Query(default=None, description="ndjson or csv (defaults to the file extension)"),
+    batch_size: int = Query(default=1000, ge=1, le=10000),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import recipes. Ingredients are matched by name and created when missing.
+    Rows that fail are listed in the report; the rest of the file is still loaded.
+    """
+    fmt = (format or detect_format(file.filename)).lower()
+    if fmt not in PARSERS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {fmt}")
+
+    # The upload is spooled to disk, so reading it line by line keeps memory flat
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return import_recipes(db, stream, fmt=fmt, batch_size=batch_size)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    finally:
+        stream.detach()
+
+@router.get("/", response_model=Union[RecipePage, List[Recipe]], dependencies=[Depends(catalog_etag(RECIPES))])
 def list_recipes(
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(default=None, description="Pass an empty cursor to start cursor pagination"),
+    sort: Literal["id", "name"] = Query(default="id", description="Sort order for cursor pagination"),
+    db: Session = Depends(get_read_db)
 ):
     """
     List all recipes with pagination.
+    - Without **cursor**: offset pagination with skip/limit, returns a list
+    - With **cursor**: keyset pagination, returns {items, next_cursor}
     """
-    recipes = db.query(RecipeModel).offset(skip).limit(limit).all()
-    return recipes
+    if cursor is None:
+        recipes = db.query(RecipeModel).offset(skip).limit(limit).all()
+        return recipes
+
+    if sort == "name":
+        columns = [RecipeModel.name, RecipeModel.id]
+        key = lambda r: [r.name, r.id]
+    else:
+        columns = [RecipeModel.id]
+        key = lambda r: [r.id]
 
-@router.get("/{recipe_id}", response_model=Recipe)
-def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
+    recipes, next_cursor = keyset_page(db.query(RecipeModel), columns, sort, cursor, limit, key)
+    return RecipePage(items=recipes, next_cursor=next_cursor)
+
+@router.get("/{recipe_id}", response_model=Recipe, dependencies=[Depends(catalog_etag(RECIPES))])
+def get_recipe(recipe_id: int, db: Session = Depends(get_read_db)):
     """
     Get specific recipe by id
     """
@@ -81,4 +281,33 @@ def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Recipe not found")
     return recipe
 
-    
\ No newline at end of file
+
+@router.get(
+    "/{recipe_id}/detail",
+    response_model=RecipeDetail,
+    dependencies=[Depends(catalog_etag(RECIPES, INGREDIENTS))]
+)
+def get_recipe_detail(recipe_id: int, response: Response, db: Session = Depends(get_read_db)):
+    """
+    Get a recipe with its ingredient names, quantities and units (one query)
+    """
+    recipe = load_recipe_detail(db, recipe_id)
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    if FAST_JSON:
+        return fast_response(recipe, response)
+    return recipe
+
+@router.get("/{recipe_id}/similar", response_model=List[SimilarRecipe])
+def get_similar_recipes(
+    recipe_id: int,
+    k: int = Query(default=10, ge=1, le=50, description="Number of similar recipes to return"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Recipes with the most similar ingredient lists ("more like this")
+    """
+    similar = find_similar_recipes(db, recipe_id, k)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return similar
@@ -0,0 +1,149 @@
+# backend/app/routers/recipes_async.py
+"""
+async def versions of the recipe endpoints, mounted when DB_MODE=async.
+Routes not defined here fall through to app/routers/recipes.py, so
+path parameters use :int converters to avoid shadowing its static paths.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
+from app.config import FAST_JSON
+from app.database import get_async_db, get_async_read_db
+from app.fast_json import fast_response
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version, catalog_etag
+from app.pagination import keyset_filter, keyset_result
+from app.schemas.recipe import Recipe, RecipeCreate, RecipeDetail, RecipeMatch, RecipePage
+from app.models.recipe import Recipe as RecipeModel, RecipeIngredient
+from app.services.matching import AsyncRecipeMatchingService, match_json
+from app.services.recipe_detail import RECIPE_DETAIL_QUERY, group_recipe_rows
+from app.services.recipe_index import index_recipe
+from app.services.recipe_summary import refresh_recipe_summaries
+from app.services.similarity import index_recipe_similarity
+from app.services.ingredient_search import record_ingredient_usage
+from app.services.suggestion_cache import suggestion_cache
+
+router = APIRouter()
+
+@router.get("/suggestions", response_model=List[RecipeMatch])
+async def get_recipe_suggestions(
+    max_missing: int = Query(default=2, ge=0, le= 5, description="Maximum missing ingredients"),
+    limit: int = Query(default=10, ge=1, le=50, description="Number of suggestions to return"),
+    check_quantities: bool = Query(default=False, description="Count ingredients you don't have enough of as missing"),
+    servings: Optional[int] = Query(default=None, ge=1, le=100, description="Scale recipe quantities to this many servings"),
+    user_id: int = 1,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get recipe suggestions based on user's ingredient inventory.
+    - **max_missing**: Allow recipes with up to this many missing ingredients
+    - **limit**: Maximum number of recipes to return
+    - **check_quantities**: Compare quantities (converting units) and list shortfalls
+    - **servings**: Servings to cook, used with check_quantities
+    """
+    service = AsyncRecipeMatchingService(db)
+    matches = await service.find_matching_recipes(
+        user_id=user_id,
+        max_missing=max_missing,
+        limit=limit,
+        check_quantities=check_quantities,
+        servings=servings
+    )
+    if FAST_JSON:
+        return fast_response([match_json(match) for match in matches])
+    return matches
+
+@router.post("/", response_model=Recipe, status_code=201)
+async def create_recipe(recipe: RecipeCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create a new recipe with ingredients
+    """
+    db_recipe = RecipeModel(
+        name=recipe.name,
+        description=recipe.description,
+        instructions=recipe.instructions,
+        cooking_time=recipe.cooking_time,
+        servings=recipe.servings
+    )
+    db.add(db_recipe)
+    await db.flush()  # assigns db_recipe.id without committing
+
+    db.add_all([
+        RecipeIngredient(
+            recipe_id=db_recipe.id,
+            ingredient_id=ing.ingredient_id,
+            quantity=ing.quantity,
+            unit=ing.unit,
+            notes=ing.notes
+        )
+        for ing in recipe.ingredients
+    ])
+    await db.flush()
+    await db.run_sync(lambda sync_db: refresh_recipe_summaries(sync_db, [db_recipe.id]))
+    await db.run_sync(lambda sync_db: bump_catalog_version(sync_db, RECIPES))
+
+    await db.commit()
+
+    # Keep the in-memory matching index in step with the catalog
+    await db.run_sync(lambda sync_db: index_recipe(sync_db, db_recipe))
+    index_recipe_similarity(db_recipe.id, [ing.ingredient_id for ing in recipe.ingredients])
+    record_ingredient_usage(ing.ingredient_id for ing in recipe.ingredients)
+    # A new recipe can show up in anyone's suggestions
+    suggestion_cache.invalidate_all()
+
+    return db_recipe
+
+@router.get("/", response_model=Union[RecipePage, List[Recipe]], dependencies=[Depends(catalog_etag(RECIPES))])
+async def list_recipes(
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="Pass an empty cursor to start cursor pagination"),
+    sort: Literal["id", "name"] = Query(default="id", description="Sort order for cursor pagination"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    List all recipes with pagination.
+    - Without **cursor**: offset pagination with skip/limit, returns a list
+    - With **cursor**: keyset pagination, returns {items, next_cursor}
+    """
+    if cursor is None:
+        result = await db.execute(select(RecipeModel).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    if sort == "name":
+        columns = [RecipeModel.name, RecipeModel.id]
+        key = lambda r: [r.name, r.id]
+    else:
+        columns = [RecipeModel.id]
+        key = lambda r: [r.id]
+
+    result = await db.execute(keyset_filter(select(RecipeModel), columns, sort, cursor, limit))
+    recipes, next_cursor = keyset_result(result.scalars().all(), sort, limit, key)
+    return RecipePage(items=recipes, next_cursor=next_cursor)
+
+@router.get("/{recipe_id:int}", response_model=Recipe, dependencies=[Depends(catalog_etag(RECIPES))])
+async def get_recipe(recipe_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Get specific recipe by id
+    """
+    recipe = await db.get(RecipeModel, recipe_id)
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    return recipe
+
+@router.get(
+    "/{recipe_id:int}/detail",
+    response_model=RecipeDetail,
+    dependencies=[Depends(catalog_etag(RECIPES, INGREDIENTS))]
+)
+async def get_recipe_detail(recipe_id: int, response: Response, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Get a recipe with its ingredient names, quantities and units (one query)
+    """
+    result = await db.execute(RECIPE_DETAIL_QUERY.where(RecipeModel.id == recipe_id))
+    recipe = next(group_recipe_rows(result), None)
+    if recipe is None:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+    if FAST_JSON:
+        return fast_response(recipe, response)
+    return recipe
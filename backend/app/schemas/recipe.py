@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 # Ingredient schemas
@@ -48,7 +48,48 @@ class Recipe(RecipeBase):
     class Config:
         from_attributes = True
 
+# Recipe with its ingredients resolved
+class RecipeDetailIngredient(BaseModel):
+    ingredient_id: int
+    name: str
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    notes: Optional[str] = None
+
+class RecipeDetail(Recipe):
+    ingredients: List[RecipeDetailIngredient] = []
+
+# Bulk import schemas - ingredients are referenced by name, not ID
+class RecipeImportIngredient(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+    notes: Optional[str] = None
+
+class RecipeImport(RecipeBase):
+    ingredients: List[RecipeImportIngredient] = []
+
+class RecipeImportError(BaseModel):
+    line: int
+    error: str
+
+class RecipeImportReport(BaseModel):
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    ingredients_created: int = 0
+    errors: List[RecipeImportError] = []
+
 # Recipe match results (for suggestions)
+class IngredientShortfall(BaseModel):
+    """An ingredient the user has, but not enough of"""
+    ingredient_id: int
+    name: str
+    unit: Optional[str]
+    needed: float
+    available: float
+    missing: float
+
 class RecipeMatch(BaseModel):
     id: int
     name: str
@@ -59,6 +100,92 @@ class RecipeMatch(BaseModel):
     missing_count: int
     match_percent: float
     missing_ingredients: List[str]
+    shortfalls: List[IngredientShortfall] = []
+
+class IngredientUnlock(BaseModel):
+    ingredient_id: int
+    name: str
+    recipes_unlocked: int
+
+class IngredientPairUnlock(BaseModel):
+    ingredient_ids: List[int]
+    names: List[str]
+    recipes_unlocked: int
+
+class UnlockReport(BaseModel):
+    """Ingredients to buy, ranked by how many more recipes they complete"""
+    ingredients: List[IngredientUnlock]
+    pairs: List[IngredientPairUnlock]
+
+class RecipeSearchResult(BaseModel):
+    """A full-text search hit; matched words in `snippet` are wrapped in <mark>"""
+    id: int
+    name: str
+    description: Optional[str]
+    cooking_time: Optional[int]
+    rank: float
+    snippet: Optional[str]
+
+class SimilarRecipe(BaseModel):
+    """A neighbour by ingredient overlap (Jaccard similarity, 0-1)"""
+    id: int
+    name: str
+    description: Optional[str]
+    cooking_time: Optional[int]
+    similarity: float
+    shared_ingredients: int
+
+class PlannedRecipe(BaseModel):
+    id: int
+    name: str
+    cooking_time: Optional[int]
+    servings: Optional[int]
+    missing_ingredients: List[str]
+    new_purchases: int  # shopping list items first added for this recipe
+
+class MealPlanPurchase(BaseModel):
+    ingredient_id: int
+    name: str
+    recipe_ids: List[int]  # planned recipes that need it
+
+class MealPlan(BaseModel):
+    """Dinners chosen to keep the shopping list short"""
+    recipes: List[PlannedRecipe]
+    shopping_list: List[MealPlanPurchase]
+    inventory_ingredients_used: int  # summed over the planned recipes
+
+class ShoppingListRecipe(BaseModel):
+    recipe_id: int
+    servings: Optional[int] = Field(default=None, ge=1, le=100)  # scale to this many; default the recipe's own
+    multiplier: float = Field(default=1, gt=0, le=100)  # e.g. 2 to cook it twice
+
+class ShoppingListRequest(BaseModel):
+    recipes: List[ShoppingListRecipe] = Field(..., min_length=1, max_length=200)
+
+class ShoppingListAmount(BaseModel):
+    quantity: Optional[float]  # None for "to taste" style entries
+    unit: Optional[str]
+
+class ShoppingListItem(BaseModel):
+    ingredient_id: int
+    name: str
+    category: Optional[str]
+    recipe_ids: List[int]
+    needed: List[ShoppingListAmount]  # one per unit dimension, summed over the recipes
+    to_buy: List[ShoppingListAmount]  # what's left after the inventory
+    in_inventory: bool
+    unit_mismatch: bool = False  # stocked in another dimension (g vs cups); bought in full
+
+class ShoppingList(BaseModel):
+    """Ingredients for several recipes, merged per ingredient, minus the inventory"""
+    items: List[ShoppingListItem]
+    covered: List[ShoppingListItem]  # needed, but the inventory has enough
+    unknown_recipe_ids: List[int]
+
+class SuggestionBatchRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=10000)
+    max_missing: int = Field(default=2, ge=0, le=5)
+    limit: int = Field(default=10, ge=1, le=50)
 
 # Inventory schemas
 class InventoryItem(BaseModel):
@@ -67,3 +194,31 @@ class InventoryItem(BaseModel):
     ingredient_id: int
     quantity: Optional[float]
     unit: Optional[str]
+
+class InventorySyncItem(BaseModel):
+    ingredient_id: int
+    quantity: Optional[float] = None
+    unit: Optional[str] = None
+
+class InventorySync(BaseModel):
+    """
+    A batch of inventory changes applied in one transaction.
+    With replace=true, `upsert` is the complete new inventory and anything
+    not in it is removed.
+    """
+    upsert: List[InventorySyncItem] = Field(default=[], max_length=1000)
+    remove: List[int] = Field(default=[], max_length=1000)
+    replace: bool = False
+
+# Cursor-paginated listings
+class IngredientPage(BaseModel):
+    items: List[Ingredient]
+    next_cursor: Optional[str] = None
+
+class RecipePage(BaseModel):
+    items: List[Recipe]
+    next_cursor: Optional[str] = None
+
+class InventoryPage(BaseModel):
+    items: List[InventoryItem]
+    next_cursor: Optional[str] = None
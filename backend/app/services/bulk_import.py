@@ -0,0 +1,306 @@
+# backend/app/services/bulk_import.py
+"""
+Bulk recipe import from NDJSON or CSV.
+
+Records are read as a stream and loaded in batches:
+1. every ingredient name in the batch is resolved with one lookup, and
+   the missing ones are created with one multi-row insert
+2. recipes are inserted with one multi-row INSERT ... RETURNING
+3. their recipe_ingredients rows are inserted with one more, and their
+   recipe_summaries rows are rebuilt with one INSERT ... SELECT
+
+If a batch fails in the database it is retried one recipe at a time so a
+single bad row is reported instead of aborting the load.
+
+NDJSON: one recipe per line
+    {"name": "...", "cooking_time": 30, "ingredients": [{"name": "rice", "quantity": 2, "unit": "cups"}]}
+
+CSV: one row per recipe ingredient; consecutive rows with the same
+recipe name make up one recipe
+    name,description,instructions,cooking_time,servings,ingredient,quantity,unit,notes
+"""
+import csv
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.recipe import Recipe, RecipeIngredient, Ingredient
+from app.schemas.recipe import RecipeImport, RecipeImportError, RecipeImportReport
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version
+from app.services.recipe_index import invalidate_recipe_index
+from app.services.recipe_summary import refresh_recipe_summaries
+from app.services.similarity import invalidate_similarity_index
+from app.services.ingredient_search import invalidate_ingredient_index
+from app.services.inventory_sync import INSERT_DIALECTS
+from app.services.suggestion_cache import suggestion_cache
+
+# Only this many errors are kept in the report (the count keeps going)
+MAX_REPORTED_ERRORS = 1000
+
+# Names per IN (...) lookup
+LOOKUP_CHUNK_SIZE = 1000
+
+CSV_RECIPE_FIELDS = ("name", "description", "instructions", "cooking_time", "servings")
+CSV_INGREDIENT_FIELDS = ("quantity", "unit", "notes")
+
+# (line number, parsed record or None, parse error or None)
+ParsedRecord = Tuple[int, Optional[dict], Optional[str]]
+
+
+def parse_ndjson(stream: TextIO) -> Iterator[ParsedRecord]:
+    """Yield one record per non-blank NDJSON line"""
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, record, None
+
+
+def parse_csv(stream: TextIO) -> Iterator[ParsedRecord]:
+    """
+    Yield one record per recipe, grouping consecutive rows by recipe name.
+    The line number reported is the recipe's first row.
+    """
+    reader = csv.DictReader(stream)
+    current = None
+    start_line = 0
+
+    for row in reader:
+        line_no = reader.line_num
+        row = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+        name = row.get("name") or ""
+
+        if current is None or name != current["name"]:
+            if current is not None:
+                yield start_line, current, None
+            current = {field: row.get(field) or None for field in CSV_RECIPE_FIELDS}
+            current["name"] = name
+            current["ingredients"] = []
+            start_line = line_no
+
+        if row.get("ingredient"):
+            ingredient = {field: row.get(field) or None for field in CSV_INGREDIENT_FIELDS}
+            ingredient["name"] = row["ingredient"]
+            current["ingredients"].append(ingredient)
+
+    if current is not None:
+        yield start_line, current, None
+
+
+PARSERS = {
+    "ndjson": parse_ndjson,
+    "jsonl": parse_ndjson,
+    "csv": parse_csv,
+}
+
+
+def detect_format(filename: Optional[str], default: str = "ndjson") -> str:
+    """Pick a parser from a file extension"""
+    if filename and "." in filename:
+        extension = filename.rsplit(".", 1)[1].lower()
+        if extension in PARSERS:
+            return extension
+    return default
+
+
+class RecipeImporter:
+    """
+    Loads parsed recipe records in batches.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_size: int = 1000,
+        on_progress: Optional[Callable[[RecipeImportReport], None]] = None
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.on_progress = on_progress
+        self.report = RecipeImportReport()
+        # ingredient name -> ID, filled as batches resolve names
+        self._ingredient_ids: Dict[str, int] = {}
+
+    def run(self, records: Iterable[ParsedRecord]) -> RecipeImportReport:
+        """Import every record and return the final report"""
+        batch: List[Tuple[int, RecipeImport]] = []
+
+        for line_no, record, error in records:
+            self.report.processed += 1
+
+            if error is None:
+                try:
+                    batch.append((line_no, RecipeImport(**record)))
+                except ValidationError as e:
+                    error = _format_validation_error(e)
+
+            if error is not None:
+                self._fail(line_no, error)
+
+            if len(batch) >= self.batch_size:
+                self._load_batch(batch)
+                batch = []
+
+        if batch:
+            self._load_batch(batch)
+
+        return self.report
+
+    def _load_batch(self, batch: List[Tuple[int, RecipeImport]]):
+        try:
+            self._resolve_ingredients(
+                {_ingredient_key(ing.name) for _, recipe in batch for ing in recipe.ingredients}
+            )
+            self._insert_recipes(batch)
+            bump_catalog_version(self.db, RECIPES)
+            self.db.commit()
+            self.report.imported += len(batch)
+        except SQLAlchemyError:
+            self.db.rollback()
+            # Find the bad rows by loading the batch one recipe at a time
+            for line_no, recipe in batch:
+                try:
+                    self._resolve_ingredients({_ingredient_key(ing.name) for ing in recipe.ingredients})
+                    self._insert_recipes([(line_no, recipe)])
+                    bump_catalog_version(self.db, RECIPES)
+                    self.db.commit()
+                    self.report.imported += 1
+                except SQLAlchemyError as e:
+                    self.db.rollback()
+                    self._fail(line_no, str(e.orig) if getattr(e, "orig", None) else str(e))
+
+        if self.on_progress:
+            self.on_progress(self.report)
+
+    def _resolve_ingredients(self, names: set):
+        """
+        Map ingredient names to IDs, creating any that don't exist yet.
+        Created ingredients are committed straight away, with the catalog
+        version bump, so a failed recipe batch can't roll back IDs that are
+        already cached.
+        """
+        missing = [name for name in names if name not in self._ingredient_ids]
+        if not missing:
+            return
+
+        self._lookup_ingredients(missing)
+
+        to_create = [name for name in missing if name not in self._ingredient_ids]
+        if not to_create:
+            return
+
+        rows = [{"name": name} for name in to_create]
+        # Another import (or the API) may create the same name concurrently
+        insert_ingredients = INSERT_DIALECTS[self.db.get_bind().dialect.name]
+        stmt = insert_ingredients(Ingredient).on_conflict_do_nothing(index_elements=["name"])
+        # Names skipped by ON CONFLICT DO NOTHING come back without a row
+        created = dict(self.db.execute(stmt.returning(Ingredient.name, Ingredient.id), rows).all())
+        bump_catalog_version(self.db, INGREDIENTS)
+        self.db.commit()
+
+        self._ingredient_ids.update(created)
+        self._lookup_ingredients([name for name in to_create if name not in created])
+        self.report.ingredients_created += len(created)
+
+    def _lookup_ingredients(self, names: List[str]):
+        for start in range(0, len(names), LOOKUP_CHUNK_SIZE):
+            chunk = names[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self.db.execute(
+                select(Ingredient.name, Ingredient.id).where(Ingredient.name.in_(chunk))
+            )
+            self._ingredient_ids.update(dict(rows.all()))
+
+    def _insert_recipes(self, batch: List[Tuple[int, RecipeImport]]):
+        recipe_rows = [
+            {
+                "name": recipe.name,
+                "description": recipe.description,
+                "instructions": recipe.instructions,
+                "cooking_time": recipe.cooking_time,
+                "servings": recipe.servings,
+            }
+            for _, recipe in batch
+        ]
+        recipe_ids = self.db.execute(
+            insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True),
+            recipe_rows
+        ).scalars().all()
+
+        ingredient_rows = [
+            {
+                "recipe_id": recipe_id,
+                "ingredient_id": self._ingredient_ids[_ingredient_key(ing.name)],
+                "quantity": ing.quantity,
+                "unit": ing.unit,
+                "notes": ing.notes,
+            }
+            for recipe_id, (_, recipe) in zip(recipe_ids, batch)
+            for ing in recipe.ingredients
+        ]
+        if ingredient_rows:
+            self.db.execute(insert(RecipeIngredient), ingredient_rows)
+        refresh_recipe_summaries(self.db, recipe_ids)
+
+    def _fail(self, line_no: int, error: str):
+        self.report.failed += 1
+        if len(self.report.errors) < MAX_REPORTED_ERRORS:
+            self.report.errors.append(RecipeImportError(line=line_no, error=error))
+
+
+def import_recipes(
+    db: Session,
+    stream: TextIO,
+    fmt: str = "ndjson",
+    batch_size: int = 1000,
+    on_progress: Optional[Callable[[RecipeImportReport], None]] = None
+) -> RecipeImportReport:
+    """
+    Import a recipe file and refresh the matching caches afterwards.
+
+    Every committed batch bumps the catalog versions in its own
+    transaction, and the in-process caches are dropped even if the import
+    stops part way, so recipes that made it in are never served stale.
+
+    Args:
+        stream: Text stream of NDJSON lines or CSV rows
+        fmt: "ndjson" or "csv"
+        batch_size: Recipes per database batch
+        on_progress: Called with the running report after every batch
+    """
+    if fmt not in PARSERS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    importer = RecipeImporter(db, batch_size=batch_size, on_progress=on_progress)
+    try:
+        return importer.run(PARSERS[fmt](stream))
+    finally:
+        if importer.report.imported or importer.report.ingredients_created:
+            invalidate_ingredient_index()
+        if importer.report.imported:
+            invalidate_recipe_index()
+            invalidate_similarity_index()
+            suggestion_cache.invalidate_all()
+
+
+def _ingredient_key(name: str) -> str:
+    # Same normalization as create_ingredient
+    return name.strip().lower()
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}"
+        for e in error.errors()
+    )
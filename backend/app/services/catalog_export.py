@@ -0,0 +1,59 @@
+# backend/app/services/catalog_export.py
+"""
+Streaming NDJSON export of the whole recipe catalog.
+
+One pass over RECIPE_DETAIL_QUERY - a single recipes -> recipe_ingredients
+-> ingredients join, ordered by recipe - read through a server-side cursor
+(stream_results + yield_per) so memory stays flat however large the
+catalog is. Rows are grouped back into one JSON line per recipe, in the
+same shape import_recipes.py reads:
+
+    {"id": 1, "name": "...", "cooking_time": 30, "ingredients": [{"ingredient_id": 4, "name": "rice", "quantity": 2.0, "unit": "cups", "notes": null}]}
+"""
+import json
+import zlib
+from typing import Iterable, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.services.recipe_detail import RECIPE_DETAIL_QUERY, group_recipe_rows
+
+# Rows fetched from the cursor at a time
+EXPORT_BATCH_SIZE = 2000
+
+# Bytes collected before a chunk is handed to the response / file
+CHUNK_SIZE = 64 * 1024
+
+
+def export_recipes(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[dict]:
+    """Every recipe with its ingredients, in ID order"""
+    rows = db.execute(
+        RECIPE_DETAIL_QUERY,
+        execution_options={"stream_results": True, "yield_per": batch_size}
+    )
+    yield from group_recipe_rows(rows)
+
+
+def export_ndjson(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """The export as NDJSON, in chunks of about CHUNK_SIZE bytes"""
+    buffer = []
+    size = 0
+    for recipe in export_recipes(db, batch_size):
+        line = (json.dumps(recipe, separators=(",", ":")) + "\n").encode()
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a stream of chunks into one gzip member as it goes"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
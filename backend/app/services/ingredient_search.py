@@ -0,0 +1,248 @@
+# backend/app/services/ingredient_search.py
+"""
+Ingredient autocomplete.
+
+Results are ranked: names starting with the query first, then names
+containing it, and within each group the ingredients used by the most
+recipes first (ties broken by name).
+
+Two backends, picked with INGREDIENT_SEARCH_ENGINE:
+- "sql": one ranked ILIKE query; on Postgres the trigram GIN index on
+  ingredients.name serves the '%q%' filter
+- "memory": a sorted name list for prefix lookups plus an n-gram
+  inverted index for substring lookups, kept in process
+"""
+import bisect
+import heapq
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import INGREDIENT_SEARCH_ENGINE, INGREDIENT_INDEX_TTL
+from app.models.recipe import Ingredient, RecipeIngredient
+
+# Longest n-gram indexed; queries this long or longer intersect trigram postings
+MAX_GRAM = 3
+
+# The SQL backend ranks by popularity only among this many closest matches,
+# so a short query matching much of the table doesn't count usage for all of it
+SQL_CANDIDATES = 200
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class IngredientSearchIndex:
+    """
+    In-memory prefix + n-gram index over ingredient names.
+    """
+
+    def __init__(self):
+        self.loaded_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.names: Dict[int, str] = {}
+        self.categories: Dict[int, Optional[str]] = {}
+        self.popularity: Dict[int, int] = {}
+        self.sorted_names: List[tuple] = []  # (name, id), for prefix ranges
+        self.grams: Dict[str, Set[int]] = {}  # 1- to 3-gram -> ingredient IDs
+
+    @classmethod
+    def load(cls, db: Session) -> "IngredientSearchIndex":
+        """Build the index with one query (ingredients + usage counts)"""
+        usage = (
+            select(RecipeIngredient.ingredient_id, func.count().label("uses"))
+            .group_by(RecipeIngredient.ingredient_id)
+            .subquery()
+        )
+        rows = db.execute(
+            select(Ingredient.id, Ingredient.name, Ingredient.category, func.coalesce(usage.c.uses, 0))
+            .outerjoin(usage, usage.c.ingredient_id == Ingredient.id)
+        )
+
+        index = cls()
+        for ingredient_id, name, category, uses in rows:
+            index._add(ingredient_id, name, category, uses)
+        index.sorted_names.sort()
+        return index
+
+    def add(self, ingredient_id: int, name: str, category: Optional[str] = None):
+        """Add a newly created ingredient"""
+        with self._lock:
+            if ingredient_id in self.names:
+                return
+            self._add(ingredient_id, name, category, 0, keep_sorted=True)
+
+    def record_usage(self, ingredient_ids: Iterable[int]):
+        """Bump popularity after a recipe using these ingredients was created"""
+        with self._lock:
+            for ingredient_id in ingredient_ids:
+                if ingredient_id in self.popularity:
+                    self.popularity[ingredient_id] += 1
+
+    def _add(self, ingredient_id, name, category, uses, keep_sorted=False):
+        key = name.lower()
+        self.names[ingredient_id] = name
+        self.categories[ingredient_id] = category
+        self.popularity[ingredient_id] = uses
+
+        if keep_sorted:
+            bisect.insort(self.sorted_names, (key, ingredient_id))
+        else:
+            self.sorted_names.append((key, ingredient_id))
+
+        for n in range(1, MAX_GRAM + 1):
+            for gram in _grams(key, n):
+                self.grams.setdefault(gram, set()).add(ingredient_id)
+
+    def search(self, q: str, limit: int = 10) -> List[dict]:
+        """Ranked autocomplete results for q"""
+        q = q.strip().lower()
+        if not q:
+            return []
+
+        with self._lock:
+            rank = lambda ingredient_id: (-self.popularity[ingredient_id], self.names[ingredient_id])
+
+            # Prefix matches are one contiguous range of the sorted names
+            prefix_ids = []
+            sorted_names = self.sorted_names
+            position = bisect.bisect_left(sorted_names, (q,))
+            while position < len(sorted_names) and sorted_names[position][0].startswith(q):
+                prefix_ids.append(sorted_names[position][1])
+                position += 1
+
+            results = heapq.nsmallest(limit, prefix_ids, key=rank)
+
+            if len(results) < limit:
+                prefix = set(prefix_ids)
+                substring_ids = [
+                    ingredient_id for ingredient_id in self._substring_candidates(q)
+                    if ingredient_id not in prefix and q in self.names[ingredient_id].lower()
+                ]
+                results += heapq.nsmallest(limit - len(results), substring_ids, key=rank)
+
+            return [
+                {
+                    "id": ingredient_id,
+                    "name": self.names[ingredient_id],
+                    "category": self.categories[ingredient_id]
+                }
+                for ingredient_id in results
+            ]
+
+    def _substring_candidates(self, q: str) -> Set[int]:
+        # Every n-gram of q must appear in a matching name
+        postings = sorted(
+            (self.grams.get(gram, set()) for gram in _grams(q, min(len(q), MAX_GRAM))),
+            key=len
+        )
+        if not postings:
+            return set()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+
+# Process-wide index, built on first use
+_index: Optional[IngredientSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_ingredient_index(db: Session) -> IngredientSearchIndex:
+    """Return the shared search index, (re)loading it when missing or stale"""
+    global _index
+
+    index = _index
+    if index is not None and not _is_stale(index):
+        return index
+
+    with _index_lock:
+        if _index is None or _is_stale(_index):
+            _index = IngredientSearchIndex.load(db)
+        return _index
+
+
+def _is_stale(index: IngredientSearchIndex) -> bool:
+    return INGREDIENT_INDEX_TTL > 0 and time.monotonic() - index.loaded_at > INGREDIENT_INDEX_TTL
+
+
+def invalidate_ingredient_index():
+    """Drop the shared index so the next search reloads it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def index_ingredient(ingredient: Ingredient):
+    """Add a newly created ingredient to the shared index, if one is loaded"""
+    if _index is not None:
+        _index.add(ingredient.id, ingredient.name, ingredient.category)
+
+
+def record_ingredient_usage(ingredient_ids: Iterable[int]):
+    """Count a new recipe's ingredients towards their popularity"""
+    if _index is not None:
+        _index.record_usage(ingredient_ids)
+
+
+def search_ingredients(db: Session, q: str, limit: int = 10, engine: str = None) -> List[dict]:
+    """
+    Ranked ingredient search using the configured backend.
+    """
+    if (engine or INGREDIENT_SEARCH_ENGINE) == "memory":
+        return get_ingredient_index(db).search(q, limit)
+    return search_ingredients_sql(db, q, limit)
+
+
+def search_ingredients_sql(db: Session, q: str, limit: int = 10) -> List[dict]:
+    """
+    Ranked search in one query. The '%q%' filter is served by the trigram
+    index on Postgres. Popularity is only counted for the SQL_CANDIDATES
+    matches closest to q (prefix matches first, then by trigram similarity
+    on Postgres or name length elsewhere).
+    """
+    q = q.strip().lower()
+    if not q:
+        return []
+
+    # Treat the user's input literally inside LIKE patterns
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    is_prefix = Ingredient.name.ilike(f"{escaped}%", escape="\\")
+    if db.get_bind().dialect.name == "postgresql":
+        closeness = func.similarity(Ingredient.name, q).desc()
+    else:
+        closeness = func.length(Ingredient.name)
+
+    candidates = (
+        select(Ingredient.id, Ingredient.name, Ingredient.category, is_prefix.label("is_prefix"))
+        .where(Ingredient.name.ilike(f"%{escaped}%", escape="\\"))
+        .order_by(is_prefix.desc(), closeness, Ingredient.name)
+        .limit(SQL_CANDIDATES)
+        .subquery()
+    )
+    popularity = (
+        select(func.count())
+        .where(RecipeIngredient.ingredient_id == candidates.c.id)
+        .correlate(candidates)
+        .scalar_subquery()
+    )
+
+    rows = db.execute(
+        select(candidates.c.id, candidates.c.name, candidates.c.category)
+        .order_by(candidates.c.is_prefix.desc(), popularity.desc(), candidates.c.name)
+        .limit(limit)
+    )
+
+    return [
+        {"id": ingredient_id, "name": name, "category": category}
+        for ingredient_id, name, category in rows
+    ]
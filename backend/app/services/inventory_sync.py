@@ -0,0 +1,79 @@
+# backend/app/services/inventory_sync.py
+"""
+Apply a whole inventory diff in one transaction.
+
+Upserts use INSERT ... ON CONFLICT (user_id, ingredient_id) DO UPDATE,
+so a sync is a fixed number of statements however many items it has:
+one ingredient existence check, one upsert, one delete.
+"""
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.recipe import Ingredient, UserInventory
+from app.schemas.recipe import InventorySync
+
+INSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def sync_inventory(db: Session, user_id: int, changes: InventorySync):
+    """
+    Apply `changes` to a user's inventory and commit.
+
+    Raises:
+        HTTPException 400 if an ingredient is both upserted and removed
+        HTTPException 404 if any upserted ingredient doesn't exist
+    """
+    # Last entry wins if an ingredient is listed twice
+    upserts = {item.ingredient_id: item for item in changes.upsert}
+    removals = set(changes.remove)
+
+    conflicting = upserts.keys() & removals
+    if conflicting:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ingredients both upserted and removed: {sorted(conflicting)}"
+        )
+
+    if upserts:
+        found = set(db.execute(
+            select(Ingredient.id).where(Ingredient.id.in_(list(upserts)))
+        ).scalars())
+        missing = upserts.keys() - found
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Ingredients not found: {sorted(missing)}")
+
+        insert = INSERT_DIALECTS[db.get_bind().dialect.name]
+        stmt = insert(UserInventory).values([
+            {
+                "user_id": user_id,
+                "ingredient_id": item.ingredient_id,
+                "quantity": item.quantity,
+                "unit": item.unit,
+            }
+            for item in upserts.values()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserInventory.user_id, UserInventory.ingredient_id],
+            set_={"quantity": stmt.excluded.quantity, "unit": stmt.excluded.unit}
+        )
+        db.execute(stmt)
+
+    if changes.replace:
+        stmt = delete(UserInventory).where(UserInventory.user_id == user_id)
+        if upserts:
+            stmt = stmt.where(UserInventory.ingredient_id.not_in(list(upserts)))
+        db.execute(stmt)
+    elif removals:
+        db.execute(
+            delete(UserInventory).where(
+                UserInventory.user_id == user_id,
+                UserInventory.ingredient_id.in_(list(removals))
+            )
+        )
+
+    db.commit()
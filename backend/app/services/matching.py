@@ -1,20 +1,114 @@
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Iterator, List, Optional, Sequence, Tuple
+from app.config import MATCHING_ENGINE
+from app.services.quantity_matching import (
+    QUANTITY_MATCH_QUERY, find_quantity_matches_memory, find_quantity_matches_sql, quantity_match_params
+)
+from app.services.recipe_index import get_recipe_index, load_inventory, load_inventories
+from app.services.single_flight import suggestion_flights
+from app.services.suggestion_cache import suggestion_cache
+
+# Ranks recipes for one user's inventory. Only recipes reachable from the
+# inventory rows (plus recipes small enough to be missing everything) are
+# scored, using the precomputed recipe_summaries instead of re-counting
+# every recipe's ingredients, so cost follows inventory size rather than
+# catalog size. Names are only looked up for the final `limit` rows.
+MATCH_QUERY = text("""
+    WITH inventory AS (
+        SELECT DISTINCT ingredient_id
+        FROM user_inventory
+        WHERE user_id = :user_id
+    ),
+    matched AS (
+        SELECT ri.recipe_id, COUNT(*) AS matched_ingredients
+        FROM inventory inv
+        JOIN recipe_ingredients ri ON ri.ingredient_id = inv.ingredient_id
+        GROUP BY ri.recipe_id
+    ),
+    candidates AS (
+        SELECT s.recipe_id, s.total_ingredients, m.matched_ingredients, s.ingredient_ids
+        FROM matched m
+        JOIN recipe_summaries s ON s.recipe_id = m.recipe_id
+        WHERE s.total_ingredients - m.matched_ingredients <= :max_missing
+        UNION ALL
+        SELECT s.recipe_id, s.total_ingredients, 0, s.ingredient_ids
+        FROM recipe_summaries s
+        WHERE s.total_ingredients <= :max_missing
+            AND NOT EXISTS (SELECT 1 FROM matched m WHERE m.recipe_id = s.recipe_id)
+    ),
+    top_matches AS (
+        SELECT
+            recipe_id,
+            ingredient_ids,
+            total_ingredients,
+            matched_ingredients,
+            total_ingredients - matched_ingredients as missing_count,
+            ROUND(matched_ingredients::numeric / total_ingredients * 100) as match_percent
+        FROM candidates
+        ORDER BY match_percent DESC, missing_count ASC, recipe_id ASC
+        LIMIT :limit
+    )
+    SELECT
+        r.id,
+        r.name,
+        r.description,
+        r.cooking_time,
+        t.total_ingredients,
+        t.matched_ingredients,
+        t.missing_count,
+        t.match_percent,
+        ARRAY(
+            SELECT i.name
+            FROM unnest(t.ingredient_ids) WITH ORDINALITY AS u(ingredient_id, ord)
+            JOIN ingredients i ON i.id = u.ingredient_id
+            WHERE u.ingredient_id NOT IN (SELECT ingredient_id FROM inventory)
+            ORDER BY u.ord
+        ) as missing_ingredients
+    FROM top_matches t
+    JOIN recipes r ON r.id = t.recipe_id
+    ORDER BY t.match_percent DESC, t.missing_count ASC, t.recipe_id ASC
+    """)
+
+
+def match_json(match: dict) -> dict:
+    """A match in exactly the RecipeMatch shape and JSON types, for fast_response()"""
+    return {
+        "id": match["id"],
+        "name": match["name"],
+        "description": match["description"],
+        "cooking_time": match["cooking_time"],
+        "total_ingredients": match["total_ingredients"],
+        "matched_ingredients": match["matched_ingredients"],
+        "missing_count": match["missing_count"],
+        "match_percent": float(match["match_percent"]),
+        "missing_ingredients": list(match["missing_ingredients"]),
+        "shortfalls": match.get("shortfalls", []),
+    }
+
 
 class RecipeMatchingService:
     """
     Service for matching recipes to user's ingredient inventory.
+
+    Uses the in-memory recipe index when MATCHING_ENGINE=memory,
+    otherwise runs the aggregate query in Postgres. Results are cached
+    per user until their inventory or the catalog changes, and identical
+    concurrent requests share one computation (single flight).
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, engine: str = None):
         self.db = db
+        self.engine = engine or MATCHING_ENGINE
 
     def find_matching_recipes(
         self,
         user_id: int = 1,
         max_missing: int = 2,
-        limit: int = 10
+        limit: int = 10,
+        check_quantities: bool = False,
+        servings: Optional[int] = None
     ) -> List[dict]:
         """
         Find recipes ranked by ingredient match percentage.
@@ -23,49 +117,281 @@ class RecipeMatchingService:
             user_id: User ID to check inventory for
             max_missing: Maximum number of missing ingredients allowed
             limit: Maximum number of recipes to return
+            check_quantities: Count ingredients the user doesn't have
+                enough of as missing, and report them as shortfalls
+            servings: Scale recipe quantities to this many servings
+                (only used with check_quantities)
 
         Returns:
             List of recipe matches with metadata
         """
+        key = (user_id, max_missing, limit)
+        if check_quantities:
+            key += ("quantities", servings)
+        if suggestion_cache.enabled:
+            cached = suggestion_cache.get(key)
+            if cached is not None:
+                return list(cached)
+
+        generation = suggestion_cache.generation(user_id)
+
+        def compute() -> List[dict]:
+            return self._compute_matches(user_id, max_missing, limit, check_quantities, servings)
+
+        # Identical requests already running share their result. The
+        # generation is part of the key so nobody joins a computation
+        # started before their own inventory write.
+        matches = suggestion_flights.do(
+            (key, generation), compute,
+            shared_key=(self.engine, key),
+            not_before=suggestion_cache.invalidated_at(user_id)
+        )
+        # Cached here rather than in compute() so a result another worker
+        # computed is cached in this one too
+        suggestion_cache.put(key, matches, generation)
+        return list(matches)
+
+    def find_matching_recipes_batch(
+        self,
+        user_ids: Sequence[int],
+        max_missing: int = 2,
+        limit: int = 10
+    ) -> Iterator[Tuple[int, List[dict]]]:
+        """
+        Find recipe matches for many users in one pass over the catalog.
+
+        Args:
+            user_ids: Users to compute suggestions for
+            max_missing: Maximum number of missing ingredients allowed
+            limit: Maximum number of recipes to return per user
 
+        Yields:
+            (user_id, matches) pairs in ascending user_id order, one per
+            distinct user - users with no matches get an empty list
+        """
+        pending = []
+        for user_id in sorted(set(user_ids)):
+            cached = suggestion_cache.get((user_id, max_missing, limit)) if suggestion_cache.enabled else None
+            if cached is not None:
+                yield user_id, list(cached)
+            else:
+                pending.append(user_id)
+
+        if not pending:
+            return
+
+        generations = {user_id: suggestion_cache.generation(user_id) for user_id in pending}
+
+        if self.engine == "memory":
+            batch = self._find_matching_recipes_batch_memory(pending, max_missing, limit)
+        else:
+            batch = self._find_matching_recipes_batch_sql(pending, max_missing, limit)
+
+        for user_id, matches in batch:
+            suggestion_cache.put((user_id, max_missing, limit), matches, generations[user_id])
+            yield user_id, matches
+
+    def _find_matching_recipes_batch_memory(
+        self, user_ids: List[int], max_missing: int, limit: int
+    ) -> Iterator[Tuple[int, List[dict]]]:
+        """Score every user against one loaded recipe index"""
+        index = get_recipe_index(self.db)
+        inventories = load_inventories(self.db, user_ids)
+        for user_id in user_ids:
+            yield user_id, index.match(inventories[user_id], max_missing=max_missing, limit=limit)
+
+    def _find_matching_recipes_batch_sql(
+        self, user_ids: List[int], max_missing: int, limit: int
+    ) -> Iterator[Tuple[int, List[dict]]]:
+        """
+        One set-based query for all users.
+
+        Matches come from joining the users' inventory rows to
+        recipe_ingredients and recipe sizes from recipe_summaries, so the
+        catalog is not rescanned per user. Rows are streamed in user order.
+        """
         query = text("""
-            WITH recipe_match AS (
+            WITH users AS (
+                SELECT DISTINCT unnest(CAST(:user_ids AS integer[])) AS user_id
+            ),
+            user_matches AS (
+                SELECT ui.user_id, ri.recipe_id, COUNT(*) AS matched_ingredients
+                FROM user_inventory ui
+                JOIN recipe_ingredients ri ON ri.ingredient_id = ui.ingredient_id
+                WHERE ui.user_id = ANY(CAST(:user_ids AS integer[]))
+                GROUP BY ui.user_id, ri.recipe_id
+            ),
+            candidates AS (
+                SELECT m.user_id, m.recipe_id, s.total_ingredients, m.matched_ingredients, s.ingredient_ids
+                FROM user_matches m
+                JOIN recipe_summaries s ON s.recipe_id = m.recipe_id
+                WHERE s.total_ingredients - m.matched_ingredients <= :max_missing
+                UNION ALL
+                SELECT u.user_id, s.recipe_id, s.total_ingredients, 0, s.ingredient_ids
+                FROM users u
+                CROSS JOIN recipe_summaries s
+                WHERE s.total_ingredients <= :max_missing
+                    AND NOT EXISTS (
+                        SELECT 1 FROM user_matches m
+                        WHERE m.user_id = u.user_id AND m.recipe_id = s.recipe_id
+                    )
+            ),
+            ranked AS (
                 SELECT
-                    r.id,
-                    r.name,
-                    r.description,
-                    r.cooking_time,
-                    COUNT(ri.ingredient_id) as total_ingredients,
-                    COUNT(ui.ingredient_id) as matched_ingredients,
-                    ARRAY_AGG(i.name) FILTER (WHERE ui.ingredient_id IS NULL) as missing
-                FROM recipes r
-                JOIN recipe_ingredients ri ON r.id = ri.recipe_id
-                JOIN ingredients i ON ri.ingredient_id = i.id
-                LEFT JOIN user_inventory ui ON ri.ingredient_id = ui.ingredient_id
-                    AND ui.user_id = :user_id
-                GROUP BY r.id, r.name, r.description, r.cooking_time
+                    c.*,
+                    c.total_ingredients - c.matched_ingredients AS missing_count,
+                    ROUND(c.matched_ingredients::numeric / c.total_ingredients * 100) AS match_percent
+                FROM candidates c
+            ),
+            top_matches AS (
+                SELECT
+                    ranked.*,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY user_id
+                        ORDER BY match_percent DESC, missing_count ASC, recipe_id ASC
+                    ) AS rank
+                FROM ranked
             )
             SELECT
-                id,
-                name,
-                description,
-                cooking_time,
-                total_ingredients,
-                matched_ingredients,
-                total_ingredients - matched_ingredients as missing_count,
-                ROUND(matched_ingredients::numeric / total_ingredients * 100) as match_percent,
-                COALESCE(missing, ARRAY[]::text[]) as missing_ingredients
-            FROM recipe_match
-            WHERE total_ingredients - matched_ingredients <= :max_missing
-            ORDER BY match_percent DESC, missing_count ASC
-            LIMIT :limit
+                t.user_id,
+                r.id,
+                r.name,
+                r.description,
+                r.cooking_time,
+                t.total_ingredients,
+                t.matched_ingredients,
+                t.missing_count,
+                t.match_percent,
+                ARRAY(
+                    SELECT i.name
+                    FROM unnest(t.ingredient_ids) WITH ORDINALITY AS u(ingredient_id, ord)
+                    JOIN ingredients i ON i.id = u.ingredient_id
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM user_inventory ui
+                        WHERE ui.user_id = t.user_id AND ui.ingredient_id = u.ingredient_id
+                    )
+                    ORDER BY u.ord
+                ) AS missing_ingredients
+            FROM top_matches t
+            JOIN recipes r ON r.id = t.recipe_id
+            WHERE t.rank <= :limit
+            ORDER BY t.user_id, t.rank
             """)
-        
-        result = self.db.execute(query, {
+
+        result = self.db.execute(
+            query,
+            {"user_ids": list(user_ids), "max_missing": max_missing, "limit": limit},
+            execution_options={"stream_results": True, "yield_per": 1000}
+        )
+
+        rows = iter(result)
+        row = next(rows, None)
+        for user_id in user_ids:
+            matches = []
+            while row is not None and row.user_id == user_id:
+                match = dict(row._mapping)
+                del match["user_id"]
+                matches.append(match)
+                row = next(rows, None)
+            yield user_id, matches
+
+    def _compute_matches(
+        self,
+        user_id: int,
+        max_missing: int,
+        limit: int,
+        check_quantities: bool = False,
+        servings: Optional[int] = None
+    ) -> List[dict]:
+        if check_quantities:
+            if self.engine == "memory":
+                return find_quantity_matches_memory(self.db, user_id, max_missing, limit, servings)
+            return find_quantity_matches_sql(self.db, user_id, max_missing, limit, servings)
+        if self.engine == "memory":
+            return self._find_matching_recipes_memory(user_id, max_missing, limit)
+        return self._find_matching_recipes_sql(user_id, max_missing, limit)
+
+    def _find_matching_recipes_memory(self, user_id: int, max_missing: int, limit: int) -> List[dict]:
+        """Score the user's inventory against the in-process recipe index"""
+        index = get_recipe_index(self.db)
+        inventory = load_inventory(self.db, user_id)
+        return index.match(inventory, max_missing=max_missing, limit=limit)
+
+    def _find_matching_recipes_sql(self, user_id: int, max_missing: int, limit: int) -> List[dict]:
+        """Run the matching aggregate in the database"""
+        result = self.db.execute(MATCH_QUERY, {
             "user_id": user_id,
             "max_missing": max_missing,
             "limit": limit
         })
 
         return [dict(row._mapping) for row in result]
-            
+
+
+class AsyncRecipeMatchingService:
+    """
+    asyncio version of RecipeMatchingService for DB_MODE=async.
+
+    Shares the suggestion cache and the in-memory recipe index with the
+    sync service; the index is built through AsyncSession.run_sync().
+    """
+
+    def __init__(self, db: AsyncSession, engine: str = None):
+        self.db = db
+        self.engine = engine or MATCHING_ENGINE
+
+    async def find_matching_recipes(
+        self,
+        user_id: int = 1,
+        max_missing: int = 2,
+        limit: int = 10,
+        check_quantities: bool = False,
+        servings: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Find recipes ranked by ingredient match percentage.
+        Same arguments and results as RecipeMatchingService.find_matching_recipes.
+        """
+        key = (user_id, max_missing, limit)
+        if check_quantities:
+            key += ("quantities", servings)
+        if suggestion_cache.enabled:
+            cached = suggestion_cache.get(key)
+            if cached is not None:
+                return list(cached)
+
+        generation = suggestion_cache.generation(user_id)
+
+        async def compute() -> List[dict]:
+            matches = await self._compute_matches(user_id, max_missing, limit, check_quantities, servings)
+            suggestion_cache.put(key, matches, generation)
+            return matches
+
+        return list(await suggestion_flights.do_async((key, generation), compute))
+
+    async def _compute_matches(
+        self,
+        user_id: int,
+        max_missing: int,
+        limit: int,
+        check_quantities: bool = False,
+        servings: Optional[int] = None
+    ) -> List[dict]:
+        if self.engine == "memory":
+            return await self.db.run_sync(
+                lambda db: RecipeMatchingService(db, engine="memory")
+                ._compute_matches(user_id, max_missing, limit, check_quantities, servings)
+            )
+
+        if check_quantities:
+            result = await self.db.execute(
+                QUANTITY_MATCH_QUERY, quantity_match_params(user_id, max_missing, limit, servings)
+            )
+            return [dict(row._mapping) for row in result]
+
+        result = await self.db.execute(MATCH_QUERY, {
+            "user_id": user_id,
+            "max_missing": max_missing,
+            "limit": limit
+        })
+        return [dict(row._mapping) for row in result]
@@ -0,0 +1,239 @@
+# backend/app/services/meal_plan.py
+"""
+Meal planning: pick N dinners that need the smallest shopping list.
+
+This is a set cover flavoured greedy. Each step picks the recipe that
+adds the fewest new ingredients to the shopping list. Ties go to the
+recipe whose new ingredients the most other candidates also need (so
+later picks can share them), then to the one using the most of the
+inventory and of what is already being bought.
+Picking a recipe only makes recipes sharing its new purchases cheaper,
+so after each pick just those are re-scored and pushed onto the heap
+again; outdated heap entries are skipped when they surface.
+
+The candidates are the recipes within `max_missing` of the inventory,
+found with the same recipe_summaries query (or in-memory index) as
+suggestions and capped at MAX_CANDIDATES, so planning time is bounded
+however large the catalog is. The cooking time and servings filters are
+applied before the cap, so recipes they rule out can't crowd out ones
+they allow.
+"""
+import heapq
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.config import MATCHING_ENGINE
+from app.models.recipe import Ingredient, Recipe
+from app.services.recipe_index import get_recipe_index, load_inventory
+from app.services.suggestion_cache import suggestion_cache
+
+# Recipes considered per plan, closest to the inventory first
+MAX_CANDIDATES = 2000
+
+# (recipe ID, matched count, missing ingredient IDs) - the MATCH_QUERY shape
+# over recipe_summaries, returning missing IDs instead of names
+PLAN_CANDIDATE_QUERY = """
+    WITH inventory AS (
+        SELECT DISTINCT ingredient_id
+        FROM user_inventory
+        WHERE user_id = :user_id
+    ),
+    matched AS (
+        SELECT ri.recipe_id, COUNT(*) AS matched_ingredients
+        FROM inventory inv
+        JOIN recipe_ingredients ri ON ri.ingredient_id = inv.ingredient_id
+        GROUP BY ri.recipe_id
+    ),
+    candidates AS (
+        SELECT s.recipe_id, s.total_ingredients, m.matched_ingredients, s.ingredient_ids, s.cooking_time
+        FROM matched m
+        JOIN recipe_summaries s ON s.recipe_id = m.recipe_id
+        WHERE s.total_ingredients - m.matched_ingredients <= :max_missing
+        UNION ALL
+        SELECT s.recipe_id, s.total_ingredients, 0, s.ingredient_ids, s.cooking_time
+        FROM recipe_summaries s
+        WHERE s.total_ingredients <= :max_missing
+            AND NOT EXISTS (SELECT 1 FROM matched m WHERE m.recipe_id = s.recipe_id)
+    )
+    SELECT
+        c.recipe_id,
+        c.matched_ingredients,
+        ARRAY(
+            SELECT DISTINCT u.ingredient_id
+            FROM unnest(c.ingredient_ids) AS u(ingredient_id)
+            WHERE u.ingredient_id NOT IN (SELECT ingredient_id FROM inventory)
+            ORDER BY u.ingredient_id
+        ) AS missing
+    FROM candidates c
+    JOIN recipes r ON r.id = c.recipe_id
+    WHERE TRUE {filters}
+    ORDER BY c.total_ingredients - c.matched_ingredients, c.matched_ingredients DESC, c.recipe_id
+    LIMIT :max_candidates
+    """
+
+
+def greedy_plan(
+    candidates: Dict[int, Tuple[int, FrozenSet[int]]],
+    count: int
+) -> List[Tuple[int, Set[int]]]:
+    """
+    Choose up to `count` recipes, each adding the fewest new purchases.
+
+    Args:
+        candidates: recipe ID -> (inventory ingredients used, missing ingredient IDs)
+
+    Returns:
+        [(recipe_id, ingredients first bought for it)], in pick order
+    """
+    bought: Set[int] = set()
+    needed_by: Dict[int, List[int]] = {}
+    for recipe_id, (_, missing) in candidates.items():
+        for ingredient_id in missing:
+            needed_by.setdefault(ingredient_id, []).append(recipe_id)
+
+    def key(recipe_id: int):
+        matched, missing = candidates[recipe_id]
+        new = missing - bought
+        # Among equally cheap recipes, buy what many other candidates also need
+        demand = sum(len(needed_by[ingredient_id]) for ingredient_id in new)
+        return (len(new), -demand, -(matched + len(missing) - len(new)), recipe_id)
+
+    current = {recipe_id: key(recipe_id) for recipe_id in candidates}
+    heap = list(current.values())
+    heapq.heapify(heap)
+
+    plan: List[Tuple[int, Set[int]]] = []
+    while heap and len(plan) < count:
+        entry = heapq.heappop(heap)
+        recipe_id = entry[-1]
+        if current.get(recipe_id) != entry:
+            continue  # picked already, or re-scored since this entry was pushed
+        del current[recipe_id]
+
+        new = set(candidates[recipe_id][1]) - bought
+        plan.append((recipe_id, new))
+        bought |= new
+
+        affected = {other for ingredient_id in new for other in needed_by[ingredient_id]}
+        for other in affected:
+            if other in current:
+                updated = key(other)
+                if updated != current[other]:
+                    current[other] = updated
+                    heapq.heappush(heap, updated)
+
+    return plan
+
+
+def load_plan_candidates(
+    db: Session,
+    user_id: int,
+    max_missing: int,
+    max_cooking_time: Optional[int] = None,
+    servings: Optional[int] = None,
+    engine: Optional[str] = None
+) -> List[Tuple[int, int, Sequence[int]]]:
+    """
+    (recipe ID, matched count, missing ingredient IDs), closest first, at
+    most MAX_CANDIDATES. Recipes with unknown servings pass the servings filter.
+    """
+    if (engine or MATCHING_ENGINE) == "memory":
+        index = get_recipe_index(db)
+        rows = [
+            (recipe_id, matched, missing)
+            for recipe_id, cooking_time, serves, matched, missing
+            in index.missing_by_recipe(load_inventory(db, user_id), max_missing)
+            if (max_cooking_time is None or (cooking_time is not None and cooking_time <= max_cooking_time))
+            and (servings is None or serves is None or serves >= servings)
+        ]
+        return heapq.nsmallest(MAX_CANDIDATES, rows, key=lambda row: (len(row[2]), -row[1], row[0]))
+
+    filters = []
+    params = {"user_id": user_id, "max_missing": max_missing, "max_candidates": MAX_CANDIDATES}
+    if max_cooking_time is not None:
+        filters.append("AND c.cooking_time <= :max_cooking_time")
+        params["max_cooking_time"] = max_cooking_time
+    if servings is not None:
+        filters.append("AND (r.servings IS NULL OR r.servings >= :servings)")
+        params["servings"] = servings
+    rows = db.execute(text(PLAN_CANDIDATE_QUERY.format(filters=" ".join(filters))), params)
+    return [(row.recipe_id, row.matched_ingredients, row.missing) for row in rows]
+
+
+def plan_meals(
+    db: Session,
+    user_id: int = 1,
+    count: int = 5,
+    max_missing: int = 3,
+    max_cooking_time: Optional[int] = None,
+    servings: Optional[int] = None,
+    engine: Optional[str] = None
+) -> dict:
+    """
+    Plan `count` dinners for a user's inventory with the smallest shopping list.
+
+    Args:
+        max_missing: Only consider recipes missing at most this many ingredients
+        max_cooking_time: Only recipes ready within this many minutes
+        servings: Only recipes serving at least this many (unknown servings are allowed)
+
+    Returns:
+        {"recipes": [...], "shopping_list": [...], "inventory_ingredients_used": n}
+        shaped like MealPlan
+    """
+    key = (user_id, "meal_plan", count, max_missing, max_cooking_time, servings)
+    if suggestion_cache.enabled:
+        cached = suggestion_cache.get(key)
+        if cached is not None:
+            return cached
+    generation = suggestion_cache.generation(user_id)
+
+    rows = load_plan_candidates(db, user_id, max_missing, max_cooking_time, servings, engine)
+    details = {}
+    if rows:
+        details = {
+            row.id: row for row in db.execute(
+                select(Recipe.id, Recipe.name, Recipe.cooking_time, Recipe.servings)
+                .where(Recipe.id.in_([recipe_id for recipe_id, _, _ in rows]))
+            )
+        }
+
+    candidates = {
+        recipe_id: (matched, frozenset(missing))
+        for recipe_id, matched, missing in rows
+        if recipe_id in details
+    }
+    plan = greedy_plan(candidates, count)
+
+    to_buy: Dict[int, List[int]] = {}
+    for recipe_id, _ in plan:
+        for ingredient_id in sorted(candidates[recipe_id][1]):
+            to_buy.setdefault(ingredient_id, []).append(recipe_id)
+    names = dict(db.execute(
+        select(Ingredient.id, Ingredient.name).where(Ingredient.id.in_(list(to_buy)))
+    ).all()) if to_buy else {}
+
+    report = {
+        "recipes": [
+            {
+                "id": recipe_id,
+                "name": details[recipe_id].name,
+                "cooking_time": details[recipe_id].cooking_time,
+                "servings": details[recipe_id].servings,
+                "missing_ingredients": [names[i] for i in sorted(candidates[recipe_id][1])],
+                "new_purchases": len(new),
+            }
+            for recipe_id, new in plan
+        ],
+        "shopping_list": [
+            {"ingredient_id": ingredient_id, "name": names[ingredient_id], "recipe_ids": recipe_ids}
+            for ingredient_id, recipe_ids in sorted(to_buy.items(), key=lambda item: names[item[0]])
+        ],
+        "inventory_ingredients_used": sum(candidates[recipe_id][0] for recipe_id, _ in plan),
+    }
+
+    if suggestion_cache.enabled:
+        suggestion_cache.put(key, report, generation)
+    return report
@@ -0,0 +1,277 @@
+# backend/app/services/quantity_matching.py
+"""
+Quantity-aware recipe matching.
+
+Presence matching counts an ingredient as matched whenever it is in the
+inventory. Here both sides are converted to base units (app.services.units)
+and the recipe's quantity - scaled to the requested servings - is checked
+against what the user has. An ingredient without enough stock counts as
+missing and is reported as a shortfall. Quantities that can't be compared
+(no quantity, unknown unit, mass vs volume) fall back to presence.
+
+Sufficiency is scored for all candidate recipes at once: in one set-based
+query on Postgres, or for the memory engine by comparing columns of
+needed and available amounts built from batched quantity lookups.
+"""
+import heapq
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, select, text
+from sqlalchemy.orm import Session
+
+from app.models.recipe import Recipe, RecipeIngredient, UserInventory
+from app.services.recipe_index import get_recipe_index
+from app.services.recipe_snapshot import match_percent
+from app.services.units import TOLERANCE, lookup, to_base, unit_table
+
+# Candidate recipe IDs per quantity lookup in the memory engine
+# (SQLite allows 999 bind parameters before 3.32)
+LOOKUP_CHUNK = 500
+
+QUANTITY_MATCH_QUERY = text("""
+    WITH units AS (
+        SELECT *
+        FROM unnest(
+            CAST(:unit_names AS text[]),
+            CAST(:unit_dimensions AS text[]),
+            CAST(:unit_factors AS double precision[])
+        ) AS u(unit, dimension, factor)
+    ),
+    inventory AS (
+        SELECT ui.ingredient_id, ui.quantity * u.factor AS have, u.dimension
+        FROM user_inventory ui
+        LEFT JOIN units u ON u.unit = lower(trim(ui.unit))
+        WHERE ui.user_id = :user_id
+    ),
+    requirements AS (
+        SELECT
+            ri.recipe_id,
+            ri.ingredient_id,
+            ri.unit,
+            u.factor,
+            ri.quantity * COALESCE(CAST(:servings AS double precision) / NULLIF(r.servings, 0), 1) AS needed,
+            inv.have,
+            (inv.have IS NOT NULL AND ri.quantity IS NOT NULL AND u.dimension = inv.dimension) AS comparable
+        FROM inventory inv
+        JOIN recipe_ingredients ri ON ri.ingredient_id = inv.ingredient_id
+        JOIN recipes r ON r.id = ri.recipe_id
+        LEFT JOIN units u ON u.unit = lower(trim(ri.unit))
+    ),
+    scored AS (
+        SELECT
+            requirements.*,
+            NOT comparable OR have >= needed * factor * (1 - :tolerance) AS sufficient
+        FROM requirements
+    ),
+    matched AS (
+        SELECT recipe_id, COUNT(*) FILTER (WHERE sufficient) AS matched_ingredients
+        FROM scored
+        GROUP BY recipe_id
+    ),
+    candidates AS (
+        SELECT s.recipe_id, s.total_ingredients, m.matched_ingredients, s.ingredient_ids
+        FROM matched m
+        JOIN recipe_summaries s ON s.recipe_id = m.recipe_id
+        WHERE s.total_ingredients - m.matched_ingredients <= :max_missing
+        UNION ALL
+        SELECT s.recipe_id, s.total_ingredients, 0, s.ingredient_ids
+        FROM recipe_summaries s
+        WHERE s.total_ingredients <= :max_missing
+            AND NOT EXISTS (SELECT 1 FROM matched m WHERE m.recipe_id = s.recipe_id)
+    ),
+    top_matches AS (
+        SELECT
+            recipe_id,
+            ingredient_ids,
+            total_ingredients,
+            matched_ingredients,
+            total_ingredients - matched_ingredients as missing_count,
+            ROUND(matched_ingredients::numeric / total_ingredients * 100) as match_percent
+        FROM candidates
+        ORDER BY match_percent DESC, missing_count ASC, recipe_id ASC
+        LIMIT :limit
+    )
+    SELECT
+        r.id,
+        r.name,
+        r.description,
+        r.cooking_time,
+        t.total_ingredients,
+        t.matched_ingredients,
+        t.missing_count,
+        t.match_percent,
+        ARRAY(
+            SELECT i.name
+            FROM unnest(t.ingredient_ids) WITH ORDINALITY AS u(ingredient_id, ord)
+            JOIN ingredients i ON i.id = u.ingredient_id
+            WHERE u.ingredient_id NOT IN (SELECT ingredient_id FROM inventory)
+            ORDER BY u.ord
+        ) as missing_ingredients,
+        COALESCE((
+            SELECT json_agg(json_build_object(
+                'ingredient_id', s.ingredient_id,
+                'name', i.name,
+                'unit', s.unit,
+                'needed', ROUND(s.needed::numeric, 2),
+                'available', ROUND((s.have / s.factor)::numeric, 2),
+                'missing', ROUND((s.needed - s.have / s.factor)::numeric, 2)
+            ) ORDER BY s.ingredient_id)
+            FROM scored s
+            JOIN ingredients i ON i.id = s.ingredient_id
+            WHERE s.recipe_id = t.recipe_id AND NOT s.sufficient
+        ), '[]'::json) as shortfalls
+    FROM top_matches t
+    JOIN recipes r ON r.id = t.recipe_id
+    ORDER BY t.match_percent DESC, t.missing_count ASC, t.recipe_id ASC
+    """)
+
+
+def quantity_match_params(user_id: int, max_missing: int, limit: int, servings: Optional[int]) -> dict:
+    """Bind parameters for QUANTITY_MATCH_QUERY"""
+    names, dimensions, factors = unit_table()
+    return {
+        "user_id": user_id,
+        "max_missing": max_missing,
+        "limit": limit,
+        "servings": servings,
+        "tolerance": TOLERANCE,
+        "unit_names": names,
+        "unit_dimensions": dimensions,
+        "unit_factors": factors,
+    }
+
+
+def find_shortfalls(rows, available: Dict[int, Optional[Tuple[str, float]]], servings: Optional[int]) -> Dict[int, List[dict]]:
+    """
+    Shortfalls per recipe, from the requirements of one quantity lookup.
+
+    The rows are turned into columns (needed and available, in base units)
+    and compared in one pass; only rows that fall short become dicts.
+    Quantities that can't be compared (unknown unit, different dimension)
+    count as enough.
+
+    Args:
+        rows: (recipe_id, ingredient_id, quantity, unit, recipe servings)
+        available: ingredient ID -> (dimension, base quantity) from to_base()
+        servings: Requested servings; None for the recipe as written
+    """
+    units = {}
+    recipe_ids, ingredient_ids, unit_names = [], [], []
+    scaled, factors, have = array("d"), array("d"), array("d")
+    for recipe_id, ingredient_id, quantity, unit, recipe_servings in rows:
+        if unit not in units:
+            units[unit] = lookup(unit)
+        found, stock = units[unit], available.get(ingredient_id)
+        if found is None or stock is None or found[0] != stock[0]:
+            continue
+        recipe_ids.append(recipe_id)
+        ingredient_ids.append(ingredient_id)
+        unit_names.append(unit)
+        scaled.append(float(quantity) * (servings / recipe_servings if servings and recipe_servings else 1))
+        factors.append(found[1])
+        have.append(stock[1])
+
+    needed = array("d", (amount * factor * (1 - TOLERANCE) for amount, factor in zip(scaled, factors)))
+    short = [i for i, (need, stock) in enumerate(zip(needed, have)) if stock < need]
+
+    shortfalls: Dict[int, List[dict]] = defaultdict(list)
+    for i in short:
+        available_amount = have[i] / factors[i]
+        shortfalls[recipe_ids[i]].append({
+            "ingredient_id": ingredient_ids[i],
+            "unit": unit_names[i],
+            "needed": round(scaled[i], 2),
+            "available": round(available_amount, 2),
+            "missing": round(scaled[i] - available_amount, 2),
+        })
+    return shortfalls
+
+
+def find_quantity_matches_sql(
+    db: Session,
+    user_id: int,
+    max_missing: int,
+    limit: int,
+    servings: Optional[int] = None
+) -> List[dict]:
+    """Run quantity-aware matching in Postgres"""
+    result = db.execute(QUANTITY_MATCH_QUERY, quantity_match_params(user_id, max_missing, limit, servings))
+    return [dict(row._mapping) for row in result]
+
+
+def find_quantity_matches_memory(
+    db: Session,
+    user_id: int,
+    max_missing: int,
+    limit: int,
+    servings: Optional[int] = None
+) -> List[dict]:
+    """
+    Quantity-aware matching on the in-memory recipe index.
+
+    Enough stock can only turn a matched ingredient into a missing one, so
+    the presence candidates are a superset of the answer. They are scored
+    from index positions. Quantities are then fetched only for candidates
+    that matched something, and only for the ingredients the user stocks
+    (a join on user_inventory), LOOKUP_CHUNK recipe IDs per query so the
+    IN list stays within SQLite's bind limit. Only the top `limit` become
+    result rows.
+    """
+    index = get_recipe_index(db)
+
+    available: Dict[int, Optional[Tuple[str, float]]] = {
+        ingredient_id: to_base(quantity, unit)
+        for ingredient_id, quantity, unit in db.execute(
+            select(UserInventory.ingredient_id, UserInventory.quantity, UserInventory.unit)
+            .where(UserInventory.user_id == user_id)
+        )
+    }
+
+    candidates = index.scores(available.keys(), max_missing)
+    if not candidates:
+        return []
+
+    matched_ids = [recipe_id for _, recipe_id, _, matched in candidates if matched]
+    rows = []
+    for start in range(0, len(matched_ids), LOOKUP_CHUNK):
+        rows.extend(db.execute(
+            select(
+                RecipeIngredient.recipe_id,
+                RecipeIngredient.ingredient_id,
+                RecipeIngredient.quantity,
+                RecipeIngredient.unit,
+                Recipe.servings,
+            )
+            .join(Recipe, Recipe.id == RecipeIngredient.recipe_id)
+            .join(UserInventory, and_(
+                UserInventory.ingredient_id == RecipeIngredient.ingredient_id,
+                UserInventory.user_id == user_id,
+            ))
+            .where(
+                RecipeIngredient.recipe_id.in_(matched_ids[start:start + LOOKUP_CHUNK]),
+                RecipeIngredient.quantity.is_not(None),
+                UserInventory.quantity.is_not(None),
+            )
+        ))
+    shortfalls = find_shortfalls(rows, available, servings)
+
+    scored = []
+    for pos, recipe_id, total, matched in candidates:
+        matched -= len(shortfalls.get(recipe_id, ()))
+        missing = total - matched
+        if missing <= max_missing:
+            scored.append((-match_percent(matched, total), missing, recipe_id, pos, matched))
+
+    top = heapq.nsmallest(limit, scored)
+    results = index.match_rows(available.keys(), [(pos, matched) for _, _, _, pos, matched in top])
+    for match in results:
+        match["shortfalls"] = sorted(
+            (
+                {"ingredient_id": short["ingredient_id"], "name": index.ingredient_names[short["ingredient_id"]], **short}
+                for short in shortfalls.get(match["id"], [])
+            ),
+            key=lambda short: short["ingredient_id"]
+        )
+    return results
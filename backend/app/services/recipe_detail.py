@@ -0,0 +1,60 @@
+# backend/app/services/recipe_detail.py
+"""
+Recipes with their ingredients embedded, read with one join.
+
+RECIPE_DETAIL_QUERY joins recipes -> recipe_ingredients -> ingredients
+ordered by recipe; group_recipe_rows() folds the rows back into one dict
+per recipe, already in the RecipeDetail shape. Used by the detail
+endpoint and by the catalog export.
+"""
+import itertools
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.recipe import Ingredient, Recipe, RecipeIngredient
+
+RECIPE_DETAIL_QUERY = (
+    select(
+        Recipe.id, Recipe.name, Recipe.description, Recipe.instructions,
+        Recipe.cooking_time, Recipe.servings,
+        RecipeIngredient.ingredient_id, Ingredient.name.label("ingredient"),
+        RecipeIngredient.quantity, RecipeIngredient.unit, RecipeIngredient.notes,
+    )
+    .outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+    .outerjoin(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+    .order_by(Recipe.id, RecipeIngredient.id)
+)
+
+
+def group_recipe_rows(rows: Iterable) -> Iterator[dict]:
+    """One dict per recipe from RECIPE_DETAIL_QUERY rows"""
+    for _, group in itertools.groupby(rows, key=lambda row: row.id):
+        first = next(group)
+        recipe = {
+            "id": first.id,
+            "name": first.name,
+            "description": first.description,
+            "instructions": first.instructions,
+            "cooking_time": first.cooking_time,
+            "servings": first.servings,
+            "ingredients": [],
+        }
+        for row in itertools.chain((first,), group):
+            if row.ingredient_id is None:
+                continue
+            recipe["ingredients"].append({
+                "ingredient_id": row.ingredient_id,
+                "name": row.ingredient,
+                "quantity": float(row.quantity) if row.quantity is not None else None,
+                "unit": row.unit,
+                "notes": row.notes,
+            })
+        yield recipe
+
+
+def load_recipe_detail(db: Session, recipe_id: int) -> Optional[dict]:
+    """A recipe with its ingredient names, quantities and units, or None"""
+    rows = db.execute(RECIPE_DETAIL_QUERY.where(Recipe.id == recipe_id))
+    return next(group_recipe_rows(rows), None)
@@ -0,0 +1,368 @@
+# backend/app/services/recipe_index.py
+"""
+In-memory recipe index used by the "memory" matching engine.
+
+Holds every recipe's ingredient list once per process:
+- an inverted index from ingredient ID to the recipes that use it
+- a bitset (python int) per recipe with one bit per ingredient
+
+Scoring an inventory only touches recipes that share at least one
+ingredient with it (plus the small recipes that could be missing
+everything), and each candidate is scored with a single AND + popcount.
+"""
+import heapq
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import MATCHING_INDEX_TTL, RECIPE_SNAPSHOT_DIR
+from app.models.recipe import Recipe, RecipeIngredient, Ingredient, UserInventory
+from app.services.recipe_snapshot import get_snapshot, invalidate_snapshot, match_percent, schedule_refresh
+
+
+class RecipeIndex:
+    """
+    Inverted index + per-recipe ingredient bitsets for the whole catalog.
+    """
+
+    def __init__(self):
+        self.loaded_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Per-recipe columns, addressed by position
+        self.recipe_ids: List[int] = []
+        self.names: List[str] = []
+        self.descriptions: List[Optional[str]] = []
+        self.cooking_times: List[Optional[int]] = []
+        self.servings: List[Optional[int]] = []
+        self.ingredients: List[Tuple[int, ...]] = []  # sorted ingredient IDs
+        self.masks: List[int] = []
+        self.totals: List[int] = []
+
+        # Recipes listing the same ingredient twice can't be scored by popcount
+        self.duplicates: set = set()
+
+        self.positions: Dict[int, int] = {}  # recipe ID -> position
+        self.postings: Dict[int, List[int]] = {}  # ingredient ID -> recipe positions
+        self.by_total: Dict[int, List[int]] = {}  # ingredient count -> recipe positions
+        self.bits: Dict[int, int] = {}  # ingredient ID -> bit number
+        self.ingredient_names: Dict[int, str] = {}
+
+    @classmethod
+    def load(cls, db: Session) -> "RecipeIndex":
+        """
+        Build the index from the database with a single join.
+        """
+        query = (
+            select(
+                Recipe.id,
+                Recipe.name,
+                Recipe.description,
+                Recipe.cooking_time,
+                Recipe.servings,
+                RecipeIngredient.ingredient_id,
+                Ingredient.name,
+            )
+            .join(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+            .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+            .order_by(Recipe.id, RecipeIngredient.id)
+        )
+
+        index = cls()
+        current_id = None
+        current = None
+        rows: List[Tuple[int, str]] = []
+
+        for recipe_id, name, description, cooking_time, servings, ingredient_id, ingredient_name in db.execute(query):
+            if recipe_id != current_id:
+                if current is not None:
+                    index._add(*current, rows)
+                current_id = recipe_id
+                current = (recipe_id, name, description, cooking_time, servings)
+                rows = []
+            rows.append((ingredient_id, ingredient_name))
+
+        if current is not None:
+            index._add(*current, rows)
+
+        return index
+
+    def add_recipe(
+        self,
+        recipe_id: int,
+        name: str,
+        description: Optional[str],
+        cooking_time: Optional[int],
+        ingredients: Sequence[Tuple[int, str]],
+        servings: Optional[int] = None
+    ):
+        """
+        Add (or replace) a single recipe without reloading the catalog.
+
+        Args:
+            ingredients: (ingredient_id, ingredient_name) pairs
+        """
+        with self._lock:
+            if recipe_id in self.positions:
+                self._remove(self.positions[recipe_id])
+            if ingredients:
+                self._add(recipe_id, name, description, cooking_time, servings, ingredients)
+
+    def _add(self, recipe_id, name, description, cooking_time, servings, ingredients):
+        pos = len(self.recipe_ids)
+        ingredient_ids = tuple(sorted(ing_id for ing_id, _ in ingredients))
+
+        mask = 0
+        for ing_id, ing_name in ingredients:
+            bit = self.bits.get(ing_id)
+            if bit is None:
+                bit = self.bits[ing_id] = len(self.bits)
+            mask |= 1 << bit
+            self.ingredient_names[ing_id] = ing_name
+
+        self.recipe_ids.append(recipe_id)
+        self.names.append(name)
+        self.descriptions.append(description)
+        self.cooking_times.append(cooking_time)
+        self.servings.append(servings)
+        self.ingredients.append(ingredient_ids)
+        self.masks.append(mask)
+        self.totals.append(len(ingredient_ids))
+        self.positions[recipe_id] = pos
+
+        if len(set(ingredient_ids)) != len(ingredient_ids):
+            self.duplicates.add(pos)
+
+        for ing_id in set(ingredient_ids):
+            self.postings.setdefault(ing_id, []).append(pos)
+        self.by_total.setdefault(len(ingredient_ids), []).append(pos)
+
+    def _remove(self, pos: int):
+        # Positions are never reused; the slot is just unlinked from lookups
+        recipe_id = self.recipe_ids[pos]
+        del self.positions[recipe_id]
+        for ing_id in set(self.ingredients[pos]):
+            self.postings[ing_id].remove(pos)
+        self.by_total[self.totals[pos]].remove(pos)
+        self.duplicates.discard(pos)
+
+    def inventory_mask(self, ingredient_ids: Iterable[int]) -> int:
+        """Bitset for an inventory (ingredients no recipe uses are ignored)"""
+        mask = 0
+        for ing_id in ingredient_ids:
+            bit = self.bits.get(ing_id)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def _candidates(self, inventory: set, max_missing: int) -> Iterator[Tuple[int, int]]:
+        """
+        (position, matched count) of every recipe missing at most
+        `max_missing` ingredients. Caller holds the lock.
+        """
+        inv_mask = self.inventory_mask(inventory)
+
+        candidates = set()
+        for ing_id in inventory:
+            candidates.update(self.postings.get(ing_id, ()))
+        for total in range(1, max_missing + 1):
+            candidates.update(self.by_total.get(total, ()))
+
+        for pos in candidates:
+            if pos in self.duplicates:
+                matched = sum(1 for ing_id in self.ingredients[pos] if ing_id in inventory)
+            else:
+                matched = (self.masks[pos] & inv_mask).bit_count()
+            if self.totals[pos] - matched <= max_missing:
+                yield pos, matched
+
+    def near_misses(self, inventory: Iterable[int], max_missing: int = 2) -> List[Tuple[int, ...]]:
+        """
+        Missing ingredient IDs (distinct, sorted) of every recipe that is
+        1..max_missing ingredients away from complete.
+        """
+        inventory = set(inventory)
+
+        with self._lock:
+            return [
+                tuple(sorted(set(self.ingredients[pos]) - inventory))
+                for pos, matched in self._candidates(inventory, max_missing)
+                if matched < self.totals[pos]
+            ]
+
+    def missing_by_recipe(
+        self,
+        inventory: Iterable[int],
+        max_missing: int
+    ) -> List[Tuple[int, Optional[int], Optional[int], int, Tuple[int, ...]]]:
+        """
+        (recipe ID, cooking time, servings, matched count, missing ingredient IDs)
+        of every recipe missing at most `max_missing` ingredients.
+        """
+        inventory = set(inventory)
+
+        with self._lock:
+            return [
+                (
+                    self.recipe_ids[pos],
+                    self.cooking_times[pos],
+                    self.servings[pos],
+                    matched,
+                    tuple(sorted(set(self.ingredients[pos]) - inventory)),
+                )
+                for pos, matched in self._candidates(inventory, max_missing)
+            ]
+
+    def scores(self, inventory: Iterable[int], max_missing: int) -> List[Tuple[int, int, int, int]]:
+        """
+        (position, recipe ID, total ingredients, matched count) of every
+        recipe missing at most `max_missing` ingredients, without building
+        result rows. Positions are only meaningful to match_rows().
+        """
+        inventory = set(inventory)
+
+        with self._lock:
+            return [
+                (pos, self.recipe_ids[pos], self.totals[pos], matched)
+                for pos, matched in self._candidates(inventory, max_missing)
+            ]
+
+    def match_rows(self, inventory: Iterable[int], scored: Iterable[Tuple[int, int]]) -> List[dict]:
+        """match() rows for (position, matched count) pairs from scores()"""
+        inventory = set(inventory)
+
+        with self._lock:
+            return [self._row(pos, matched, inventory) for pos, matched in scored]
+
+    def match(
+        self,
+        inventory: Iterable[int],
+        max_missing: int = 2,
+        limit: int = 10
+    ) -> List[dict]:
+        """
+        Score an inventory against the catalog.
+
+        Returns the same rows, in the same order, as the SQL matching query.
+        Ties on (match_percent, missing_count) are broken by recipe ID and
+        missing ingredients are listed in ingredient ID order.
+        """
+        inventory = set(inventory)
+
+        with self._lock:
+            scored = []
+            for pos, matched in self._candidates(inventory, max_missing):
+                total = self.totals[pos]
+                scored.append((-match_percent(matched, total), total - matched, self.recipe_ids[pos], pos, matched))
+
+            top = heapq.nsmallest(limit, scored)
+            return [self._row(pos, matched, inventory) for _, _, _, pos, matched in top]
+
+    def _row(self, pos: int, matched: int, inventory: set) -> dict:
+        total = self.totals[pos]
+        return {
+            "id": self.recipe_ids[pos],
+            "name": self.names[pos],
+            "description": self.descriptions[pos],
+            "cooking_time": self.cooking_times[pos],
+            "total_ingredients": total,
+            "matched_ingredients": matched,
+            "missing_count": total - matched,
+            "match_percent": float(match_percent(matched, total)),
+            "missing_ingredients": [
+                self.ingredient_names[ing_id]
+                for ing_id in self.ingredients[pos]
+                if ing_id not in inventory
+            ],
+        }
+
+
+# Process-wide index, built on first use
+_index: Optional[RecipeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_recipe_index(db: Session) -> RecipeIndex:
+    """
+    Return the shared recipe index, (re)loading it when missing or stale.
+    With RECIPE_SNAPSHOT_DIR set this is the mmap'd snapshot instead.
+    """
+    global _index
+
+    if RECIPE_SNAPSHOT_DIR:
+        return get_snapshot(db)
+
+    index = _index
+    if index is not None and not _is_stale(index):
+        return index
+
+    with _index_lock:
+        if _index is None or _is_stale(_index):
+            _index = RecipeIndex.load(db)
+        return _index
+
+
+def _is_stale(index: RecipeIndex) -> bool:
+    return MATCHING_INDEX_TTL > 0 and time.monotonic() - index.loaded_at > MATCHING_INDEX_TTL
+
+
+def invalidate_recipe_index():
+    """Drop the shared index so the next request reloads it"""
+    global _index
+    if RECIPE_SNAPSHOT_DIR:
+        invalidate_snapshot()
+    with _index_lock:
+        _index = None
+
+
+def index_recipe(db: Session, recipe: Recipe):
+    """
+    Add a newly created recipe to the shared index, if one is loaded.
+    A snapshot is rebuilt in the background instead (schedule_refresh),
+    so the request doesn't wait for it.
+    """
+    if RECIPE_SNAPSHOT_DIR:
+        schedule_refresh()
+        return
+
+    index = _index
+    if index is None:
+        return
+
+    rows = db.execute(
+        select(RecipeIngredient.ingredient_id, Ingredient.name)
+        .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+        .where(RecipeIngredient.recipe_id == recipe.id)
+        .order_by(RecipeIngredient.id)
+    ).all()
+
+    index.add_recipe(
+        recipe.id,
+        recipe.name,
+        recipe.description,
+        recipe.cooking_time,
+        [(ing_id, name) for ing_id, name in rows],
+        recipe.servings
+    )
+
+
+def load_inventory(db: Session, user_id: int) -> List[int]:
+    """Ingredient IDs in a user's inventory"""
+    return list(db.execute(
+        select(UserInventory.ingredient_id).where(UserInventory.user_id == user_id)
+    ).scalars())
+
+
+def load_inventories(db: Session, user_ids: Sequence[int]) -> Dict[int, List[int]]:
+    """Ingredient IDs for several users' inventories, in one query"""
+    inventories: Dict[int, List[int]] = {user_id: [] for user_id in user_ids}
+    rows = db.execute(
+        select(UserInventory.user_id, UserInventory.ingredient_id)
+        .where(UserInventory.user_id.in_(list(user_ids)))
+    )
+    for user_id, ingredient_id in rows:
+        inventories[user_id].append(ingredient_id)
+    return inventories
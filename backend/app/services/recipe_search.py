@@ -0,0 +1,287 @@
+# backend/app/services/recipe_search.py
+"""
+Full-text recipe search with ranking and highlighted snippets.
+
+On Postgres, recipes.search_vector is a stored, GIN-indexed tsvector
+(name weighted A, description B, instructions C - see RECIPE_SEARCH_DDL).
+The text match, the "uses ingredient" filter and the cooking time filter
+run as one query; only the top `limit` rows are ranked into snippets,
+since ts_headline re-parses the document and is the expensive part.
+
+Other databases (SQLite in tests) get RecipeTextIndex, an in-process
+inverted index with the same weights and result shape. It is rebuilt
+when the recipes catalog version changes.
+"""
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.http_cache import RECIPES, catalog_versions
+from app.models.recipe import Recipe, RecipeIngredient
+
+START_SEL = "<mark>"
+STOP_SEL = "</mark>"
+HEADLINE_OPTIONS = f"StartSel={START_SEL}, StopSel={STOP_SEL}, MaxWords=30, MinWords=10, MaxFragments=2"
+
+SEARCH_QUERY = """
+    WITH query AS (
+        SELECT websearch_to_tsquery('english', :q) AS tsq
+    ),
+    ranked AS (
+        SELECT r.id, ts_rank(r.search_vector, query.tsq, 1) AS rank
+        FROM recipes r, query
+        WHERE r.search_vector @@ query.tsq
+            {filters}
+        ORDER BY rank DESC, r.id
+        LIMIT :limit
+    )
+    SELECT
+        r.id,
+        r.name,
+        r.description,
+        r.cooking_time,
+        ranked.rank,
+        ts_headline(
+            'english',
+            coalesce(nullif(concat_ws(' ', r.description, r.instructions), ''), r.name),
+            query.tsq,
+            :headline_options
+        ) AS snippet
+    FROM ranked
+    JOIN recipes r ON r.id = ranked.id
+    CROSS JOIN query
+    ORDER BY ranked.rank DESC, r.id
+    """
+
+# Recipes using every one of :ingredient_ids
+INGREDIENT_FILTER = """
+            AND r.id IN (
+                SELECT recipe_id
+                FROM recipe_ingredients
+                WHERE ingredient_id = ANY(:ingredient_ids)
+                GROUP BY recipe_id
+                HAVING COUNT(DISTINCT ingredient_id) = :ingredient_count
+            )"""
+COOKING_TIME_FILTER = """
+            AND r.cooking_time <= :max_cooking_time"""
+
+
+def search_recipes_sql(
+    db: Session,
+    q: str,
+    ingredient_ids: Sequence[int] = (),
+    max_cooking_time: Optional[int] = None,
+    limit: int = 20
+) -> List[dict]:
+    """Ranked search against the GIN-indexed search_vector (Postgres)"""
+    filters = ""
+    params = {"q": q, "limit": limit, "headline_options": HEADLINE_OPTIONS}
+    if ingredient_ids:
+        filters += INGREDIENT_FILTER
+        params["ingredient_ids"] = list(set(ingredient_ids))
+        params["ingredient_count"] = len(params["ingredient_ids"])
+    if max_cooking_time is not None:
+        filters += COOKING_TIME_FILTER
+        params["max_cooking_time"] = max_cooking_time
+
+    rows = db.execute(text(SEARCH_QUERY.format(filters=filters)), params)
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "description": row.description,
+            "cooking_time": row.cooking_time,
+            "rank": float(row.rank),
+            "snippet": row.snippet,
+        }
+        for row in rows
+    ]
+
+
+# Fallback index ---------------------------------------------------------
+
+# Same relative weights as ts_rank's defaults for A, B and C
+FIELD_WEIGHTS = (("name", 1.0), ("description", 0.4), ("instructions", 0.2))
+SNIPPET_WORDS = 30
+
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have in into is it its of on or
+    over so than that the then this to until up was were will with
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _stem(word: str) -> str:
+    """Crude plural folding, so "onions" finds "onion" as it does in Postgres"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Lowercased, stemmed terms of `value`, stop words dropped"""
+    if not value:
+        return []
+    return [_stem(word) for word in _WORD.findall(value.lower()) if word not in STOP_WORDS]
+
+
+def parse_query(q: str) -> Tuple[Set[str], Set[str]]:
+    """
+    (required, excluded) terms of a websearch-style query. The fallback
+    treats quoted phrases as plain terms and has no OR.
+    """
+    required, excluded = set(), set()
+    for word in q.replace('"', " ").split():
+        negate = word.startswith("-")
+        terms = tokenize(word)
+        (excluded if negate else required).update(terms)
+    return required - excluded, excluded
+
+
+class RecipeTextIndex:
+    """In-process inverted index over recipe name, description and instructions"""
+
+    def __init__(self, version: int = 0):
+        self.version = version
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.lengths: Dict[int, int] = {}
+        self.recipes: Dict[int, dict] = {}
+        self.ingredients: Dict[int, Set[int]] = {}
+        self.ingredient_postings: Dict[int, Set[int]] = {}
+
+    @classmethod
+    def load(cls, db: Session, version: int = 0) -> "RecipeTextIndex":
+        index = cls(version)
+        rows = db.execute(select(
+            Recipe.id, Recipe.name, Recipe.description, Recipe.instructions, Recipe.cooking_time
+        ))
+        for row in rows:
+            index.add(row._asdict())
+        for recipe_id, ingredient_id in db.execute(
+            select(RecipeIngredient.recipe_id, RecipeIngredient.ingredient_id)
+        ):
+            index.ingredient_postings.setdefault(ingredient_id, set()).add(recipe_id)
+        return index
+
+    def add(self, recipe: dict):
+        recipe_id = recipe["id"]
+        self.recipes[recipe_id] = recipe
+        length = 0
+        for field, weight in FIELD_WEIGHTS:
+            terms = tokenize(recipe.get(field))
+            length += len(terms)
+            for term, count in Counter(terms).items():
+                scores = self.postings.setdefault(term, {})
+                # Sub-linear in repeats, like ts_rank
+                scores[recipe_id] = scores.get(recipe_id, 0.0) + weight * (1 + math.log(count))
+        self.lengths[recipe_id] = length
+
+    def search(
+        self,
+        q: str,
+        ingredient_ids: Sequence[int] = (),
+        max_cooking_time: Optional[int] = None,
+        limit: int = 20
+    ) -> List[dict]:
+        required, excluded = parse_query(q)
+        if not required:
+            return []
+
+        postings = sorted((self.postings.get(term, {}) for term in required), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        for term in excluded:
+            candidates.difference_update(self.postings.get(term, {}))
+        for ingredient_id in set(ingredient_ids):
+            candidates.intersection_update(self.ingredient_postings.get(ingredient_id, ()))
+        if max_cooking_time is not None:
+            candidates = {
+                recipe_id for recipe_id in candidates
+                if self.recipes[recipe_id]["cooking_time"] is not None
+                and self.recipes[recipe_id]["cooking_time"] <= max_cooking_time
+            }
+
+        # Normalised by 1 + log(document length), as ts_rank(..., 1) does
+        ranked = sorted(
+            (
+                (sum(posting[recipe_id] for posting in postings) / (1 + math.log(self.lengths[recipe_id] or 1)),
+                 recipe_id)
+                for recipe_id in candidates
+            ),
+            key=lambda item: (-item[0], item[1])
+        )[:limit]
+
+        results = []
+        for rank, recipe_id in ranked:
+            recipe = self.recipes[recipe_id]
+            results.append({
+                "id": recipe_id,
+                "name": recipe["name"],
+                "description": recipe["description"],
+                "cooking_time": recipe["cooking_time"],
+                "rank": rank,
+                "snippet": headline(recipe, required),
+            })
+        return results
+
+
+def headline(recipe: dict, terms: Set[str]) -> str:
+    """A window of the description/instructions around the first match, matches marked"""
+    body = " ".join(value for value in (recipe["description"], recipe["instructions"]) if value)
+    words = (body or recipe["name"]).split()
+
+    matches = [i for i, word in enumerate(words) if set(tokenize(word)) & terms]
+    start = max(0, matches[0] - 5) if matches else 0
+    window = words[start:start + SNIPPET_WORDS]
+    return " ".join(
+        f"{START_SEL}{word}{STOP_SEL}" if set(tokenize(word)) & terms else word
+        for word in window
+    )
+
+
+# Process-wide fallback index, rebuilt when the recipes catalog changes
+_index: Optional[RecipeTextIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_recipe_text_index(db: Session) -> RecipeTextIndex:
+    global _index
+
+    version = catalog_versions.get(RECIPES)
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = RecipeTextIndex.load(db, version)
+        return _index
+
+
+def search_recipes(
+    db: Session,
+    q: str,
+    ingredient_ids: Sequence[int] = (),
+    max_cooking_time: Optional[int] = None,
+    limit: int = 20
+) -> List[dict]:
+    """
+    Recipes matching the text query `q`, best first, optionally limited to
+    those using every ingredient in `ingredient_ids` and cooking in at most
+    `max_cooking_time` minutes.
+
+    Returns:
+        Dicts shaped like RecipeSearchResult
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return search_recipes_sql(db, q, ingredient_ids, max_cooking_time, limit)
+    return get_recipe_text_index(db).search(q, ingredient_ids, max_cooking_time, limit)
@@ -0,0 +1,483 @@
+# backend/app/services/recipe_snapshot.py
+"""
+Read-only recipe catalog snapshot shared by every worker through mmap.
+
+With RECIPE_SNAPSHOT_DIR set, the "memory" matching engine doesn't build
+a RecipeIndex per worker. The catalog is instead written once to a file
+in compressed sparse row (CSR) form and every worker maps that file:
+
+- offsets[r]..offsets[r + 1] are recipe r's entries in ingredient_ids
+  (sorted by ingredient ID)
+- postings is the transpose: recipe positions per ingredient, so scoring
+  only touches recipes sharing an ingredient with the inventory
+- ingredient names are interned: each is stored once, looked up by ID
+
+All arrays are read straight out of the mapping through memoryviews, so
+the OS page cache holds the one copy and a restart maps it instantly.
+
+The file header carries the catalog version (catalog_versions.recipes)
+it was built from. A rebuild writes a temporary file and os.replace()s
+it over the old one, so readers see either snapshot, never a mix. A
+worker whose snapshot is older than the catalog keeps serving it and
+remaps (or rebuilds, under a file lock so only one worker does) in a
+background thread; writes schedule the same refresh instead of
+rebuilding inside the request.
+"""
+import bisect
+import heapq
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import RECIPE_SNAPSHOT_DIR
+from app.database import SessionLocal
+from app.http_cache import RECIPES, catalog_versions
+from app.models.recipe import CatalogVersion, Ingredient, Recipe, RecipeIngredient
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+MAGIC = b"RCSR"
+FORMAT_VERSION = 2
+SNAPSHOT_FILE = "recipes.csr"
+
+# magic, format, catalog version, recipes, entries, ingredients, small recipes,
+# then byte sizes of the recipe name, description and ingredient name blobs
+HEADER = struct.Struct("<4sIqiiiiqqq")
+
+# Recipes with at most this many ingredients are listed separately: they
+# can match with nothing in the inventory (max_missing goes up to 5)
+SMALL_RECIPE_MAX = 5
+
+NULL_INT = -1
+
+# Seconds a scheduled refresh waits before rebuilding, so a burst of
+# recipe writes costs one rebuild
+REFRESH_DELAY = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def _pad(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _layout(n_recipes, n_entries, n_ingredients, n_small, name_bytes, desc_bytes, ing_bytes):
+    """(name, typecode, length) of each section, in file order"""
+    return [
+        ("recipe_ids", "i", n_recipes),
+        ("cooking_times", "i", n_recipes),
+        ("servings", "i", n_recipes),
+        ("offsets", "i", n_recipes + 1),
+        ("ingredient_ids", "i", n_entries),
+        ("ingredient_table", "i", n_ingredients),  # sorted distinct ingredient IDs
+        ("posting_offsets", "i", n_ingredients + 1),
+        ("postings", "i", n_entries),
+        ("small", "i", n_small),
+        ("name_offsets", "q", n_recipes + 1),
+        ("desc_offsets", "q", n_recipes + 1),
+        ("ingredient_name_offsets", "q", n_ingredients + 1),
+        ("name_blob", "B", name_bytes),
+        ("description_blob", "B", desc_bytes),
+        ("ingredient_name_blob", "B", ing_bytes),
+    ]
+
+
+def _blob(values: Iterable[Optional[str]]) -> Tuple[array, bytes]:
+    offsets = array("q", [0])
+    parts = []
+    for value in values:
+        data = (value or "").encode()
+        parts.append(data)
+        offsets.append(offsets[-1] + len(data))
+    return offsets, b"".join(parts)
+
+
+def match_percent(matched: int, total: int) -> int:
+    """matched / total as a whole percentage; like ROUND() in Postgres, halves round away from zero"""
+    return (200 * matched + total) // (2 * total)
+
+
+def build_snapshot(db: Session, path: str) -> int:
+    """
+    Write the catalog to `path` atomically. Returns the catalog version.
+    """
+    version = db.execute(
+        select(CatalogVersion.version).where(CatalogVersion.name == RECIPES)
+    ).scalar() or 0
+
+    rows = db.execute(
+        select(
+            Recipe.id, Recipe.name, Recipe.description, Recipe.cooking_time, Recipe.servings,
+            RecipeIngredient.ingredient_id
+        )
+        .join(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+        .order_by(Recipe.id, RecipeIngredient.ingredient_id)
+    )
+
+    recipe_ids = array("i")
+    cooking_times = array("i")
+    servings = array("i")
+    offsets = array("i", [0])
+    ingredient_ids = array("i")
+    names: List[str] = []
+    descriptions: List[Optional[str]] = []
+
+    for recipe_id, name, description, cooking_time, serves, ingredient_id in rows:
+        if not recipe_ids or recipe_ids[-1] != recipe_id:
+            if recipe_ids:
+                offsets.append(len(ingredient_ids))
+            recipe_ids.append(recipe_id)
+            cooking_times.append(NULL_INT if cooking_time is None else cooking_time)
+            servings.append(NULL_INT if serves is None else serves)
+            names.append(name)
+            descriptions.append(description)
+        ingredient_ids.append(ingredient_id)
+    if recipe_ids:
+        offsets.append(len(ingredient_ids))
+
+    # Transpose into per-ingredient postings (counting sort by ingredient)
+    ingredient_table = array("i", sorted(set(ingredient_ids)))
+    slot = {ing_id: i for i, ing_id in enumerate(ingredient_table)}
+    counts = Counter(ingredient_ids)
+    posting_offsets = array("i", [0])
+    for ing_id in ingredient_table:
+        posting_offsets.append(posting_offsets[-1] + counts[ing_id])
+    postings = array("i", bytes(4 * len(ingredient_ids)))
+    fill = array("i", posting_offsets[:-1])
+    for pos in range(len(recipe_ids)):
+        for i in range(offsets[pos], offsets[pos + 1]):
+            s = slot[ingredient_ids[i]]
+            postings[fill[s]] = pos
+            fill[s] += 1
+
+    small = array("i", sorted(
+        (pos for pos in range(len(recipe_ids)) if offsets[pos + 1] - offsets[pos] <= SMALL_RECIPE_MAX),
+        key=lambda pos: (offsets[pos + 1] - offsets[pos], pos)
+    ))
+
+    ingredient_name_map = dict(db.execute(
+        select(Ingredient.id, Ingredient.name).where(Ingredient.id.in_(list(ingredient_table)))
+    ).all()) if ingredient_table else {}
+
+    name_offsets, name_blob = _blob(names)
+    desc_offsets, desc_blob = _blob(descriptions)
+    ing_offsets, ing_blob = _blob(ingredient_name_map.get(ing_id) for ing_id in ingredient_table)
+
+    sections = {
+        "recipe_ids": recipe_ids,
+        "cooking_times": cooking_times,
+        "servings": servings,
+        "offsets": offsets,
+        "ingredient_ids": ingredient_ids,
+        "ingredient_table": ingredient_table,
+        "posting_offsets": posting_offsets,
+        "postings": postings,
+        "small": small,
+        "name_offsets": name_offsets,
+        "desc_offsets": desc_offsets,
+        "ingredient_name_offsets": ing_offsets,
+        "name_blob": name_blob,
+        "description_blob": desc_blob,
+        "ingredient_name_blob": ing_blob,
+    }
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, version,
+        len(recipe_ids), len(ingredient_ids), len(ingredient_table), len(small),
+        len(name_blob), len(desc_blob), len(ing_blob)
+    )
+
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(_pad(len(header)), b"\0"))
+        for name, typecode, length in _layout(
+            len(recipe_ids), len(ingredient_ids), len(ingredient_table), len(small),
+            len(name_blob), len(desc_blob), len(ing_blob)
+        ):
+            data = sections[name]
+            data = data.tobytes() if isinstance(data, array) else data
+            f.write(data.ljust(_pad(len(data)), b"\0"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return version
+
+
+class RecipeSnapshot:
+    """
+    A mapped snapshot file. Same match() / near_misses() results as
+    RecipeIndex, read directly from the shared pages.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        (magic, fmt, self.version, n_recipes, n_entries, n_ingredients, n_small,
+         name_bytes, desc_bytes, ing_bytes) = HEADER.unpack_from(view)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a recipe snapshot (format {FORMAT_VERSION})")
+
+        position = _pad(HEADER.size)
+        for name, typecode, length in _layout(
+            n_recipes, n_entries, n_ingredients, n_small, name_bytes, desc_bytes, ing_bytes
+        ):
+            size = length * struct.calcsize(typecode)
+            section = view[position:position + size]
+            setattr(self, name, section if typecode == "B" else section.cast(typecode))
+            position += _pad(size)
+
+        # Same lookups RecipeIndex offers (quantity matching reads
+        # len(recipe_ids) and ingredient_names[ingredient_id])
+        self.ingredient_names = _IngredientNames(self)
+
+    def _string(self, blob, offsets, i: int) -> str:
+        return bytes(blob[offsets[i]:offsets[i + 1]]).decode()
+
+    def _slot(self, ingredient_id: int) -> Optional[int]:
+        table = self.ingredient_table
+        i = bisect.bisect_left(table, ingredient_id)
+        if i < len(table) and table[i] == ingredient_id:
+            return i
+        return None
+
+    def _candidates(self, inventory: set, max_missing: int):
+        """(position, matched count) of recipes missing at most max_missing"""
+        matched = Counter()
+        for ing_id in inventory:
+            s = self._slot(ing_id)
+            if s is not None:
+                matched.update(self.postings[self.posting_offsets[s]:self.posting_offsets[s + 1]])
+
+        offsets = self.offsets
+        for pos in self.small:
+            if offsets[pos + 1] - offsets[pos] > max_missing:
+                break
+            matched.setdefault(pos, 0)
+
+        for pos, count in matched.items():
+            if offsets[pos + 1] - offsets[pos] - count <= max_missing:
+                yield pos, count
+
+    def _entries(self, pos: int) -> memoryview:
+        return self.ingredient_ids[self.offsets[pos]:self.offsets[pos + 1]]
+
+    def near_misses(self, inventory: Iterable[int], max_missing: int = 2) -> List[Tuple[int, ...]]:
+        """See RecipeIndex.near_misses"""
+        inventory = set(inventory)
+        return [
+            tuple(sorted(set(self._entries(pos)) - inventory))
+            for pos, matched in self._candidates(inventory, max_missing)
+            if matched < self.offsets[pos + 1] - self.offsets[pos]
+        ]
+
+    def missing_by_recipe(self, inventory: Iterable[int], max_missing: int):
+        """See RecipeIndex.missing_by_recipe"""
+        inventory = set(inventory)
+        results = []
+        for pos, matched in self._candidates(inventory, max_missing):
+            cooking_time = self.cooking_times[pos]
+            servings = self.servings[pos]
+            results.append((
+                self.recipe_ids[pos],
+                None if cooking_time == NULL_INT else cooking_time,
+                None if servings == NULL_INT else servings,
+                matched,
+                tuple(sorted(set(self._entries(pos)) - inventory)),
+            ))
+        return results
+
+    def scores(self, inventory: Iterable[int], max_missing: int) -> List[Tuple[int, int, int, int]]:
+        """See RecipeIndex.scores"""
+        inventory = set(inventory)
+        offsets = self.offsets
+        return [
+            (pos, self.recipe_ids[pos], offsets[pos + 1] - offsets[pos], matched)
+            for pos, matched in self._candidates(inventory, max_missing)
+        ]
+
+    def match_rows(self, inventory: Iterable[int], scored: Iterable[Tuple[int, int]]) -> List[dict]:
+        """See RecipeIndex.match_rows"""
+        inventory = set(inventory)
+        return [self._row(pos, matched, inventory) for pos, matched in scored]
+
+    def match(self, inventory: Iterable[int], max_missing: int = 2, limit: int = 10) -> List[dict]:
+        """See RecipeIndex.match"""
+        inventory = set(inventory)
+        offsets = self.offsets
+
+        scored = []
+        for pos, matched in self._candidates(inventory, max_missing):
+            total = offsets[pos + 1] - offsets[pos]
+            scored.append((-match_percent(matched, total), total - matched, self.recipe_ids[pos], pos, matched))
+
+        return [self._row(pos, matched, inventory) for _, _, _, pos, matched in heapq.nsmallest(limit, scored)]
+
+    def _row(self, pos: int, matched: int, inventory: set) -> dict:
+        total = self.offsets[pos + 1] - self.offsets[pos]
+        cooking_time = self.cooking_times[pos]
+        description = self._string(self.description_blob, self.desc_offsets, pos)
+        return {
+            "id": self.recipe_ids[pos],
+            "name": self._string(self.name_blob, self.name_offsets, pos),
+            "description": description or None,
+            "cooking_time": None if cooking_time == NULL_INT else cooking_time,
+            "total_ingredients": total,
+            "matched_ingredients": matched,
+            "missing_count": total - matched,
+            "match_percent": float(match_percent(matched, total)),
+            "missing_ingredients": [
+                self.ingredient_names[ing_id]
+                for ing_id in self._entries(pos)
+                if ing_id not in inventory
+            ],
+        }
+
+
+class _IngredientNames:
+    """Read-only ID -> name lookup over the interned name table"""
+
+    def __init__(self, snapshot: RecipeSnapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, ingredient_id: int) -> str:
+        s = self.snapshot._slot(ingredient_id)
+        if s is None:
+            raise KeyError(ingredient_id)
+        return self.snapshot._string(
+            self.snapshot.ingredient_name_blob, self.snapshot.ingredient_name_offsets, s
+        )
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive lock shared by all workers on this host"""
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# This worker's mapped snapshot
+_snapshot: Optional[RecipeSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def snapshot_path() -> str:
+    return os.path.join(RECIPE_SNAPSHOT_DIR, SNAPSHOT_FILE)
+
+
+def _map_current(db: Session, wanted: int, force_rebuild: bool = False) -> RecipeSnapshot:
+    """
+    Map the snapshot file, rebuilding it first if it is missing or older
+    than `wanted`. Holds the file lock so one worker rebuilds at a time.
+    """
+    path = snapshot_path()
+    os.makedirs(RECIPE_SNAPSHOT_DIR, exist_ok=True)
+    with _file_lock(path + ".lock"):
+        snapshot = None
+        if os.path.exists(path) and not force_rebuild:
+            try:
+                snapshot = RecipeSnapshot(path)
+            except ValueError:
+                snapshot = None
+        if snapshot is None or snapshot.version < wanted:
+            build_snapshot(db, path)
+            snapshot = RecipeSnapshot(path)
+        return snapshot
+
+
+def get_snapshot(db: Session) -> RecipeSnapshot:
+    """
+    This worker's snapshot. Once the catalog version moves on the current
+    mapping is still returned while schedule_refresh() replaces it; only
+    the first call (nothing mapped yet) waits for the file.
+    """
+    global _snapshot
+
+    wanted = catalog_versions.get(RECIPES)
+    snapshot = _snapshot
+    if snapshot is not None:
+        if snapshot.version < wanted:
+            schedule_refresh()
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = _map_current(db, wanted)
+        return _snapshot
+
+
+# Background refresh state: one thread at a time, and requests made while
+# it runs are folded into its next pass
+_refresh_lock = threading.Lock()
+_refresh_running = False
+_refresh_requested = False
+
+
+def schedule_refresh():
+    """
+    Bring this worker's snapshot up to the current catalog version in a
+    background thread, rebuilding the file if no other worker has.
+    Returns at once; callers keep using the current mapping meanwhile.
+    """
+    global _refresh_running, _refresh_requested
+    with _refresh_lock:
+        _refresh_requested = True
+        if _refresh_running:
+            return
+        _refresh_running = True
+    threading.Thread(target=_refresh_loop, name="recipe-snapshot-refresh", daemon=True).start()
+
+
+def _refresh_loop():
+    global _refresh_running, _refresh_requested
+    while True:
+        time.sleep(REFRESH_DELAY)
+        with _refresh_lock:
+            if not _refresh_requested:
+                _refresh_running = False
+                return
+            _refresh_requested = False
+        try:
+            _refresh()
+        except Exception:
+            # The current mapping keeps serving; the next stale read retries
+            logger.exception("Recipe snapshot refresh failed")
+
+
+def _refresh():
+    global _snapshot
+    db = SessionLocal()
+    try:
+        snapshot = _map_current(db, catalog_versions.get(RECIPES))
+    finally:
+        db.close()
+    with _snapshot_lock:
+        # The old mapping stays valid for requests still using it
+        if _snapshot is None or _snapshot.version < snapshot.version:
+            _snapshot = snapshot
+
+
+def invalidate_snapshot():
+    """Drop this worker's mapping; the next request remaps the current file"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
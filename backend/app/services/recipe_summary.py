@@ -0,0 +1,81 @@
+# backend/app/services/recipe_summary.py
+"""
+Keeps recipe_summaries in step with recipe_ingredients.
+
+Call refresh_recipe_summaries() in the same transaction as any write to a
+recipe's ingredient rows (create_recipe, bulk import, seeders). Calling
+it without recipe IDs rebuilds the whole table, which init_db does as a
+backfill.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.orm import Session
+
+from app.models.recipe import Recipe, RecipeIngredient, RecipeSummary
+
+_REFRESH_SQL = """
+    INSERT INTO recipe_summaries (recipe_id, total_ingredients, ingredient_ids, cooking_time)
+    SELECT
+        r.id,
+        COUNT(ri.ingredient_id),
+        ARRAY_AGG(ri.ingredient_id ORDER BY ri.ingredient_id),
+        r.cooking_time
+    FROM recipes r
+    JOIN recipe_ingredients ri ON ri.recipe_id = r.id
+    {where}
+    GROUP BY r.id, r.cooking_time
+"""
+
+
+def refresh_recipe_summaries(db: Session, recipe_ids: Optional[Iterable[int]] = None):
+    """
+    Rebuild summary rows for `recipe_ids` (or every recipe when None).
+    Does not commit - the caller's transaction covers both tables.
+    """
+    if recipe_ids is not None:
+        recipe_ids = list(recipe_ids)
+        if not recipe_ids:
+            return
+
+    # Replace rather than upsert so recipes that lost all ingredients drop out
+    stmt = delete(RecipeSummary)
+    if recipe_ids is not None:
+        stmt = stmt.where(RecipeSummary.recipe_id.in_(recipe_ids))
+    db.execute(stmt)
+
+    if db.get_bind().dialect.name == "postgresql":
+        if recipe_ids is None:
+            db.execute(text(_REFRESH_SQL.format(where="")))
+        else:
+            db.execute(
+                text(_REFRESH_SQL.format(where="WHERE r.id = ANY(:recipe_ids)")),
+                {"recipe_ids": recipe_ids}
+            )
+        return
+
+    # Portable path (SQLite test runs): aggregate in Python
+    query = (
+        select(Recipe.id, Recipe.cooking_time, RecipeIngredient.ingredient_id)
+        .join(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+    )
+    if recipe_ids is not None:
+        query = query.where(Recipe.id.in_(recipe_ids))
+
+    summaries = {}
+    for recipe_id, cooking_time, ingredient_id in db.execute(query):
+        summary = summaries.setdefault(recipe_id, {
+            "recipe_id": recipe_id,
+            "cooking_time": cooking_time,
+            "ingredient_ids": [],
+        })
+        summary["ingredient_ids"].append(ingredient_id)
+
+    rows = []
+    for summary in summaries.values():
+        summary["ingredient_ids"].sort()
+        summary["total_ingredients"] = len(summary["ingredient_ids"])
+        rows.append(summary)
+
+    if rows:
+        db.execute(RecipeSummary.__table__.insert(), rows)
@@ -0,0 +1,169 @@
+# backend/app/services/shopping_list.py
+"""
+One shopping list for several recipes at once.
+
+All the recipes' ingredient rows come from one query and the user's
+inventory for those ingredients from a second, however many recipes are
+requested. Quantities are converted to base units (app.services.units)
+and summed per ingredient and dimension, so "2 cups" and "8 tbsp" of milk
+become 2.5 cups. What the inventory holds is then subtracted.
+
+Amounts that can't be converted (no quantity, or an unknown unit on either
+side) fall back to presence like quantity-aware matching does: having the
+ingredient at all covers them. Amounts in unknown units are still summed
+per unit name. Stock in another dimension (grams of flour against cups)
+doesn't cover anything: there is no density table, so the requirement
+stays on the list in full and the item is flagged unit_mismatch rather
+than risk the user coming up short.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.recipe import Ingredient, Recipe, RecipeIngredient, UserInventory
+from app.services.units import TOLERANCE, lookup
+
+
+class _Requirement:
+    """Everything the requested recipes need of one ingredient"""
+
+    def __init__(self, name: str, category: Optional[str]):
+        self.name = name
+        self.category = category
+        self.recipe_ids: List[int] = []
+        # dimension -> [base quantity, unit to report it in (the first one seen)]
+        self.measured: Dict[str, list] = {}
+        # unknown unit -> summed quantity, in that unit
+        self.unmeasured: Dict[str, float] = {}
+        self.unquantified = False
+
+    def add(self, recipe_id: int, quantity, unit: Optional[str], scale: float):
+        if not self.recipe_ids or self.recipe_ids[-1] != recipe_id:
+            self.recipe_ids.append(recipe_id)
+        found = lookup(unit)
+        if quantity is None:
+            self.unquantified = True
+        elif found is None:
+            key = unit.strip().lower() if unit else ""
+            self.unmeasured[key] = self.unmeasured.get(key, 0.0) + float(quantity) * scale
+        else:
+            dimension, factor = found
+            total = self.measured.setdefault(dimension, [0.0, unit.strip()])
+            total[0] += float(quantity) * scale * factor
+
+
+def _amount(quantity: Optional[float], unit: Optional[str]) -> dict:
+    return {"quantity": None if quantity is None else round(quantity, 2), "unit": unit or None}
+
+
+def build_shopping_list(
+    db: Session,
+    recipes: Sequence[Tuple[int, Optional[int], float]],
+    user_id: int = 1
+) -> dict:
+    """
+    Consolidated shopping list for several recipes.
+
+    Args:
+        recipes: (recipe ID, servings to cook or None for the recipe's own,
+                  multiplier); a recipe listed twice is cooked twice
+
+    Returns:
+        {"items": [...], "covered": [...], "unknown_recipe_ids": [...]}
+        shaped like ShoppingList
+    """
+    scales: Dict[int, List[Tuple[Optional[int], float]]] = {}
+    for recipe_id, servings, multiplier in recipes:
+        scales.setdefault(recipe_id, []).append((servings, multiplier))
+
+    rows = db.execute(
+        select(
+            Recipe.id, Recipe.servings,
+            RecipeIngredient.ingredient_id, Ingredient.name, Ingredient.category,
+            RecipeIngredient.quantity, RecipeIngredient.unit,
+        )
+        .outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+        .outerjoin(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+        .where(Recipe.id.in_(list(scales)))
+        .order_by(Recipe.id, RecipeIngredient.id)
+    )
+
+    found = set()
+    needed: Dict[int, _Requirement] = {}
+    for recipe_id, recipe_servings, ingredient_id, name, category, quantity, unit in rows:
+        found.add(recipe_id)
+        if ingredient_id is None:
+            continue  # a recipe without ingredients
+        # Summed over every time the recipe was requested
+        scale = sum(
+            multiplier * (servings / recipe_servings if servings and recipe_servings else 1)
+            for servings, multiplier in scales[recipe_id]
+        )
+        requirement = needed.get(ingredient_id)
+        if requirement is None:
+            requirement = needed[ingredient_id] = _Requirement(name, category)
+        requirement.add(recipe_id, quantity, unit, scale)
+
+    # dimension -> base quantity in stock; None when some stock can't be measured
+    stock: Dict[int, Optional[Dict[str, float]]] = {}
+    if needed:
+        inventory = db.execute(
+            select(UserInventory.ingredient_id, UserInventory.quantity, UserInventory.unit)
+            .where(UserInventory.user_id == user_id, UserInventory.ingredient_id.in_(list(needed)))
+        )
+        for ingredient_id, quantity, unit in inventory:
+            measured = lookup(unit)
+            if quantity is None or measured is None:
+                stock[ingredient_id] = None
+            elif ingredient_id not in stock or stock[ingredient_id] is not None:
+                amounts = stock.setdefault(ingredient_id, {})
+                amounts[measured[0]] = amounts.get(measured[0], 0.0) + float(quantity) * measured[1]
+
+    items, covered = [], []
+    for ingredient_id, requirement in needed.items():
+        have_any = ingredient_id in stock
+        amounts = stock.get(ingredient_id)
+
+        total, to_buy = [], []
+        unit_mismatch = False
+        for dimension, (base, unit) in requirement.measured.items():
+            factor = lookup(unit)[1]
+            total.append(_amount(base / factor, unit))
+            if amounts is not None and dimension in amounts:
+                missing = base - amounts[dimension]
+                if missing > base * TOLERANCE:
+                    to_buy.append(_amount(missing / factor, unit))
+            elif not have_any or amounts is not None:
+                # Not in stock, or only in other dimensions
+                to_buy.append(_amount(base / factor, unit))
+                unit_mismatch = unit_mismatch or have_any
+            # else: some stock without a known amount - counts as enough
+
+        for unit, quantity in requirement.unmeasured.items():
+            total.append(_amount(quantity, unit))
+            if not have_any:
+                to_buy.append(_amount(quantity, unit))
+        if requirement.unquantified:
+            total.append(_amount(None, None))
+            if not have_any:
+                to_buy.append(_amount(None, None))
+
+        item = {
+            "ingredient_id": ingredient_id,
+            "name": requirement.name,
+            "category": requirement.category,
+            "recipe_ids": requirement.recipe_ids,
+            "needed": total,
+            "to_buy": to_buy,
+            "in_inventory": have_any,
+            "unit_mismatch": unit_mismatch,
+        }
+        (items if to_buy else covered).append(item)
+
+    by_aisle = lambda item: (item["category"] or "", item["name"])
+    return {
+        "items": sorted(items, key=by_aisle),
+        "covered": sorted(covered, key=by_aisle),
+        "unknown_recipe_ids": sorted(set(scales) - found),
+    }
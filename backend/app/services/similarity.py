@@ -0,0 +1,264 @@
+# backend/app/services/similarity.py
+"""
+"More like this": recipes with similar ingredient sets.
+
+Exact Jaccard similarity against every other recipe is too slow at
+catalog size, so each recipe gets a MinHash signature - for each of
+SIMILARITY_BANDS * SIMILARITY_ROWS hash functions, the smallest hash of
+its ingredient IDs. Two recipes agree on any one signature slot with
+probability equal to their Jaccard similarity.
+
+Signatures are cut into bands of SIMILARITY_ROWS slots, and recipes
+sharing a whole band land in the same LSH bucket. Only recipes sharing
+at least one bucket are considered, then ranked by exact Jaccard of
+their ingredient sets. Pairs with similarity s become candidates with
+probability 1 - (1 - s**rows)**bands, an S-curve around
+(1 / bands) ** (1 / rows).
+
+The index is built by the startup warm-up. After MATCHING_INDEX_TTL it is
+rebuilt in a background thread while requests keep using the old one.
+
+benchmarks/similarity.py measures recall against exact Jaccard.
+"""
+import heapq
+import logging
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import MATCHING_INDEX_TTL, SIMILARITY_BANDS, SIMILARITY_ROWS
+from app.database import SessionLocal
+from app.models.recipe import Recipe, RecipeIngredient
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the (a * x + b) mod p hash family
+_PRIME = (1 << 61) - 1
+_SEED = 1
+
+
+class SimilarityIndex:
+    """MinHash signatures and LSH buckets for every recipe"""
+
+    def __init__(self, bands: int = SIMILARITY_BANDS, rows: int = SIMILARITY_ROWS):
+        self.bands = bands
+        self.rows = rows
+        self.loaded_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        rng = random.Random(_SEED)
+        self._params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(bands * rows)
+        ]
+        # ingredient ID -> its hash under every function, computed once
+        self._hashes: Dict[int, Tuple[int, ...]] = {}
+
+        self.ingredients: Dict[int, frozenset] = {}  # recipe ID -> ingredient IDs
+        self.signatures: Dict[int, Tuple[int, ...]] = {}
+        self.buckets: List[Dict[Tuple[int, ...], Set[int]]] = [{} for _ in range(bands)]
+
+    @classmethod
+    def load(cls, db: Session, **options) -> "SimilarityIndex":
+        """Build the index from every recipe_ingredients row"""
+        index = cls(**options)
+        recipes: Dict[int, Set[int]] = {}
+        rows = db.execute(
+            select(RecipeIngredient.recipe_id, RecipeIngredient.ingredient_id),
+            execution_options={"yield_per": 10000}
+        )
+        for recipe_id, ingredient_id in rows:
+            recipes.setdefault(recipe_id, set()).add(ingredient_id)
+        for recipe_id, ingredient_ids in recipes.items():
+            index._add(recipe_id, ingredient_ids)
+        return index
+
+    def _ingredient_hashes(self, ingredient_id: int) -> Tuple[int, ...]:
+        hashes = self._hashes.get(ingredient_id)
+        if hashes is None:
+            hashes = self._hashes[ingredient_id] = tuple(
+                (a * ingredient_id + b) % _PRIME for a, b in self._params
+            )
+        return hashes
+
+    def signature(self, ingredient_ids: Iterable[int]) -> Tuple[int, ...]:
+        """Element-wise minimum of the ingredients' hash vectors"""
+        return tuple(map(min, zip(*(self._ingredient_hashes(i) for i in ingredient_ids))))
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def add(self, recipe_id: int, ingredient_ids: Iterable[int]):
+        """Add or replace one recipe"""
+        with self._lock:
+            self._remove(recipe_id)
+            ingredient_ids = set(ingredient_ids)
+            if ingredient_ids:
+                self._add(recipe_id, ingredient_ids)
+
+    def _add(self, recipe_id: int, ingredient_ids: Set[int]):
+        signature = self.signature(ingredient_ids)
+        self.ingredients[recipe_id] = frozenset(ingredient_ids)
+        self.signatures[recipe_id] = signature
+        for band, key in self._band_keys(signature):
+            self.buckets[band].setdefault(key, set()).add(recipe_id)
+
+    def _remove(self, recipe_id: int):
+        signature = self.signatures.pop(recipe_id, None)
+        if signature is None:
+            return
+        del self.ingredients[recipe_id]
+        for band, key in self._band_keys(signature):
+            bucket = self.buckets[band][key]
+            bucket.discard(recipe_id)
+            if not bucket:
+                del self.buckets[band][key]
+
+    def candidates(self, recipe_id: int) -> Set[int]:
+        """Recipes sharing at least one LSH bucket with `recipe_id`"""
+        found: Set[int] = set()
+        for band, key in self._band_keys(self.signatures[recipe_id]):
+            found.update(self.buckets[band].get(key, ()))
+        found.discard(recipe_id)
+        return found
+
+    def similar(self, recipe_id: int, k: int = 10) -> List[Tuple[int, float, int]]:
+        """
+        Top-`k` neighbours of a recipe.
+
+        Returns:
+            [(recipe_id, jaccard, shared_ingredients)], most similar first,
+            ties by recipe ID; empty if the recipe isn't indexed
+        """
+        with self._lock:
+            if recipe_id not in self.signatures:
+                return []
+            mine = self.ingredients[recipe_id]
+            scored = []
+            for other in self.candidates(recipe_id):
+                theirs = self.ingredients[other]
+                shared = len(mine & theirs)
+                scored.append((shared / (len(mine) + len(theirs) - shared), -other, shared))
+
+        best = heapq.nlargest(k, scored)
+        return [(-neg_id, jaccard, shared) for jaccard, neg_id, shared in best]
+
+
+# Process-wide index, built at startup or on first use
+_index: Optional[SimilarityIndex] = None
+_index_lock = threading.Lock()
+# Recipes indexed while a background rebuild runs (None when none is
+# running); the new index may have been loaded before they were committed
+_rebuild_added: Optional[List[Tuple[int, frozenset]]] = None
+
+
+def get_similarity_index(db: Session) -> SimilarityIndex:
+    """
+    Return the shared index, building it if there is none yet. A stale
+    one is still returned while its replacement is built in the background.
+    """
+    global _index
+
+    index = _index
+    if index is not None:
+        if _is_stale(index):
+            _start_rebuild()
+        return index
+
+    with _index_lock:
+        if _index is None:
+            _index = SimilarityIndex.load(db)
+        return _index
+
+
+def _is_stale(index: SimilarityIndex) -> bool:
+    # Same TTL as the matching index: only picks up other workers' writes
+    return MATCHING_INDEX_TTL > 0 and time.monotonic() - index.loaded_at > MATCHING_INDEX_TTL
+
+
+def _start_rebuild():
+    global _rebuild_added
+    with _index_lock:
+        if _rebuild_added is not None:
+            return
+        _rebuild_added = []
+    threading.Thread(target=_rebuild, name="similarity-index-rebuild", daemon=True).start()
+
+
+def _rebuild():
+    global _index, _rebuild_added
+
+    index = None
+    try:
+        db = SessionLocal()
+        try:
+            index = SimilarityIndex.load(db)
+        finally:
+            db.close()
+    except Exception:
+        # The old index keeps serving; the next stale read retries
+        logger.exception("Similarity index rebuild failed")
+
+    with _index_lock:
+        # Not installed if the index was invalidated meanwhile: the next
+        # request builds one that includes whatever invalidated it
+        if index is not None and _index is not None:
+            for recipe_id, ingredient_ids in _rebuild_added:
+                index.add(recipe_id, ingredient_ids)
+            _index = index
+        _rebuild_added = None
+
+
+def invalidate_similarity_index():
+    """Drop the shared index so the next request reloads it"""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def index_recipe_similarity(recipe_id: int, ingredient_ids: Iterable[int]):
+    """Add a newly created recipe to the shared index, if one is loaded"""
+    ingredient_ids = frozenset(ingredient_ids)
+    with _index_lock:
+        index = _index
+        if _rebuild_added is not None:
+            _rebuild_added.append((recipe_id, ingredient_ids))
+    if index is not None:
+        index.add(recipe_id, ingredient_ids)
+
+
+def find_similar_recipes(db: Session, recipe_id: int, k: int = 10) -> Optional[List[dict]]:
+    """
+    Recipes most like `recipe_id` by shared ingredients.
+
+    Returns:
+        Dicts shaped like SimilarRecipe, or None if the recipe doesn't exist
+    """
+    neighbours = get_similarity_index(db).similar(recipe_id, k)
+    if not neighbours:
+        exists = db.execute(select(Recipe.id).where(Recipe.id == recipe_id)).first()
+        return [] if exists else None
+
+    rows = db.execute(
+        select(Recipe.id, Recipe.name, Recipe.description, Recipe.cooking_time)
+        .where(Recipe.id.in_([other for other, _, _ in neighbours]))
+    )
+    recipes = {row.id: row for row in rows}
+    return [
+        {
+            "id": other,
+            "name": recipes[other].name,
+            "description": recipes[other].description,
+            "cooking_time": recipes[other].cooking_time,
+            "similarity": round(jaccard, 4),
+            "shared_ingredients": shared,
+        }
+        for other, jaccard, shared in neighbours
+        if other in recipes
+    ]
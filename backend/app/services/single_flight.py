@@ -0,0 +1,357 @@
+# backend/app/services/single_flight.py
+"""
+Request coalescing ("single flight") for suggestion queries.
+
+After a push notification many clients ask for the same suggestions at
+once - retries, or one user's several devices. Before the first answer
+is cached every one of them would run the full matching query. Here the
+first request for a key computes it and identical requests arriving
+while it runs wait for that result instead.
+
+Within a worker the waiters are threads (or asyncio tasks in
+DB_MODE=async). With SINGLE_FLIGHT_DIR set the workers on one host
+coordinate too, through FileLockService: the worker computing a key
+holds a lock on it and publishes the result to a file, and other workers
+wait for the lock and read that file. FileLockService stands in for a
+real lock service (Redis SET NX, Postgres advisory locks) shared by
+every host; only acquire/release/publish/fetch would need replacing.
+
+A waiter that gives up after SINGLE_FLIGHT_TIMEOUT runs the query
+itself, so a stuck computation only delays requests, never fails them.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.config import SINGLE_FLIGHT, SINGLE_FLIGHT_DIR, SINGLE_FLIGHT_TIMEOUT
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within each worker only
+    fcntl = None
+
+LOCK_FILE = "locks"
+
+# Result files are swept after this many publishes by a worker
+SWEEP_EVERY = 256
+
+
+class FileLockService:
+    """
+    Per-key locks and short-lived results shared by the workers on one host.
+
+    Each key locks one byte of a single lock file (fcntl record locks), so
+    there are no lock files to clean up. Record locks belong to the process,
+    not the thread, so each byte also has a threading.Lock that a thread
+    takes first; otherwise two threads of one worker would both "hold" the
+    byte and the first release would unlock it under the second. Results
+    are JSON files replaced atomically and swept once no waiter can still
+    want them.
+    """
+
+    def __init__(self, directory: str, timeout: float):
+        self.directory = directory
+        self.timeout = timeout
+        self._fd: Optional[int] = None
+        self._open_lock = threading.Lock()
+        self._publishes = 0
+
+        # Byte offset -> [thread lock, threads holding or waiting for it]
+        self._local: Dict[int, list] = {}
+        self._local_lock = threading.Lock()
+
+    def _descriptor(self) -> int:
+        if self._fd is None:
+            with self._open_lock:
+                if self._fd is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    # Never closed: closing any descriptor of the file
+                    # would drop every record lock this process holds
+                    self._fd = os.open(os.path.join(self.directory, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        return self._fd
+
+    @staticmethod
+    def _name(key: Hashable) -> str:
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _offset(self, key: Hashable) -> int:
+        return int(self._name(key)[:8], 16)
+
+    def _thread_lock(self, offset: int) -> threading.Lock:
+        with self._local_lock:
+            entry = self._local.setdefault(offset, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _unref(self, offset: int):
+        with self._local_lock:
+            entry = self._local[offset]
+            entry[1] -= 1
+            if not entry[1]:
+                del self._local[offset]
+
+    def acquire(self, key: Hashable, timeout: float) -> bool:
+        """Lock `key`, waiting up to `timeout` seconds; False if it stayed locked"""
+        fd, offset = self._descriptor(), self._offset(key)
+        deadline = time.monotonic() + timeout
+        local = self._thread_lock(offset)
+        if not local.acquire(timeout=timeout):
+            self._unref(offset)
+            return False
+
+        delay = 0.005
+        while True:
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, offset)
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    local.release()
+                    self._unref(offset)
+                    return False
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+
+    def release(self, key: Hashable):
+        offset = self._offset(key)
+        fcntl.lockf(self._descriptor(), fcntl.LOCK_UN, 1, offset)
+        with self._local_lock:
+            self._local[offset][0].release()
+        self._unref(offset)
+
+    def publish(self, key: Hashable, value: Any, started: float):
+        """Share a result computed from wall-clock time `started` until now"""
+        path = os.path.join(self.directory, self._name(key) + ".json")
+        try:
+            # Decimal from the SQL engine; every response field it appears in is a float
+            payload = json.dumps({"started": started, "finished": time.time(), "value": value}, default=float)
+        except (TypeError, ValueError):
+            return
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(payload)
+        os.replace(temporary, path)
+
+        self._publishes += 1
+        if self._publishes % SWEEP_EVERY == 0:
+            self._sweep()
+
+    def fetch(self, key: Hashable, finished_after: float, started_after: float) -> Optional[Any]:
+        """A published result finished after `finished_after` and started after `started_after`, else None"""
+        path = os.path.join(self.directory, self._name(key) + ".json")
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if payload["finished"] < finished_after or payload["started"] < started_after:
+            return None
+        return payload["value"]
+
+    def _sweep(self):
+        # A waiter only accepts results finished after it arrived, and waits
+        # at most `timeout`, so older files can't be used by anyone
+        cutoff = time.time() - self.timeout - 1
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class _Flight:
+    """One in-progress computation and the threads waiting for it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Run a computation once per key at a time; concurrent callers share it.
+    """
+
+    def __init__(self, enabled: bool = True, timeout: float = 10, locks: Optional[FileLockService] = None):
+        self.enabled = enabled
+        self.timeout = timeout
+        self.locks = locks
+
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.computations = 0
+        self.coalesced = 0
+        self.coalesced_across_workers = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def _run(self, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.computations += 1
+        return fn()
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        shared_key: Optional[Hashable] = None,
+        not_before: float = 0.0
+    ) -> Any:
+        """
+        Return fn(), or the result of a call already running for `key`.
+
+        Args:
+            key: Identifies the computation within this worker
+            shared_key: Identifies it across workers (needs SINGLE_FLIGHT_DIR);
+                None to coalesce within this worker only
+            not_before: Wall-clock time; results other workers started
+                earlier than this are not used
+        """
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            self.calls += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if not flight.done.wait(self.timeout):
+                with self._lock:
+                    self.timeouts += 1
+                return self._run(fn)
+            with self._lock:
+                if flight.error is not None:
+                    self.errors += 1
+                else:
+                    self.coalesced += 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._lead(fn, shared_key, not_before)
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _lead(self, fn: Callable[[], Any], shared_key: Optional[Hashable], not_before: float) -> Any:
+        if self.locks is None or shared_key is None:
+            return self._run(fn)
+
+        arrived = time.time()
+        if not self.locks.acquire(shared_key, self.timeout):
+            with self._lock:
+                self.timeouts += 1
+            return self._run(fn)
+        try:
+            shared = self.locks.fetch(shared_key, finished_after=arrived, started_after=not_before)
+            if shared is not None:
+                with self._lock:
+                    self.coalesced_across_workers += 1
+                return shared
+            started = time.time()
+            result = self._run(fn)
+            self.locks.publish(shared_key, result, started)
+            return result
+        finally:
+            self.locks.release(shared_key)
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        asyncio version of do(), for tasks on this worker's event loop.
+        Coalesces within the worker only - waiting on the lock file would
+        block the loop.
+        """
+        if not self.enabled:
+            return await fn()
+
+        with self._lock:
+            self.calls += 1
+            future = self._async_flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._async_flights[key] = asyncio.get_running_loop().create_future()
+
+        if not leader:
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+                return await self._run_async(fn)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this request was cancelled, not the computation
+                return await self._run_async(fn)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                raise
+            with self._lock:
+                self.coalesced += 1
+            return result
+
+        try:
+            result = await self._run_async(fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # retrieved, even if nobody was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._async_flights[key]
+
+    async def _run_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        with self._lock:
+            self.computations += 1
+        return await fn()
+
+    def stats(self) -> dict:
+        """Counters for the metrics endpoint"""
+        with self._lock:
+            avoided = self.coalesced + self.coalesced_across_workers
+            return {
+                "enabled": self.enabled,
+                "across_workers": self.locks is not None,
+                "calls": self.calls,
+                "computations": self.computations,
+                "coalesced": self.coalesced,
+                "coalesced_across_workers": self.coalesced_across_workers,
+                "computations_avoided": avoided,
+                "avoided_ratio": round(avoided / self.calls, 4) if self.calls else 0.0,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "in_flight": len(self._flights) + len(self._async_flights),
+            }
+
+
+# Shared by every suggestion request in this process
+suggestion_flights = SingleFlight(
+    enabled=SINGLE_FLIGHT,
+    timeout=SINGLE_FLIGHT_TIMEOUT,
+    locks=FileLockService(SINGLE_FLIGHT_DIR, SINGLE_FLIGHT_TIMEOUT) if SINGLE_FLIGHT_DIR and fcntl is not None else None
+)
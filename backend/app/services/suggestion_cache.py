@@ -0,0 +1,186 @@
+# backend/app/services/suggestion_cache.py
+"""
+Per-user cache for recipe suggestion results.
+
+Keys are tuples starting with the user ID - (user_id, max_missing, limit)
+for suggestions, with extra parts for the other per-user reports (unlocks,
+meal plans). Values are stored and returned as they are, so callers must
+not modify what they put in or get back. The cache is bounded (LRU) and
+entries expire after a TTL. Inventory writes drop one user's entries,
+recipe writes drop everything.
+
+The cache is per worker, and so is invalidation: a write only drops the
+entries of the worker that handled it. With several workers, the others
+can serve results from before the write until their entries expire, so
+keep SUGGESTION_CACHE_TTL as short as that staleness can be.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import SUGGESTION_CACHE_SIZE, SUGGESTION_CACHE_TTL
+
+CacheKey = Tuple  # (user_id, ...)
+
+# Invalidated users remembered before the ones with nothing cached are forgotten
+MAX_TRACKED_USERS = 10000
+
+
+class SuggestionCache:
+    """
+    Thread-safe LRU + TTL cache of per-user results (find_matching_recipes,
+    unlocks, meal plans).
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._user_keys: Dict[int, set] = {}
+        # Bumped on every invalidation so a result computed before the
+        # write can't be stored after it. User generations are drawn from
+        # one counter; users without an entry are at _generation_floor.
+        self._generations: Dict[int, int] = {}
+        self._generation_counter = 0
+        self._generation_floor = 0
+        self._global_generation = 0
+        # Wall-clock time of the last invalidation, for results shared by
+        # other workers (app/services/single_flight.py); users without an
+        # entry were invalidated at most at _invalidated_floor
+        self._invalidated_at: Dict[int, float] = {}
+        self._invalidated_floor = 0.0
+        self._global_invalidated_at = 0.0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return a cached result, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if self.ttl and time.monotonic() > expires_at:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self, user_id: int) -> Tuple[int, int]:
+        """Token to pass to put() - taken before computing a result"""
+        with self._lock:
+            return self._global_generation, self._generations.get(user_id, self._generation_floor)
+
+    def invalidated_at(self, user_id: int) -> float:
+        """When this user's results were last invalidated in this process (time.time())"""
+        with self._lock:
+            return max(self._global_invalidated_at, self._invalidated_at.get(user_id, self._invalidated_floor))
+
+    def put(self, key: CacheKey, value: Any, generation: Tuple[int, int]):
+        """
+        Store a result unless the user was invalidated since `generation`.
+        """
+        if not self.enabled:
+            return
+
+        user_id = key[0]
+        with self._lock:
+            if generation != (self._global_generation, self._generations.get(user_id, self._generation_floor)):
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            self._user_keys.setdefault(user_id, set()).add(key)
+
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int):
+        """Drop every cached result for one user"""
+        with self._lock:
+            self._generation_counter += 1
+            self._generations[user_id] = self._generation_counter
+            self._invalidated_at[user_id] = time.time()
+            for key in self._user_keys.pop(user_id, ()):
+                self._entries.pop(key, None)
+            self.invalidations += 1
+            if len(self._generations) > max(MAX_TRACKED_USERS, 2 * self.max_size):
+                self._forget_idle_users()
+
+    def _forget_idle_users(self):
+        """
+        Drop the generations of users with nothing cached. Raising the floor
+        to the newest generation means a result computed before any of their
+        invalidations still can't be stored.
+        """
+        idle = [user_id for user_id in self._generations if user_id not in self._user_keys]
+        for user_id in idle:
+            del self._generations[user_id]
+            invalidated_at = self._invalidated_at.pop(user_id, 0.0)
+            self._invalidated_floor = max(self._invalidated_floor, invalidated_at)
+        self._generation_floor = self._generation_counter
+
+    def invalidate_all(self):
+        """Drop every cached result (e.g. after the catalog changed)"""
+        with self._lock:
+            self._global_generation += 1
+            self._global_invalidated_at = time.time()
+            # The global generation already outdates every earlier result
+            self._generations.clear()
+            self._generation_floor = self._generation_counter
+            self._invalidated_at.clear()
+            self._entries.clear()
+            self._user_keys.clear()
+            self.invalidations += 1
+
+    def _drop(self, key: CacheKey):
+        self._entries.pop(key, None)
+        keys = self._user_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_keys[key[0]]
+
+    def stats(self) -> dict:
+        """Counters for the metrics endpoint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "tracked_users": len(self._generations),
+            }
+
+
+# Shared by every request in this process
+suggestion_cache = SuggestionCache(
+    max_size=SUGGESTION_CACHE_SIZE,
+    ttl=SUGGESTION_CACHE_TTL
+)
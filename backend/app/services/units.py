@@ -0,0 +1,80 @@
+# backend/app/services/units.py
+"""
+Unit conversion registry.
+
+Every known unit belongs to a dimension (mass, volume, count) and has a
+factor to that dimension's base unit (grams, millilitres, pieces).
+Quantities can only be compared or added within one dimension - there is
+no density table, so "2 cups of rice" and "500 g of rice" don't convert.
+"""
+from typing import Dict, List, Optional, Tuple
+
+MASS = "mass"
+VOLUME = "volume"
+COUNT = "count"
+
+# Relative tolerance when comparing converted quantities, so rounding in
+# the conversion factors doesn't turn "have exactly enough" into a shortfall
+TOLERANCE = 1e-9
+
+_UNITS: Dict[str, Tuple[str, float]] = {}
+
+
+def register_unit(name: str, dimension: str, factor: float, aliases: Tuple[str, ...] = ()):
+    """
+    Register a unit (and its aliases) as `factor` base units of `dimension`.
+    Names are matched case-insensitively.
+    """
+    for unit in (name, *aliases):
+        _UNITS[unit.strip().lower()] = (dimension, float(factor))
+
+
+def lookup(unit: Optional[str]) -> Optional[Tuple[str, float]]:
+    """(dimension, factor) for a unit, or None if it isn't registered"""
+    if not unit:
+        return None
+    return _UNITS.get(unit.strip().lower())
+
+
+def to_base(quantity: Optional[float], unit: Optional[str]) -> Optional[Tuple[str, float]]:
+    """(dimension, quantity in base units), or None if it can't be converted"""
+    found = lookup(unit)
+    if quantity is None or found is None:
+        return None
+    dimension, factor = found
+    return dimension, float(quantity) * factor
+
+
+def convert(quantity: float, from_unit: str, to_unit: str) -> Optional[float]:
+    """Convert between two units of the same dimension; None if incompatible"""
+    source = lookup(from_unit)
+    target = lookup(to_unit)
+    if source is None or target is None or source[0] != target[0]:
+        return None
+    return float(quantity) * source[1] / target[1]
+
+
+def unit_table() -> Tuple[List[str], List[str], List[float]]:
+    """The registry as parallel (names, dimensions, factors) lists, for SQL unnest()"""
+    names = sorted(_UNITS)
+    return names, [_UNITS[n][0] for n in names], [_UNITS[n][1] for n in names]
+
+
+register_unit("g", MASS, 1, ("gram", "grams", "gr"))
+register_unit("kg", MASS, 1000, ("kilogram", "kilograms", "kgs"))
+register_unit("mg", MASS, 0.001, ("milligram", "milligrams"))
+register_unit("oz", MASS, 28.349523125, ("ounce", "ounces"))
+register_unit("lb", MASS, 453.59237, ("lbs", "pound", "pounds"))
+
+register_unit("ml", VOLUME, 1, ("milliliter", "milliliters", "millilitre", "millilitres"))
+register_unit("l", VOLUME, 1000, ("liter", "liters", "litre", "litres"))
+register_unit("tsp", VOLUME, 4.92892159375, ("teaspoon", "teaspoons", "tsps"))
+register_unit("tbsp", VOLUME, 14.78676478125, ("tablespoon", "tablespoons", "tbsps", "tbs"))
+register_unit("fl oz", VOLUME, 29.5735295625, ("fluid ounce", "fluid ounces"))
+register_unit("cup", VOLUME, 236.5882365, ("cups", "c"))
+register_unit("pint", VOLUME, 473.176473, ("pints", "pt"))
+register_unit("quart", VOLUME, 946.352946, ("quarts", "qt"))
+register_unit("gallon", VOLUME, 3785.411784, ("gallons", "gal"))
+
+register_unit("piece", COUNT, 1, ("pieces", "pc", "pcs", "each", "whole", "item", "items"))
+register_unit("dozen", COUNT, 12)
@@ -0,0 +1,157 @@
+# backend/app/services/unlocks.py
+"""
+"One ingredient away" analysis: which ingredients (or pairs) to buy to
+complete the most additional recipes.
+
+Only near-miss recipes matter - those missing one or two ingredients.
+They are found in a single pass (one query over the inventory rows and
+recipe_summaries, or one walk of the in-memory recipe index) and their
+missing ingredients are tallied:
+
+- buying X completes every recipe missing exactly {X}
+- buying X and Y completes the recipes missing {X}, {Y} or {X, Y}
+"""
+from collections import Counter
+from itertools import combinations
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.config import MATCHING_ENGINE
+from app.models.recipe import Ingredient
+from app.services.recipe_index import get_recipe_index, load_inventory
+from app.services.suggestion_cache import suggestion_cache
+
+# Distinct missing ingredient IDs of every recipe 1..:max_missing away,
+# reusing the matched / recipe_summaries shape of MATCH_QUERY
+NEAR_MISS_QUERY = text("""
+    WITH inventory AS (
+        SELECT DISTINCT ingredient_id
+        FROM user_inventory
+        WHERE user_id = :user_id
+    ),
+    matched AS (
+        SELECT ri.recipe_id, COUNT(*) AS matched_ingredients
+        FROM inventory inv
+        JOIN recipe_ingredients ri ON ri.ingredient_id = inv.ingredient_id
+        GROUP BY ri.recipe_id
+    ),
+    near_misses AS (
+        SELECT s.ingredient_ids
+        FROM matched m
+        JOIN recipe_summaries s ON s.recipe_id = m.recipe_id
+        WHERE s.total_ingredients - m.matched_ingredients BETWEEN 1 AND :max_missing
+        UNION ALL
+        SELECT s.ingredient_ids
+        FROM recipe_summaries s
+        WHERE s.total_ingredients <= :max_missing
+            AND NOT EXISTS (SELECT 1 FROM matched m WHERE m.recipe_id = s.recipe_id)
+    )
+    SELECT ARRAY(
+        SELECT DISTINCT u.ingredient_id
+        FROM unnest(n.ingredient_ids) AS u(ingredient_id)
+        WHERE u.ingredient_id NOT IN (SELECT ingredient_id FROM inventory)
+        ORDER BY u.ingredient_id
+    ) AS missing
+    FROM near_misses n
+    """)
+
+
+def rank_unlocks(
+    near_misses: Iterable[Sequence[int]],
+    k: int,
+    include_pairs: bool = True
+) -> Tuple[List[Tuple[int, int]], List[Tuple[Tuple[int, int], int]]]:
+    """
+    Tally near-miss recipes into the top-`k` single ingredients and pairs.
+
+    Args:
+        near_misses: Distinct missing ingredient IDs per recipe (1 or 2 each)
+
+    Returns:
+        ([(ingredient_id, recipes)], [((first_id, second_id), recipes)]),
+        most recipes first, ties by ingredient ID
+    """
+    singles: Counter = Counter()
+    pairs: Counter = Counter()
+    for missing in near_misses:
+        if len(missing) == 1:
+            singles[missing[0]] += 1
+        elif len(missing) == 2:
+            pairs[tuple(missing)] += 1
+
+    top_singles = sorted(singles.items(), key=lambda item: (-item[1], item[0]))
+    if not include_pairs:
+        return top_singles[:k], []
+
+    # A pair that never appears together only scores its two singles, so
+    # the best such pairs are all within the top k + 1 singles
+    candidates = set(pairs)
+    best = [ing_id for ing_id, _ in top_singles[:k + 1]]
+    candidates.update(combinations(sorted(best), 2))
+
+    scored = [
+        (pair, singles[pair[0]] + singles[pair[1]] + pairs[pair])
+        for pair in candidates
+    ]
+    scored.sort(key=lambda item: (-item[1], item[0]))
+    return top_singles[:k], scored[:k]
+
+
+def load_near_misses(db: Session, user_id: int, engine: str = None) -> List[Sequence[int]]:
+    """Missing ingredient IDs for each recipe one or two ingredients away"""
+    if (engine or MATCHING_ENGINE) == "memory":
+        index = get_recipe_index(db)
+        return index.near_misses(load_inventory(db, user_id), max_missing=2)
+    return [row.missing for row in db.execute(NEAR_MISS_QUERY, {"user_id": user_id, "max_missing": 2})]
+
+
+def find_unlocks(
+    db: Session,
+    user_id: int = 1,
+    k: int = 10,
+    include_pairs: bool = True,
+    engine: Optional[str] = None
+) -> dict:
+    """
+    Rank the ingredients (and pairs) that would complete the most recipes
+    for a user's inventory.
+
+    Returns:
+        {"ingredients": [...], "pairs": [...]} shaped like UnlockReport
+    """
+    key = (user_id, "unlocks", k, include_pairs)
+    if suggestion_cache.enabled:
+        cached = suggestion_cache.get(key)
+        if cached is not None:
+            return cached
+    generation = suggestion_cache.generation(user_id)
+
+    singles, pairs = rank_unlocks(load_near_misses(db, user_id, engine), k, include_pairs)
+
+    ingredient_ids = {ing_id for ing_id, _ in singles}
+    for pair, _ in pairs:
+        ingredient_ids.update(pair)
+    names = dict(db.execute(
+        select(Ingredient.id, Ingredient.name).where(Ingredient.id.in_(ingredient_ids))
+    ).all()) if ingredient_ids else {}
+
+    report = {
+        "ingredients": [
+            {"ingredient_id": ing_id, "name": names[ing_id], "recipes_unlocked": count}
+            for ing_id, count in singles
+        ],
+        "pairs": [
+            {
+                "ingredient_ids": list(pair),
+                "names": [names[ing_id] for ing_id in pair],
+                "recipes_unlocked": count,
+            }
+            for pair, count in pairs
+        ],
+    }
+
+    if suggestion_cache.enabled:
+        suggestion_cache.put(key, report, generation)
+    return report
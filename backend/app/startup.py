@@ -0,0 +1,190 @@
+# backend/app/startup.py
+"""
+Startup warm-up and readiness.
+
+Importing the app has no side effects. Once a worker starts, the lifespan
+handler warms it up: pre-opens pool connections and loads whichever
+in-memory indexes are enabled, timing each step. A failing step (e.g.
+Postgres still starting) is recorded rather than raised, so the worker
+comes up anyway; it reports not-ready, and each readiness probe retries
+the steps that haven't succeeded yet.
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Tuple
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.config import DB_MODE, DB_POOL_SIZE, DB_POOL_WARMUP, INGREDIENT_SEARCH_ENGINE, MATCHING_ENGINE
+from app.database import DATABASE_READ_URLS, SessionLocal, get_async_engine, get_engine, get_read_engines
+
+
+def describe_error(e: Exception) -> str:
+    """First line of an exception, for health reports"""
+    lines = str(e).strip().splitlines()
+    return f"{type(e).__name__}: {lines[0] if lines else ''}"
+
+
+def warm_pool():
+    """Open DB_POOL_WARMUP connections at once, then return them to the pool"""
+    connections = []
+    try:
+        for _ in range(max(1, min(DB_POOL_WARMUP, DB_POOL_SIZE))):
+            connections.append(get_engine().connect())
+        connections[0].execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def warm_read_pools():
+    """Check every read replica answers, leaving a connection in each pool"""
+    for engine in get_read_engines():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+
+async def warm_async_pool():
+    """warm_pool() for the asyncpg engine"""
+    engine = get_async_engine()
+    connections = []
+    try:
+        for _ in range(max(1, min(DB_POOL_WARMUP, DB_POOL_SIZE))):
+            connections.append(await engine.connect())
+        await connections[0].execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+def load_recipe_index():
+    from app.services.recipe_index import get_recipe_index
+
+    db = SessionLocal()
+    try:
+        get_recipe_index(db)
+    finally:
+        db.close()
+
+
+def load_ingredient_index():
+    from app.services.ingredient_search import get_ingredient_index
+
+    db = SessionLocal()
+    try:
+        get_ingredient_index(db)
+    finally:
+        db.close()
+
+
+def load_similarity_index():
+    from app.services.similarity import get_similarity_index
+
+    db = SessionLocal()
+    try:
+        get_similarity_index(db)
+    finally:
+        db.close()
+
+
+def warmup_steps() -> List[Tuple[str, Callable]]:
+    """(name, step) pairs for this configuration; steps may be async"""
+    steps = [("database_pool", warm_pool)]
+    if DB_MODE == "async":
+        steps.append(("async_database_pool", warm_async_pool))
+    if DATABASE_READ_URLS:
+        steps.append(("read_replicas", warm_read_pools))
+    if MATCHING_ENGINE == "memory":
+        steps.append(("recipe_index", load_recipe_index))
+    if INGREDIENT_SEARCH_ENGINE == "memory":
+        steps.append(("ingredient_index", load_ingredient_index))
+    steps.append(("similarity_index", load_similarity_index))
+    return steps
+
+
+class StartupState:
+    """Timings and outcome of each warm-up step"""
+
+    def __init__(self):
+        self.timings_ms: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.completed: set = set()
+        self._lock = asyncio.Lock()
+
+    def record(self, name: str, started: float):
+        self.timings_ms[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    @property
+    def warmed_up(self) -> bool:
+        return all(name in self.completed for name, _ in warmup_steps())
+
+    async def warm_up(self):
+        """Run every step that hasn't succeeded yet"""
+        async with self._lock:
+            for name, step in warmup_steps():
+                if name in self.completed:
+                    continue
+                started = time.perf_counter()
+                try:
+                    if asyncio.iscoroutinefunction(step):
+                        await step()
+                    else:
+                        await run_in_threadpool(step)
+                except Exception as e:
+                    self.errors[name] = describe_error(e)
+                    self.record(name, started)
+                    # Later steps all need the database too
+                    break
+                self.completed.add(name)
+                self.errors.pop(name, None)
+                self.record(name, started)
+
+    def report(self) -> str:
+        lines = ["Startup timings:"]
+        for name, ms in self.timings_ms.items():
+            status = "failed: " + self.errors[name] if name in self.errors else "ok"
+            lines.append(f"  {name:<22} {ms:>9.2f} ms  {status}")
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict:
+        return {
+            "warmed_up": self.warmed_up,
+            "timings_ms": dict(self.timings_ms),
+            "errors": dict(self.errors),
+        }
+
+
+startup_state = StartupState()
+
+
+def check_database():
+    with get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def check_async_database():
+    async with get_async_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def readiness() -> Tuple[bool, dict]:
+    """
+    (ready, details) - the database answers and every warm-up step has
+    succeeded. Steps that failed at startup are retried here.
+    """
+    checks = {}
+    try:
+        await run_in_threadpool(check_database)
+        if DB_MODE == "async":
+            await check_async_database()
+        checks["database"] = "ok"
+    except Exception as e:
+        checks["database"] = describe_error(e)
+
+    if checks["database"] == "ok" and not startup_state.warmed_up:
+        await startup_state.warm_up()
+    checks["warm_up"] = "ok" if startup_state.warmed_up else startup_state.errors
+
+    ready = checks["database"] == "ok" and startup_state.warmed_up
+    return ready, {"checks": checks, "startup": startup_state.as_dict()}
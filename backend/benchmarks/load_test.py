@@ -0,0 +1,111 @@
+# backend/benchmarks/load_test.py
+"""
+Concurrent load test for comparing DB_MODE=sync and DB_MODE=async.
+
+Start the same app twice, e.g.
+    DB_MODE=sync  uvicorn app.main:app --port 8001
+    DB_MODE=async uvicorn app.main:app --port 8002
+
+then run
+    python -m benchmarks.load_test \
+        --target sync=http://localhost:8001 \
+        --target async=http://localhost:8002 \
+        --concurrency 50 --concurrency 200 --concurrency 500
+
+Every target gets the same request mix at each concurrency level, and a
+throughput / latency table is printed per level.
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List, Tuple
+
+import httpx
+
+from benchmarks.stats import summarize, format_row
+
+DEFAULT_PATHS = [
+    "/api/recipes/suggestions?max_missing=2&limit=10",
+    "/api/recipes/?limit=20",
+    "/api/ingredients/search?q=ch&limit=10",
+    "/api/inventory/",
+]
+
+
+async def run_level(base_url: str, paths: List[str], concurrency: int, requests: int) -> dict:
+    """Fire `requests` GETs with `concurrency` in flight and summarize them"""
+    latencies: List[float] = []
+    errors = 0
+    next_request = 0
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+
+        async def worker():
+            nonlocal next_request, errors
+            while next_request < requests:
+                path = paths[next_request % len(paths)]
+                next_request += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                        continue
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, elapsed, errors)
+
+
+def parse_target(value: str) -> Tuple[str, str]:
+    label, sep, url = value.partition("=")
+    if not sep:
+        return value, value
+    return label, url
+
+
+async def main_async(args):
+    targets = [parse_target(t) for t in args.target]
+    paths = args.path or DEFAULT_PATHS
+    results = {}
+
+    for concurrency in args.concurrency:
+        print(f"\nConcurrency {concurrency} ({args.requests} requests per target)")
+        for label, url in targets:
+            # Warm up connection pools and any in-process indexes first
+            await run_level(url, paths, min(concurrency, 10), min(args.requests, 50))
+            summary = await run_level(url, paths, concurrency, args.requests)
+            results.setdefault(label, {})[str(concurrency)] = summary
+            print("  " + format_row(label, summary))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"paths": paths, "results": results}, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare API throughput under concurrent load")
+    parser.add_argument("--target", action="append", required=True,
+                        help="label=base_url, repeat to compare servers")
+    parser.add_argument("--concurrency", action="append", type=int,
+                        help="Requests in flight (repeatable, default 10/100/500)")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per target and level")
+    parser.add_argument("--path", action="append", help="Request path (repeatable)")
+    parser.add_argument("--output", help="Write results as JSON")
+    args = parser.parse_args()
+    args.concurrency = args.concurrency or [10, 100, 500]
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# backend/benchmarks/serialization.py
+"""
+Serialization cost of the hot read responses, without a server.
+
+For each payload, times the two ways a handler's return value becomes
+response bytes:
+
+- default: what FastAPI does with a response_model - validate into the
+  Pydantic model, dump to JSON-compatible data, encode with json.dumps
+- fast:    the FAST_JSON path - shape plain dicts (match_json) and
+  encode them with app.fast_json.dumps (orjson when installed)
+
+Usage:
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --repeat 2000 --output serialization.json
+"""
+import argparse
+import json
+import random
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from pydantic import TypeAdapter
+
+from app.fast_json import dumps, orjson
+from app.schemas.recipe import RecipeDetail, RecipeMatch, RecipeSearchResult
+from app.services.matching import match_json
+
+WORDS = "salt onion garlic simmer roast until golden stir season taste serve fresh chopped slowly".split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def suggestions_payload(rng: random.Random, count: int = 50) -> List[dict]:
+    """Rows as the SQL matching engine returns them (Decimal percentages)"""
+    return [
+        {
+            "id": i,
+            "name": _text(rng, 3),
+            "description": _text(rng, 20),
+            "cooking_time": rng.randrange(10, 120, 5),
+            "total_ingredients": 10,
+            "matched_ingredients": 8,
+            "missing_count": 2,
+            "match_percent": Decimal("80"),
+            "missing_ingredients": [_text(rng, 1), _text(rng, 2)],
+        }
+        for i in range(count)
+    ]
+
+
+def detail_payload(rng: random.Random, ingredients: int = 15) -> dict:
+    return {
+        "id": 1,
+        "name": _text(rng, 3),
+        "description": _text(rng, 30),
+        "instructions": _text(rng, 200),
+        "cooking_time": 45,
+        "servings": 4,
+        "ingredients": [
+            {"ingredient_id": i, "name": _text(rng, 2), "quantity": 1.5, "unit": "cups", "notes": None}
+            for i in range(ingredients)
+        ],
+    }
+
+
+def search_payload(rng: random.Random, count: int = 20) -> List[dict]:
+    return [
+        {
+            "id": i,
+            "name": _text(rng, 3),
+            "description": _text(rng, 20),
+            "cooking_time": 30,
+            "rank": rng.random(),
+            "snippet": _text(rng, 30),
+        }
+        for i in range(count)
+    ]
+
+
+def default_path(adapter: TypeAdapter) -> Callable:
+    def encode(content) -> bytes:
+        value = adapter.validate_python(content)
+        data = adapter.dump_python(value, mode="json")
+        return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+    return encode
+
+
+def time_per_call(fn: Callable, content, repeat: int) -> float:
+    """Mean microseconds per call"""
+    fn(content)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(content)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def run(repeat: int, seed: int) -> Dict[str, dict]:
+    rng = random.Random(seed)
+    cases = {
+        "suggestions (50)": (
+            suggestions_payload(rng),
+            TypeAdapter(List[RecipeMatch]),
+            lambda content: dumps([match_json(match) for match in content]),
+        ),
+        "recipe detail": (detail_payload(rng), TypeAdapter(RecipeDetail), dumps),
+        "search (20)": (search_payload(rng), TypeAdapter(List[RecipeSearchResult]), dumps),
+    }
+
+    results = {}
+    for name, (content, adapter, fast) in cases.items():
+        default_us = time_per_call(default_path(adapter), content, repeat)
+        fast_us = time_per_call(fast, content, repeat)
+        results[name] = {
+            "default_us": round(default_us, 1),
+            "fast_us": round(fast_us, 1),
+            "speedup": round(default_us / fast_us, 2) if fast_us else 0.0,
+            "bytes": len(fast(content)),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response serialization benchmark")
+    parser.add_argument("--repeat", type=int, default=1000, help="Encodings timed per payload and path")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Save results as JSON")
+    args = parser.parse_args()
+
+    encoder = "orjson" if orjson is not None else "json (install orjson for the full fast path)"
+    print(f"Fast path encoder: {encoder}\n")
+    results = run(args.repeat, args.seed)
+
+    print(f"{'payload':<18} {'default us':>11} {'fast us':>9} {'speedup':>8} {'bytes':>8}")
+    for name, row in results.items():
+        print(f"{name:<18} {row['default_us']:>11.1f} {row['fast_us']:>9.1f} {row['speedup']:>7.2f}x {row['bytes']:>8}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"encoder": "orjson" if orjson is not None else "json", "results": results}, f, indent=2)
+        print(f"\nSaved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# backend/benchmarks/similarity.py
+"""
+Recall and latency of the MinHash/LSH similarity index against exact
+Jaccard similarity, on the current database.
+
+Load a dataset first (python generate_dataset.py --reset), then run
+    python -m benchmarks.similarity
+    python -m benchmarks.similarity --bands 16 --rows 4 --queries 500
+
+The exact baseline scores every recipe sharing an ingredient with the
+query (through an ingredient -> recipes inverted index). Recall@k counts
+an LSH result as correct when its similarity is at least that of the
+exact k-th neighbour, so ties don't count against it.
+"""
+import argparse
+import heapq
+import json
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from app.config import SIMILARITY_BANDS, SIMILARITY_ROWS
+from app.database import SessionLocal
+from app.services.similarity import SimilarityIndex
+from benchmarks.stats import summarize, format_row
+
+
+def exact_similar(
+    recipe_id: int,
+    ingredients: Dict[int, frozenset],
+    postings: Dict[int, List[int]],
+    k: int
+) -> List[Tuple[int, float]]:
+    """Top-k (recipe_id, jaccard) by brute force over overlapping recipes"""
+    mine = ingredients[recipe_id]
+    overlap: Counter = Counter()
+    for ingredient_id in mine:
+        overlap.update(postings[ingredient_id])
+    del overlap[recipe_id]
+    scored = (
+        (shared / (len(mine) + len(ingredients[other]) - shared), -other)
+        for other, shared in overlap.items()
+    )
+    return [(-neg_id, jaccard) for jaccard, neg_id in heapq.nlargest(k, scored)]
+
+
+def run(bands: int, rows: int, queries: int, k: int, seed: int) -> dict:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        index = SimilarityIndex.load(db, bands=bands, rows=rows)
+        build_s = time.perf_counter() - started
+    finally:
+        db.close()
+
+    postings: Dict[int, List[int]] = {}
+    for recipe_id, ingredient_ids in index.ingredients.items():
+        for ingredient_id in ingredient_ids:
+            postings.setdefault(ingredient_id, []).append(recipe_id)
+
+    rng = random.Random(seed)
+    sample = rng.sample(sorted(index.ingredients), min(queries, len(index.ingredients)))
+
+    lsh_latencies, exact_latencies = [], []
+    hits = expected = 0
+    candidates = 0
+    for recipe_id in sample:
+        t0 = time.perf_counter()
+        approximate = index.similar(recipe_id, k)
+        lsh_latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        exact = exact_similar(recipe_id, index.ingredients, postings, k)
+        exact_latencies.append(time.perf_counter() - t0)
+
+        candidates += len(index.candidates(recipe_id))
+        if exact:
+            cutoff = exact[-1][1]
+            expected += len(exact)
+            hits += sum(1 for _, jaccard, _ in approximate if jaccard >= cutoff - 1e-12)
+
+    return {
+        "recipes": len(index.ingredients),
+        "bands": bands,
+        "rows": rows,
+        "threshold": round((1 / bands) ** (1 / rows), 3),
+        "build_s": round(build_s, 2),
+        "mean_candidates": round(candidates / len(sample), 1) if sample else 0,
+        f"recall_at_{k}": round(hits / expected, 4) if expected else 0.0,
+        "lsh": summarize(lsh_latencies, sum(lsh_latencies)),
+        "exact": summarize(exact_latencies, sum(exact_latencies)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Similarity index recall / latency benchmark")
+    parser.add_argument("--bands", type=int, default=SIMILARITY_BANDS)
+    parser.add_argument("--rows", type=int, default=SIMILARITY_ROWS)
+    parser.add_argument("--queries", type=int, default=200, help="Query recipes, sampled with --seed")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Save results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.bands, args.rows, args.queries, args.k, args.seed)
+
+    print(f"{results['recipes']} recipes, {args.bands} bands x {args.rows} rows "
+          f"(threshold ~{results['threshold']}), built in {results['build_s']}s")
+    print(f"Recall@{args.k}: {results[f'recall_at_{args.k}']:.1%}  "
+          f"(mean {results['mean_candidates']} candidates per query)\n")
+    print(format_row("lsh", results["lsh"]))
+    print(format_row("exact", results["exact"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
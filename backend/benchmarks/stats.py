@@ -0,0 +1,46 @@
+# backend/benchmarks/stats.py
+"""
+Latency summary helpers shared by the benchmark scripts
+"""
+import math
+from typing import List, Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> dict:
+    """
+    Summarize request latencies (seconds) into the numbers we report.
+
+    Returns milliseconds for latencies and requests/second for throughput.
+    """
+    values = sorted(latencies)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / count * 1000, 2) if count else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if count else 0.0,
+    }
+
+
+def format_row(label: str, summary: dict) -> str:
+    """One aligned line of a results table"""
+    return (
+        f"{label:<32} {summary['throughput_rps']:>9.1f} rps"
+        f"  p50 {summary['p50_ms']:>8.2f} ms"
+        f"  p95 {summary['p95_ms']:>8.2f} ms"
+        f"  p99 {summary['p99_ms']:>8.2f} ms"
+        f"  errors {summary['errors']}"
+    )
@@ -0,0 +1,179 @@
+# backend/benchmarks/suite.py
+"""
+Per-endpoint latency benchmark against a running server.
+
+Load a dataset first (python generate_dataset.py --reset), start the app,
+then run
+    python -m benchmarks.suite --url http://localhost:8000 --output before.json
+
+Each scenario hits one endpoint with varying parameters (random users,
+search prefixes) drawn from a fixed seed, and reports throughput and
+p50/p95/p99 latency. Compare two saved runs with
+    python -m benchmarks.suite --compare before.json after.json
+or run and compare in one go with --baseline before.json.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import httpx
+
+from benchmarks.stats import summarize, format_row
+
+SEARCH_TERMS = ["s", "sa", "on", "ch", "chi", "oil", "gar", "pep", "tom", "ric", "bas", "smoked", "red p"]
+
+
+def _suggestions(rng: random.Random, users: int) -> str:
+    return f"/api/recipes/suggestions?user_id={rng.randint(1, users)}&max_missing=2&limit=10"
+
+
+def _search(rng: random.Random, users: int) -> str:
+    return f"/api/ingredients/search?q={rng.choice(SEARCH_TERMS)}&limit=10"
+
+
+def _inventory(rng: random.Random, users: int) -> str:
+    return f"/api/inventory/?user_id={rng.randint(1, users)}"
+
+
+def _inventory_page(rng: random.Random, users: int) -> str:
+    return f"/api/inventory/?user_id={rng.randint(1, users)}&cursor=&limit=50&sort=name"
+
+
+def _recipes_page(rng: random.Random, users: int) -> str:
+    return "/api/recipes/?cursor=&limit=20&sort=name"
+
+
+# name -> builds one request path
+SCENARIOS: Dict[str, Callable[[random.Random, int], str]] = {
+    "suggestions": _suggestions,
+    "ingredient_search": _search,
+    "inventory": _inventory,
+    "inventory_page": _inventory_page,
+    "recipes_page": _recipes_page,
+}
+
+
+async def run_scenario(client: httpx.AsyncClient, paths: List[str], concurrency: int) -> dict:
+    """Request every path with `concurrency` in flight and summarize"""
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(paths)
+
+    async def worker():
+        nonlocal errors
+        for path in pending:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors += 1
+                    continue
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_suite(args) -> dict:
+    scenarios = args.scenario or list(SCENARIOS)
+    results = {}
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        for name in scenarios:
+            build = SCENARIOS[name]
+            # Same seed per scenario, so every run sends the same requests
+            rng = random.Random(f"{args.seed}:{name}")
+            warmup = [build(rng, args.users) for _ in range(args.warmup)]
+            paths = [build(rng, args.users) for _ in range(args.requests)]
+
+            await run_scenario(client, warmup, args.concurrency)
+            results[name] = await run_scenario(client, paths, args.concurrency)
+            print("  " + format_row(name, results[name]))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "url": args.url,
+            "seed": args.seed,
+            "users": args.users,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict):
+    """Print the change in throughput and percentiles per scenario"""
+    print(f"\n{'scenario':<20} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, summary in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            old, new = before[metric], summary[metric]
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{name:<20} {metric:<15} {old:>10.2f} {new:>10.2f} {change:>8}")
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints and compare runs")
+    parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the running app")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default all)")
+    parser.add_argument("--users", type=int, default=50_000, help="User IDs to draw from (match the dataset)")
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Saved results to compare this run against")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="Compare two saved result files without running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(load(args.compare[0]), load(args.compare[1]))
+        return
+
+    print(f"Benchmarking {args.url} ({args.requests} requests per scenario, concurrency {args.concurrency})")
+    report = asyncio.run(run_suite(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+    if args.baseline:
+        compare(load(args.baseline), report)
+
+
+if __name__ == "__main__":
+    main()
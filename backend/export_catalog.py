@@ -0,0 +1,50 @@
+# backend/export_catalog.py
+"""
+Export the recipe catalog as NDJSON (the format import_recipes.py reads)
+
+Usage:
+    python export_catalog.py recipes.ndjson
+    python export_catalog.py recipes.ndjson.gz
+    python export_catalog.py - --gzip > recipes.ndjson.gz
+"""
+import argparse
+import sys
+import time
+
+from app.database import SessionLocal
+from app.services.catalog_export import EXPORT_BATCH_SIZE, export_ndjson, gzip_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export recipes as NDJSON")
+    parser.add_argument("path", help="Output file, or - for stdout")
+    parser.add_argument("--gzip", action="store_true", help="Compress the output (default for .gz paths)")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Rows fetched per cursor batch")
+    args = parser.parse_args()
+
+    compress = args.gzip or args.path.endswith(".gz")
+    started = time.monotonic()
+    written = 0
+
+    db = SessionLocal()
+    try:
+        out = sys.stdout.buffer if args.path == "-" else open(args.path, "wb")
+        try:
+            chunks = export_ndjson(db, batch_size=args.batch_size)
+            for chunk in gzip_chunks(chunks) if compress else chunks:
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    finally:
+        db.close()
+
+    print(
+        f"✅ Exported {written / 1e6:.1f} MB in {time.monotonic() - started:.1f}s",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# backend/generate_dataset.py
+"""
+Generate a synthetic, production-sized dataset for benchmarking
+
+Ingredient popularity follows a Zipf distribution, so a few staples
+(salt, onion, ...) appear in most recipes and inventories while the long
+tail is rare - the same skew real data has. The same --seed always
+produces the same rows.
+
+Usage:
+    python generate_dataset.py --reset
+    python generate_dataset.py --recipes 100000 --ingredients 20000 \
+        --users 50000 --inventory-rows 1000000 --seed 42 --reset
+"""
+import argparse
+import itertools
+import random
+import time
+from typing import List
+
+from sqlalchemy import delete, insert
+
+from app.database import SessionLocal
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version
+from app.models.recipe import Recipe, Ingredient, RecipeIngredient, RecipeSummary, UserInventory
+from app.services.recipe_summary import refresh_recipe_summaries
+
+BASE_NAMES = [
+    "salt", "pepper", "onion", "garlic", "olive oil", "butter", "egg", "flour",
+    "sugar", "milk", "tomato", "chicken breast", "rice", "carrot", "lemon",
+    "parsley", "cheddar", "potato", "pasta", "basil", "beef", "cumin",
+    "paprika", "ginger", "soy sauce", "honey", "spinach", "broccoli", "bacon",
+    "mushroom", "cream", "thyme", "oregano", "chili", "cilantro", "lime",
+    "yogurt", "bell pepper", "celery", "shrimp", "salmon", "tofu", "beans",
+    "corn", "zucchini", "cinnamon", "vanilla", "walnut", "almond", "oats",
+]
+VARIANTS = [
+    "", "fresh", "dried", "smoked", "ground", "red", "green", "wild",
+    "organic", "roasted", "pickled", "frozen", "baby", "sweet", "black",
+]
+CATEGORIES = ["protein", "vegetable", "grain", "fat", "seasoning", "dairy", "fruit", "other"]
+UNITS = [("g", 50, 500), ("cups", 0.25, 3), ("tbsp", 1, 4), ("tsp", 0.5, 3), ("pieces", 1, 6)]
+DISHES = ["stew", "salad", "stir fry", "bake", "soup", "curry", "tacos", "pasta", "bowl", "roast"]
+
+
+class ZipfSampler:
+    """Draws ingredient indexes with P(rank k) proportional to 1 / k**s"""
+
+    def __init__(self, n: int, s: float, rng: random.Random):
+        self.population = range(n)
+        self.cum_weights = list(itertools.accumulate(1 / (k ** s) for k in range(1, n + 1)))
+        self.rng = rng
+
+    def sample(self, k: int) -> List[int]:
+        """`k` distinct indexes, popular ones first more often"""
+        k = min(k, len(self.population))
+        chosen = set()
+        while len(chosen) < k:
+            chosen.update(self.rng.choices(self.population, cum_weights=self.cum_weights, k=k - len(chosen)))
+        return sorted(chosen)
+
+
+def ingredient_names(count: int) -> List[str]:
+    """Unique, realistic-looking names - the most popular get the plain base names"""
+    names = []
+    for variant, base in itertools.product(VARIANTS, BASE_NAMES):
+        names.append(f"{variant} {base}".strip())
+        if len(names) == count:
+            return names
+    for i in itertools.count(1):
+        for base in BASE_NAMES:
+            names.append(f"{base} no. {i}")
+            if len(names) == count:
+                return names
+
+
+def insert_batches(db, model, rows, batch_size: int, returning=None):
+    """executemany `rows` in batches; with `returning`, collect that column in input order"""
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if returning is None:
+            db.execute(insert(model), batch)
+        else:
+            stmt = insert(model).returning(returning, sort_by_parameter_order=True)
+            ids.extend(db.execute(stmt, batch).scalars())
+    return ids
+
+
+def reset(db):
+    """Remove all catalog and inventory rows"""
+    for model in (UserInventory, RecipeSummary, RecipeIngredient, Recipe, Ingredient):
+        db.execute(delete(model))
+    db.commit()
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    db = SessionLocal()
+    started = time.monotonic()
+
+    def progress(message):
+        print(f"  [{time.monotonic() - started:7.1f}s] {message}", flush=True)
+
+    try:
+        if args.reset:
+            print("Removing existing data...")
+            reset(db)
+
+        print(f"Generating dataset (seed {args.seed}, zipf s={args.zipf})...")
+        names = ingredient_names(args.ingredients)
+        ingredient_ids = insert_batches(
+            db, Ingredient,
+            [{"name": name, "category": rng.choice(CATEGORIES)} for name in names],
+            args.batch_size, returning=Ingredient.id
+        )
+        db.commit()
+        progress(f"{len(ingredient_ids)} ingredients")
+
+        popularity = ZipfSampler(len(ingredient_ids), args.zipf, rng)
+
+        created = 0
+        while created < args.recipes:
+            count = min(args.batch_size, args.recipes - created)
+            recipes = []
+            for i in range(created, created + count):
+                recipes.append({
+                    "name": f"{rng.choice(names)} {rng.choice(DISHES)} #{i + 1}",
+                    "description": None,
+                    "instructions": None,
+                    "cooking_time": rng.choice(range(10, 125, 5)),
+                    "servings": rng.randint(1, 8),
+                })
+            recipe_ids = insert_batches(db, Recipe, recipes, args.batch_size, returning=Recipe.id)
+
+            rows = []
+            for recipe_id in recipe_ids:
+                size = max(args.min_ingredients, min(args.max_ingredients, round(rng.gauss(8, 3))))
+                for index in popularity.sample(size):
+                    unit, low, high = rng.choice(UNITS)
+                    rows.append({
+                        "recipe_id": recipe_id,
+                        "ingredient_id": ingredient_ids[index],
+                        "quantity": round(rng.uniform(low, high), 2),
+                        "unit": unit,
+                        "notes": None,
+                    })
+            insert_batches(db, RecipeIngredient, rows, args.batch_size * 10)
+            db.commit()
+            created += count
+            progress(f"{created} recipes")
+
+        # Spread the inventory rows over users unevenly, averaging rows / users
+        average = args.inventory_rows / args.users if args.users else 0
+        rows = []
+        inserted = 0
+        for user_id in range(1, args.users + 1):
+            size = min(round(rng.uniform(0.5, 1.5) * average), args.inventory_rows - inserted - len(rows))
+            for index in popularity.sample(size):
+                rows.append({
+                    "user_id": user_id,
+                    "ingredient_id": ingredient_ids[index],
+                    "quantity": round(rng.uniform(0.5, 5), 2),
+                    "unit": rng.choice(UNITS)[0],
+                })
+            if len(rows) >= args.batch_size * 10:
+                insert_batches(db, UserInventory, rows, args.batch_size * 10)
+                db.commit()
+                inserted += len(rows)
+                rows = []
+                progress(f"{inserted} inventory rows ({user_id} users)")
+        insert_batches(db, UserInventory, rows, args.batch_size * 10)
+        db.commit()
+        inserted += len(rows)
+        progress(f"{inserted} inventory rows ({args.users} users)")
+
+        print("Rebuilding recipe summaries...")
+        refresh_recipe_summaries(db)
+        bump_catalog_version(db, RECIPES, INGREDIENTS)
+        db.commit()
+        progress("recipe summaries")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    print(f"\n✅ Dataset generated in {time.monotonic() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark dataset")
+    parser.add_argument("--recipes", type=int, default=100_000)
+    parser.add_argument("--ingredients", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--inventory-rows", type=int, default=1_000_000)
+    parser.add_argument("--min-ingredients", type=int, default=3, help="Fewest ingredients per recipe")
+    parser.add_argument("--max-ingredients", type=int, default=20, help="Most ingredients per recipe")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for ingredient popularity")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=1000, help="Recipes per insert batch")
+    parser.add_argument("--reset", action="store_true", help="Delete existing data first")
+    args = parser.parse_args()
+
+    generate(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# backend/import_recipes.py
+"""
+Bulk import recipes from an NDJSON or CSV file
+
+Usage:
+    python import_recipes.py recipes.ndjson
+    python import_recipes.py recipes.csv --batch-size 5000
+    cat recipes.ndjson | python import_recipes.py - --format ndjson
+"""
+import argparse
+import sys
+import time
+
+from app.database import SessionLocal
+from app.services.bulk_import import import_recipes, detect_format, PARSERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import recipes")
+    parser.add_argument("path", help="File to import, or - for stdin")
+    parser.add_argument("--format", choices=sorted(PARSERS), help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Recipes per database batch")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    started = time.monotonic()
+
+    def on_progress(report):
+        elapsed = time.monotonic() - started
+        rate = report.imported / elapsed if elapsed else 0
+        print(
+            f"  {report.processed} processed, {report.imported} imported, "
+            f"{report.failed} failed ({rate:.0f} recipes/s)",
+            flush=True
+        )
+
+    db = SessionLocal()
+    try:
+        print(f"Importing {args.path} as {fmt}...")
+        if args.path == "-":
+            report = import_recipes(db, sys.stdin, fmt=fmt, batch_size=args.batch_size, on_progress=on_progress)
+        else:
+            with open(args.path, encoding="utf-8", newline="") as stream:
+                report = import_recipes(db, stream, fmt=fmt, batch_size=args.batch_size, on_progress=on_progress)
+    finally:
+        db.close()
+
+    print(f"\n✅ Imported {report.imported} recipes in {time.monotonic() - started:.1f}s")
+    print(f"   - {report.ingredients_created} new ingredients")
+    if report.failed:
+        print(f"   - {report.failed} failed rows:")
+        for error in report.errors:
+            print(f"     line {error.line}: {error.error}")
+        if report.failed > len(report.errors):
+            print(f"     ... and {report.failed - len(report.errors)} more")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ Seed the database with initial test data
 """
 from app.database import SessionLocal
 from app.models.recipe import Recipe, Ingredient, RecipeIngredient, UserInventory
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version
+from app.services.recipe_summary import refresh_recipe_summaries
 
 def seed_data():
     db = SessionLocal()
@@ -76,6 +78,9 @@ def seed_data():
             db.add(ri)
             print(f"  ✓ Added {ing.name}")
         
+        db.flush()
+        refresh_recipe_summaries(db, [recipe.id])
+        bump_catalog_version(db, RECIPES, INGREDIENTS)
         db.commit()
         
         # Add items to user inventory
@@ -0,0 +1,70 @@
+# backend/tests/conftest.py
+"""
+Test setup: a throwaway SQLite database and the in-memory engines.
+
+Settings are read from the environment when app.config is imported, so
+they are set here before anything from the app is imported. Every test
+starts from empty tables and cold in-process caches.
+
+Requests that run more than QUERY_BUDGET SQL statements fail the test
+(QueryBudgetExceeded, see app/query_stats.py), and responses carry the
+X-Query-* headers.
+
+    cd backend && python -m pytest
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="dinner-tonight-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["DATABASE_READ_URL"] = ""
+os.environ["MATCHING_ENGINE"] = "memory"
+os.environ["RECIPE_SNAPSHOT_DIR"] = ""
+os.environ["SINGLE_FLIGHT_DIR"] = ""
+os.environ["QUERY_BUDGET"] = "15"
+os.environ["QUERY_BUDGET_STRICT"] = "1"
+os.environ["QUERY_DEBUG"] = "1"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import Base, SessionLocal, get_engine
+from app.http_cache import catalog_versions
+from app.main import app
+from app.services import recipe_search
+from app.services.ingredient_search import invalidate_ingredient_index
+from app.services.recipe_index import invalidate_recipe_index
+from app.services.similarity import invalidate_similarity_index
+from app.services.suggestion_cache import suggestion_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_database(monkeypatch):
+    """Empty tables and cold in-process indexes and caches for every test"""
+    engine = get_engine()
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    catalog_versions.invalidate()
+    suggestion_cache.invalidate_all()
+    invalidate_recipe_index()
+    invalidate_ingredient_index()
+    invalidate_similarity_index()
+    monkeypatch.setattr(recipe_search, "_index", None)
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so the startup warm-up doesn't run
+    return TestClient(app)
+
@@ -0,0 +1,39 @@
+# backend/tests/helpers.py
+"""Small builders for test data"""
+from app.models.recipe import Ingredient, Recipe, RecipeIngredient, UserInventory
+from app.services.recipe_summary import refresh_recipe_summaries
+
+
+def add_ingredients(db, *names: str, category: str = None) -> dict:
+    """Create ingredients; returns name -> ID"""
+    ingredients = [Ingredient(name=name, category=category) for name in names]
+    db.add_all(ingredients)
+    db.flush()
+    return {ingredient.name: ingredient.id for ingredient in ingredients}
+
+
+def add_recipe(db, name: str, ingredients: dict, **fields) -> int:
+    """
+    Create a recipe and its summary row.
+
+    Args:
+        ingredients: ingredient ID -> (quantity, unit), or a list of IDs
+    """
+    recipe = Recipe(name=name, **fields)
+    if not isinstance(ingredients, dict):
+        ingredients = {ingredient_id: (None, None) for ingredient_id in ingredients}
+    recipe.ingredients = [
+        RecipeIngredient(ingredient_id=ingredient_id, quantity=quantity, unit=unit)
+        for ingredient_id, (quantity, unit) in ingredients.items()
+    ]
+    db.add(recipe)
+    db.flush()
+    refresh_recipe_summaries(db, [recipe.id])
+    return recipe.id
+
+
+def stock(db, user_id: int, ingredients: dict):
+    """Put ingredient ID -> (quantity, unit) into a user's inventory"""
+    for ingredient_id, (quantity, unit) in ingredients.items():
+        db.add(UserInventory(user_id=user_id, ingredient_id=ingredient_id, quantity=quantity, unit=unit))
+    db.flush()
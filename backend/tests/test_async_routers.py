@@ -0,0 +1,55 @@
+# backend/tests/test_async_routers.py
+"""The DB_MODE=async routers, on SQLite through aiosqlite"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import ingredients_async, inventory_async, recipes_async
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+@pytest.fixture
+def async_client():
+    app = FastAPI()
+    app.include_router(recipes_async.router, prefix="/api/recipes")
+    app.include_router(ingredients_async.router, prefix="/api/ingredients")
+    app.include_router(inventory_async.router, prefix="/api/inventory")
+    # One portal (event loop) for the whole test, as under uvicorn
+    with TestClient(app) as client:
+        yield client
+
+
+def test_async_suggestions_follow_inventory_writes(async_client, db):
+    ids = add_ingredients(db, "egg", "flour", "milk")
+    add_recipe(db, "Pancakes", [ids["egg"], ids["flour"], ids["milk"]])
+    stock(db, 1, {ids["egg"]: (6, "pieces")})
+    db.commit()
+
+    before = async_client.get("/api/recipes/suggestions").json()
+    assert before[0]["missing_count"] == 2
+
+    response = async_client.post(f"/api/inventory/?ingredient_id={ids['flour']}")
+    assert response.status_code == 201
+    after = async_client.get("/api/recipes/suggestions").json()
+    assert after[0]["missing_ingredients"] == ["milk"]
+
+
+def test_async_recipe_create_and_read(async_client, db):
+    ids = add_ingredients(db, "rice", "beans")
+    db.commit()
+
+    created = async_client.post("/api/recipes/", json={
+        "name": "Rice and beans",
+        "ingredients": [
+            {"ingredient_id": ids["rice"], "quantity": 200, "unit": "g"},
+            {"ingredient_id": ids["beans"], "quantity": 1, "unit": "cup"},
+        ],
+    })
+    assert created.status_code == 201
+    recipe_id = created.json()["id"]
+
+    assert async_client.get(f"/api/recipes/{recipe_id}").json()["name"] == "Rice and beans"
+    listing = async_client.get("/api/recipes/?cursor=").json()
+    assert [recipe["id"] for recipe in listing["items"]] == [recipe_id]
+    names = [row["name"] for row in async_client.get("/api/ingredients/").json()]
+    assert names == ["rice", "beans"]
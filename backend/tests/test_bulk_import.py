@@ -0,0 +1,127 @@
+# backend/tests/test_bulk_import.py
+import io
+import json
+
+import pytest
+from sqlalchemy import func, select
+
+from app.http_cache import INGREDIENTS, RECIPES
+from app.models.recipe import CatalogVersion, Ingredient, Recipe
+from app.database import SessionLocal
+from app.services import recipe_index
+from app.services.bulk_import import RecipeImporter, import_recipes, parse_csv
+
+
+def ndjson(*records) -> io.StringIO:
+    return io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+
+
+def versions(db) -> dict:
+    db.rollback()  # new transaction, so other sessions' commits are visible
+    return dict(db.execute(select(CatalogVersion.name, CatalogVersion.version)).all())
+
+
+def test_each_batch_bumps_the_catalog_version(db):
+    stream = ndjson(*[
+        {"name": f"Recipe {i}", "ingredients": [{"name": f"item {i}"}]}
+        for i in range(5)
+    ])
+    seen = []
+
+    report = import_recipes(db, stream, batch_size=2, on_progress=lambda report: seen.append(versions(db)))
+
+    assert report.imported == 5
+    # Committed with the batch, not after the whole import
+    assert [v[RECIPES] for v in seen] == [1, 2, 3]
+    assert [v[INGREDIENTS] for v in seen] == [1, 2, 3]
+
+
+def test_interrupted_import_still_invalidates(db):
+    stale = recipe_index.get_recipe_index(db)
+
+    def stop(report):
+        raise RuntimeError("connection lost")
+
+    with pytest.raises(RuntimeError):
+        import_recipes(db, ndjson({"name": "Soup", "ingredients": [{"name": "water"}]}), on_progress=stop)
+
+    assert db.scalar(select(func.count()).select_from(Recipe)) == 1
+    assert versions(db)[RECIPES] == 1
+    assert recipe_index.get_recipe_index(db) is not stale
+
+
+def test_failed_import_leaves_versions_alone(db):
+    report = import_recipes(db, ndjson({"cooking_time": 10}, {"name": "x", "servings": "many"}))
+
+    assert (report.imported, report.failed) == (0, 2)
+    assert versions(db) == {}
+
+
+def test_ingredients_created_concurrently_are_not_counted(db, monkeypatch):
+    lookup = RecipeImporter._lookup_ingredients
+
+    def race(importer, names):
+        lookup(importer, names)
+        if "onion" in names and "onion" not in importer._ingredient_ids:
+            other = SessionLocal()  # another import gets there first
+            other.add(Ingredient(name="onion"))
+            other.commit()
+            other.close()
+
+    monkeypatch.setattr(RecipeImporter, "_lookup_ingredients", race)
+
+    report = import_recipes(db, ndjson({"name": "Soup", "ingredients": [{"name": "water"}, {"name": "onion"}]}))
+
+    assert (report.imported, report.ingredients_created) == (1, 1)
+    detail = db.execute(select(Ingredient.name).order_by(Ingredient.name)).scalars().all()
+    assert detail == ["onion", "water"]
+
+
+def test_parse_csv_groups_consecutive_rows():
+    stream = io.StringIO(
+        "name,cooking_time,ingredient,quantity,unit\n"
+        "Omelette,10,eggs,3,\n"
+        "Omelette,10,butter,10,g\n"
+        "Toast,,bread,2,slices\n"
+    )
+
+    records = list(parse_csv(stream))
+
+    assert [(line, record["name"], [i["name"] for i in record["ingredients"]]) for line, record, _ in records] == [
+        (2, "Omelette", ["eggs", "butter"]),
+        (4, "Toast", ["bread"]),
+    ]
+    assert records[1][1]["cooking_time"] is None
+
+
+def test_bad_records_are_reported_and_the_rest_loaded(db):
+    stream = io.StringIO(
+        json.dumps({"name": "Soup", "ingredients": [{"name": "Water"}, {"name": " onion "}]}) + "\n"
+        "not json\n"
+        "\n"
+        "[1, 2]\n"
+        + json.dumps({"name": "Stew", "cooking_time": "slow"}) + "\n"
+        + json.dumps({"name": "Broth", "ingredients": [{"name": "water"}]}) + "\n"
+    )
+
+    report = import_recipes(db, stream, batch_size=2)
+
+    assert (report.processed, report.imported, report.failed, report.ingredients_created) == (5, 2, 3, 2)
+    assert [error.line for error in report.errors] == [2, 4, 5]
+    assert report.errors[0].error.startswith("Invalid JSON")
+    assert report.errors[2].error.startswith("cooking_time:")
+    names = db.scalars(select(Ingredient.name).order_by(Ingredient.name)).all()
+    assert names == ["onion", "water"]
+
+
+def test_upload_endpoint_detects_the_format(client, db):
+    csv_file = "name,ingredient,quantity,unit\nRice,rice,1,cup\nRice,salt,,\n"
+
+    response = client.post("/api/recipes/import", files={"file": ("recipes.csv", csv_file)})
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+    detail = client.get(f"/api/recipes/{db.scalar(select(Recipe.id))}/detail").json()
+    assert [i["name"] for i in detail["ingredients"]] == ["rice", "salt"]
+    unsupported = client.post("/api/recipes/import?format=xml", files={"file": ("recipes.xml", "<x/>")})
+    assert unsupported.status_code == 400
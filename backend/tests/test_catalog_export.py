@@ -0,0 +1,60 @@
+# backend/tests/test_catalog_export.py
+import gzip
+import io
+import json
+
+from app.services import catalog_export
+from app.services.bulk_import import import_recipes
+from app.services.catalog_export import export_ndjson, export_recipes, gzip_chunks
+from tests.helpers import add_ingredients, add_recipe
+
+
+def catalog(db):
+    ids = add_ingredients(db, "rice", "beans", "salt")
+    add_recipe(db, "Rice and beans", {ids["rice"]: (1, "cup"), ids["beans"]: (400, "g")}, cooking_time=30, servings=2)
+    add_recipe(db, "Salted rice", {ids["rice"]: (2, "cups"), ids["salt"]: (None, None)}, description="Simple")
+    add_recipe(db, "Nothing", [])
+    db.commit()
+
+
+def test_export_endpoint_streams_one_line_per_recipe(client, db):
+    catalog(db)
+
+    response = client.get("/api/recipes/export")
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["name"] for line in lines] == ["Rice and beans", "Salted rice", "Nothing"]
+    assert lines[0]["ingredients"] == [
+        {"ingredient_id": 1, "name": "rice", "quantity": 1.0, "unit": "cup", "notes": None},
+        {"ingredient_id": 2, "name": "beans", "quantity": 400.0, "unit": "g", "notes": None},
+    ]
+    assert lines[2]["ingredients"] == []
+
+    compressed = client.get("/api/recipes/export?gzip=true")
+    assert compressed.headers["content-type"] == "application/gzip"
+    assert gzip.decompress(compressed.content).decode() == response.text
+
+
+def test_chunks_and_small_cursor_batches(db, monkeypatch):
+    catalog(db)
+    whole = b"".join(export_ndjson(db))
+    monkeypatch.setattr(catalog_export, "CHUNK_SIZE", 100)
+
+    chunks = list(export_ndjson(db, batch_size=1))
+
+    assert len(chunks) > 1 and b"".join(chunks) == whole
+    assert gzip.decompress(b"".join(gzip_chunks(iter(chunks)))) == whole
+
+
+def test_export_can_be_imported_again(db):
+    catalog(db)
+    exported = b"".join(export_ndjson(db)).decode()
+
+    report = import_recipes(db, io.StringIO(exported))
+
+    assert (report.imported, report.failed, report.ingredients_created) == (3, 0, 0)
+    recipes = list(export_recipes(db))
+    originals, copies = recipes[:3], recipes[3:]
+    strip = lambda recipe: {**recipe, "id": None}
+    assert [strip(recipe) for recipe in copies] == [strip(recipe) for recipe in originals]
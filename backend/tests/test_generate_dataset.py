@@ -0,0 +1,58 @@
+# backend/tests/test_generate_dataset.py
+import random
+from argparse import Namespace
+
+from sqlalchemy import func, select
+
+from app.models.recipe import Ingredient, Recipe, RecipeIngredient, RecipeSummary, UserInventory
+from generate_dataset import ZipfSampler, generate, ingredient_names
+
+
+def options(**overrides) -> Namespace:
+    values = dict(
+        recipes=60, ingredients=80, users=10, inventory_rows=150, min_ingredients=3,
+        max_ingredients=8, zipf=1.1, seed=7, batch_size=25, reset=True,
+    )
+    values.update(overrides)
+    return Namespace(**values)
+
+
+def count(db, model) -> int:
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def snapshot(db) -> list:
+    return db.execute(
+        select(Recipe.name, RecipeIngredient.ingredient_id, RecipeIngredient.quantity)
+        .join(RecipeIngredient).order_by(Recipe.id, RecipeIngredient.id)
+    ).all()
+
+
+def test_generates_the_requested_sizes(db):
+    generate(options())
+
+    assert (count(db, Ingredient), count(db, Recipe), count(db, RecipeSummary)) == (80, 60, 60)
+    assert count(db, UserInventory) == 150
+    sizes = db.scalars(select(RecipeSummary.total_ingredients)).all()
+    assert 3 <= min(sizes) and max(sizes) <= 8
+
+
+def test_same_seed_same_rows(db):
+    generate(options())
+    first = snapshot(db)
+    db.rollback()
+    generate(options())
+
+    assert snapshot(db) == first
+    db.rollback()
+    generate(options(seed=8))
+    assert snapshot(db) != first
+
+
+def test_popularity_is_skewed_toward_the_first_ingredients():
+    sampler = ZipfSampler(100, 1.1, random.Random(1))
+    draws = [index for _ in range(500) for index in sampler.sample(5)]
+
+    assert all(len(set(sampler.sample(5))) == 5 for _ in range(20))
+    assert draws.count(0) > 5 * max(draws.count(50), 1)
+    assert len(set(ingredient_names(1000))) == 1000
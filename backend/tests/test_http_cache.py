@@ -0,0 +1,56 @@
+# backend/tests/test_http_cache.py
+from sqlalchemy import select
+
+from app.http_cache import INGREDIENTS, RECIPES, bump_catalog_version, etag_matches
+from app.models.recipe import CatalogVersion
+from tests.helpers import add_ingredients, add_recipe
+
+
+def test_conditional_get_answers_304_until_the_catalog_changes(client, db):
+    ids = add_ingredients(db, "rice")
+    recipe_id = add_recipe(db, "Rice", [ids["rice"]])
+    db.commit()
+
+    first = client.get("/api/recipes/")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and first.headers["cache-control"].startswith("public")
+
+    cached = client.get("/api/recipes/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+    # Another URL has its own tag
+    assert client.get(f"/api/recipes/{recipe_id}").headers["etag"] != etag
+
+    client.post("/api/recipes/", json={"name": "Plain rice", "ingredients": [{"ingredient_id": ids["rice"]}]})
+    changed = client.get("/api/recipes/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_ingredient_writes_only_change_ingredient_tags(client):
+    recipes = client.get("/api/recipes/").headers["etag"]
+    ingredients = client.get("/api/ingredients/").headers["etag"]
+
+    assert client.post("/api/ingredients/", json={"name": "saffron"}).status_code == 201
+
+    assert client.get("/api/recipes/", headers={"If-None-Match": recipes}).status_code == 304
+    assert client.get("/api/ingredients/", headers={"If-None-Match": ingredients}).status_code == 200
+
+
+def test_etag_matching():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_bump_creates_then_increments(db):
+    bump_catalog_version(db, RECIPES)
+    db.commit()
+    bump_catalog_version(db, RECIPES, INGREDIENTS)
+    db.commit()
+
+    assert dict(db.execute(select(CatalogVersion.name, CatalogVersion.version)).all()) == {
+        RECIPES: 2, INGREDIENTS: 1,
+    }
@@ -0,0 +1,60 @@
+# backend/tests/test_ingredient_search.py
+import pytest
+
+from app.services import ingredient_search
+from app.services.ingredient_search import IngredientSearchIndex, search_ingredients
+from tests.helpers import add_ingredients, add_recipe
+
+
+@pytest.fixture
+def pantry(db):
+    ids = add_ingredients(db, "salt", "sea salt", "salted butter", "basil", "garlic salt", "100% cocoa", "1_2 cream")
+    # popularity: garlic salt 2, salted butter 1, the rest 0
+    add_recipe(db, "Garlic bread", [ids["garlic salt"], ids["salted butter"]])
+    add_recipe(db, "Fries", [ids["garlic salt"]])
+    db.commit()
+    return ids
+
+
+@pytest.mark.parametrize("engine", ["sql", "memory"])
+def test_prefix_matches_rank_before_substring_matches(db, pantry, engine):
+    names = [row["name"] for row in search_ingredients(db, "SAL", limit=10, engine=engine)]
+    # prefix matches by popularity then name, then substring matches likewise
+    assert names == ["salted butter", "salt", "garlic salt", "sea salt"]
+
+
+@pytest.mark.parametrize("engine", ["sql", "memory"])
+def test_limit_and_no_match(db, pantry, engine):
+    assert len(search_ingredients(db, "salt", limit=2, engine=engine)) == 2
+    assert search_ingredients(db, "saffron", engine=engine) == []
+    assert search_ingredients(db, "   ", engine=engine) == []
+
+
+@pytest.mark.parametrize("engine", ["sql", "memory"])
+def test_like_wildcards_are_literal(db, pantry, engine):
+    assert [row["name"] for row in search_ingredients(db, "%", engine=engine)] == ["100% cocoa"]
+    assert [row["name"] for row in search_ingredients(db, "1_", engine=engine)] == ["1_2 cream"]
+
+
+def test_sql_ranks_popularity_among_the_closest_candidates(db, pantry, monkeypatch):
+    monkeypatch.setattr(ingredient_search, "SQL_CANDIDATES", 2)
+    # Only the two prefix matches are ranked; the more popular "garlic salt" isn't
+    names = [row["name"] for row in search_ingredients(db, "salt", engine="sql")]
+    assert names == ["salted butter", "salt"]
+
+
+def test_memory_index_picks_up_new_ingredients_and_usage():
+    index = IngredientSearchIndex()
+    index.add(1, "Tomato")
+    index.add(2, "Tomatillo")
+    index.sorted_names.sort()
+    assert [row["name"] for row in index.search("tom")] == ["Tomatillo", "Tomato"]
+    index.record_usage([1])
+    assert [row["name"] for row in index.search("tom")] == ["Tomato", "Tomatillo"]
+    assert [row["name"] for row in index.search("matil")] == ["Tomatillo"]
+
+
+def test_search_endpoint(client, pantry):
+    response = client.get("/api/ingredients/search?q=bas")
+    assert response.status_code == 200
+    assert [row["name"] for row in response.json()] == ["basil"]
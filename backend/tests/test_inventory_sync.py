@@ -0,0 +1,70 @@
+# backend/tests/test_inventory_sync.py
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def inventory(response) -> dict:
+    return {item["ingredient"]: (item["quantity"], item["unit"]) for item in response.json()}
+
+
+def test_upsert_and_remove_in_one_request(client, db):
+    ids = add_ingredients(db, "rice", "beans", "salt")
+    stock(db, 1, {ids["rice"]: (1, "kg"), ids["salt"]: (1, "box")})
+    stock(db, 2, {ids["rice"]: (5, "kg")})
+    db.commit()
+
+    response = client.post("/api/inventory/sync", json={
+        "upsert": [
+            {"ingredient_id": ids["rice"], "quantity": 2, "unit": "kg"},
+            {"ingredient_id": ids["beans"], "quantity": 400, "unit": "g"},
+            {"ingredient_id": ids["beans"], "quantity": 800, "unit": "g"},  # last one wins
+        ],
+        "remove": [ids["salt"]],
+    })
+
+    assert response.status_code == 200
+    assert inventory(response) == {"rice": (2, "kg"), "beans": (800, "g")}
+    # Only user 1 changed
+    user_2 = client.post("/api/inventory/sync?user_id=2", json={})
+    assert inventory(user_2) == {"rice": (5, "kg")}
+
+
+def test_replace_drops_everything_else(client, db):
+    ids = add_ingredients(db, "rice", "beans")
+    stock(db, 1, {ids["rice"]: (1, "kg"), ids["beans"]: (1, "can")})
+    db.commit()
+
+    response = client.post("/api/inventory/sync", json={
+        "upsert": [{"ingredient_id": ids["beans"], "quantity": 2, "unit": "can"}],
+        "replace": True,
+    })
+    assert inventory(response) == {"beans": (2, "can")}
+
+    emptied = client.post("/api/inventory/sync", json={"replace": True})
+    assert emptied.json() == []
+
+
+def test_invalid_sync_changes_nothing(client, db):
+    ids = add_ingredients(db, "rice")
+    stock(db, 1, {ids["rice"]: (1, "kg")})
+    db.commit()
+
+    conflict = client.post("/api/inventory/sync", json={
+        "upsert": [{"ingredient_id": ids["rice"]}], "remove": [ids["rice"]],
+    })
+    unknown = client.post("/api/inventory/sync", json={
+        "upsert": [{"ingredient_id": ids["rice"], "quantity": 3}, {"ingredient_id": 999}],
+    })
+
+    assert conflict.status_code == 400
+    assert unknown.status_code == 404 and "999" in unknown.json()["detail"]
+    assert inventory(client.post("/api/inventory/sync", json={})) == {"rice": (1, "kg")}
+
+
+def test_sync_invalidates_cached_suggestions(client, db):
+    ids = add_ingredients(db, "rice", "beans")
+    add_recipe(db, "Rice and beans", [ids["rice"], ids["beans"]])
+    db.commit()
+
+    assert client.get("/api/recipes/suggestions?max_missing=0").json() == []
+    client.post("/api/inventory/sync", json={"upsert": [{"ingredient_id": ids["rice"]}, {"ingredient_id": ids["beans"]}]})
+    assert [m["name"] for m in client.get("/api/recipes/suggestions?max_missing=0").json()] == ["Rice and beans"]
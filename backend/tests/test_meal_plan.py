@@ -0,0 +1,72 @@
+# backend/tests/test_meal_plan.py
+from app.services import meal_plan
+from app.services.meal_plan import greedy_plan
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def test_greedy_plan_prefers_shared_purchases():
+    candidates = {
+        1: (2, frozenset({10})),
+        2: (2, frozenset({10, 11})),
+        3: (2, frozenset({12, 13})),
+        4: (1, frozenset({11})),
+    }
+    plan = greedy_plan(candidates, 3)
+    # After 1, recipes 2 and 4 each add 11; 2 reuses more of the list
+    assert [recipe_id for recipe_id, _ in plan] == [1, 2, 4]
+    assert plan[2] == (4, set())
+
+
+def test_greedy_plan_stops_when_out_of_candidates():
+    assert greedy_plan({1: (0, frozenset())}, 5) == [(1, set())]
+    assert greedy_plan({}, 3) == []
+
+
+def test_meal_plan_endpoint_is_stable_across_cache_hits(client, db):
+    ids = add_ingredients(db, "rice", "beans", "onion", "chicken", "lime", "saffron")
+    add_recipe(db, "Rice and beans", [ids["rice"], ids["beans"], ids["onion"]], cooking_time=30, servings=4)
+    add_recipe(db, "Chicken rice", [ids["rice"], ids["chicken"], ids["onion"]], cooking_time=45, servings=4)
+    add_recipe(db, "Lime chicken", [ids["chicken"], ids["lime"]], cooking_time=20, servings=2)
+    add_recipe(db, "Paella", [ids["rice"], ids["saffron"], ids["chicken"], ids["lime"]], cooking_time=60, servings=6)
+    stock(db, 1, {ids["rice"]: (1, "kg"), ids["onion"]: (2, "pieces")})
+    db.commit()
+
+    first = client.get("/api/recipes/meal-plan?days=3")
+    second = client.get("/api/recipes/meal-plan?days=3")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    plan = first.json()
+    assert [recipe["name"] for recipe in plan["recipes"]] == ["Chicken rice", "Lime chicken", "Paella"]
+    assert sorted(item["name"] for item in plan["shopping_list"]) == ["chicken", "lime", "saffron"]
+    chicken = next(item for item in plan["shopping_list"] if item["name"] == "chicken")
+    assert len(chicken["recipe_ids"]) == 3
+
+
+def test_meal_plan_filters(client, db):
+    ids = add_ingredients(db, "rice", "beans", "chicken")
+    add_recipe(db, "Quick beans", [ids["rice"], ids["beans"]], cooking_time=15, servings=2)
+    add_recipe(db, "Slow chicken", [ids["rice"], ids["chicken"]], cooking_time=90, servings=8)
+    stock(db, 1, {ids["rice"]: (1, "kg")})
+    db.commit()
+
+    quick = client.get("/api/recipes/meal-plan?days=2&max_cooking_time=30").json()
+    assert [recipe["name"] for recipe in quick["recipes"]] == ["Quick beans"]
+    large = client.get("/api/recipes/meal-plan?days=2&servings=4").json()
+    assert [recipe["name"] for recipe in large["recipes"]] == ["Slow chicken"]
+
+
+def test_servings_filter_applies_before_the_candidate_cap(client, db, monkeypatch):
+    ids = add_ingredients(db, "rice", "beans", "chicken", "saffron")
+    add_recipe(db, "Rice", [ids["rice"]], servings=1)
+    add_recipe(db, "Rice and beans", [ids["rice"], ids["beans"]], servings=2)
+    add_recipe(db, "Paella", [ids["rice"], ids["chicken"], ids["saffron"]], servings=6)
+    add_recipe(db, "Chicken rice", [ids["rice"], ids["chicken"]])
+    stock(db, 1, {ids["rice"]: (1, "kg")})
+    db.commit()
+    # The two closest recipes serve too few and would fill the cap
+    monkeypatch.setattr(meal_plan, "MAX_CANDIDATES", 2)
+
+    plan = client.get("/api/recipes/meal-plan?days=2&servings=4").json()
+
+    assert [recipe["name"] for recipe in plan["recipes"]] == ["Chicken rice", "Paella"]
@@ -0,0 +1,62 @@
+# backend/tests/test_pagination.py
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.pagination import decode_cursor, encode_cursor
+from tests.helpers import add_ingredients, add_recipe
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("name", ["Pancakes", 7])
+    assert decode_cursor(cursor, "name") == ["Pancakes", 7]
+    assert decode_cursor("", "name") is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor([1, 2]),
+    raw_cursor({"s": "id"}),
+    raw_cursor({"s": "id", "k": 5}),
+    raw_cursor({"s": "id", "k": {"id": 5}}),
+    raw_cursor({"s": "id", "k": [[5]]}),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, "id")
+    assert error.value.status_code == 400
+
+
+def test_cursor_sort_must_match():
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor("id", [3]), "name")
+
+
+@pytest.mark.parametrize("sort", ["id", "name"])
+def test_recipe_pages_cover_every_row_once(client, db, sort):
+    ids = add_ingredients(db, "salt")
+    for i in range(7):
+        add_recipe(db, f"Recipe {(i * 3) % 7}", [ids["salt"]])
+    db.commit()
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = client.get("/api/recipes/", params={"cursor": cursor, "limit": 3, "sort": sort}).json()
+        seen += page["items"]
+        cursor = page["next_cursor"]
+
+    assert len(seen) == 7
+    key = "id" if sort == "id" else "name"
+    assert [recipe[key] for recipe in seen] == sorted(recipe[key] for recipe in seen)
+
+
+def test_bad_cursor_is_a_400_not_a_500(client):
+    for path in ("/api/recipes/", "/api/ingredients/", "/api/inventory/"):
+        response = client.get(path, params={"cursor": raw_cursor({"s": "id", "k": 5})})
+        assert response.status_code == 400
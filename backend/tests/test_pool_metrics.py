@@ -0,0 +1,60 @@
+# backend/tests/test_pool_metrics.py
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app import pool_metrics
+from app.database import engine_options
+from app.pool_metrics import InstrumentedQueuePool, instrument_engine, pool_stats
+
+
+@pytest.fixture
+def pooled_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(pool_metrics, "_registry", {})
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    instrument_engine(engine, "test")
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_waits_and_timeouts_are_counted(pooled_engine):
+    with pooled_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with pytest.raises(PoolTimeoutError):
+            pooled_engine.connect()
+
+    stats = pool_stats()["test"]
+    assert (stats["checkouts"], stats["checkins"], stats["connections_opened"]) == (1, 1, 1)
+    assert stats["checkout_timeouts"] == 1
+    assert stats["wait_ms"]["count"] == 2
+    assert stats["wait_ms"]["max"] >= 50
+    histogram = stats["wait_ms"]["histogram"]
+    assert histogram["le_+Inf"] == 2 and histogram["le_1"] <= histogram["le_100"]
+    assert (stats["size"], stats["checked_out"], stats["checked_in"]) == (1, 0, 1)
+
+
+def test_metrics_survive_dispose(pooled_engine):
+    with pooled_engine.connect():
+        pass
+    pooled_engine.dispose()
+    with pooled_engine.connect():
+        pass
+
+    stats = pool_stats()["test"]
+    assert stats["checkouts"] == 2
+    assert stats["connections_opened"] == 2
+
+
+def test_engine_options():
+    assert engine_options("sqlite:///x.db") == {}
+    options = engine_options("postgresql://localhost/recipes")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert {"pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping"} <= set(options)
+
+
+def test_metrics_endpoint(client):
+    body = client.get("/api/metrics/").json()
+    assert {"suggestion_cache", "single_flight", "db_pool", "startup"} <= set(body)
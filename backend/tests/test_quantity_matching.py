@@ -0,0 +1,112 @@
+# backend/tests/test_quantity_matching.py
+from app.services import quantity_matching
+from app.services.quantity_matching import find_quantity_matches_memory, find_shortfalls
+from app.services.recipe_index import RecipeIndex
+from app.services.recipe_snapshot import RecipeSnapshot, build_snapshot
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def test_insufficient_stock_is_a_shortfall(client, db):
+    ids = add_ingredients(db, "flour", "milk", "egg")
+    add_recipe(db, "Bread", {ids["flour"]: (500, "g")}, servings=2)
+    add_recipe(db, "Pancakes", {ids["flour"]: (100, "g"), ids["milk"]: (1, "cup"), ids["egg"]: (2, None)}, servings=2)
+    stock(db, 1, {ids["flour"]: (0.2, "kg"), ids["milk"]: (500, "ml"), ids["egg"]: (6, None)})
+    db.commit()
+
+    matches = client.get("/api/recipes/suggestions?check_quantities=true").json()
+
+    assert [(m["name"], m["missing_count"], m["match_percent"]) for m in matches] == [
+        ("Pancakes", 0, 100.0),
+        ("Bread", 1, 0.0),
+    ]
+    bread = matches[1]
+    assert bread["missing_ingredients"] == []
+    assert bread["shortfalls"] == [{
+        "ingredient_id": ids["flour"], "name": "flour", "unit": "g",
+        "needed": 500.0, "available": 200.0, "missing": 300.0,
+    }]
+
+
+def test_servings_scale_the_recipe(db):
+    ids = add_ingredients(db, "milk", "oats")
+    add_recipe(db, "Porridge", {ids["milk"]: (1, "cup"), ids["oats"]: (80, "g")}, servings=2)
+    stock(db, 1, {ids["milk"]: (300, "ml"), ids["oats"]: (1, "kg")})
+    db.commit()
+
+    assert find_quantity_matches_memory(db, 1, max_missing=0, limit=5)[0]["shortfalls"] == []
+    [porridge] = find_quantity_matches_memory(db, 1, max_missing=1, limit=5, servings=4)
+    assert porridge["missing_count"] == 1
+    assert [short["name"] for short in porridge["shortfalls"]] == ["milk"]
+    assert find_quantity_matches_memory(db, 1, max_missing=0, limit=5, servings=4) == []
+
+
+def test_quantity_lookup_is_chunked(db, monkeypatch):
+    names = [f"spice {i}" for i in range(7)]
+    ids = add_ingredients(db, *names)
+    for i in range(30):
+        add_recipe(db, f"Blend {i:02}", {ids[names[i % 7]]: (10, "g"), ids[names[(i + 3) % 7]]: (i, "g")})
+    stock(db, 1, {ids[name]: (12, "g") for name in names})
+    db.commit()
+
+    whole = find_quantity_matches_memory(db, 1, max_missing=1, limit=50)
+    monkeypatch.setattr(quantity_matching, "LOOKUP_CHUNK", 2)
+    chunked = find_quantity_matches_memory(db, 1, max_missing=1, limit=50)
+
+    assert chunked == whole
+    # Blends 0-12 need at most 12 g of each spice, the rest need more of one
+    assert [m["name"] for m in whole[:13]] == [f"Blend {i:02}" for i in range(13)]
+    assert all(m["missing_count"] == 1 and len(m["shortfalls"]) == 1 for m in whole[13:])
+    assert len(find_quantity_matches_memory(db, 1, max_missing=1, limit=5)) == 5
+
+
+def test_lookup_reads_only_candidates_stocked_ingredients(db, monkeypatch):
+    ids = add_ingredients(db, "salt", "oil", "flour", "saffron", "truffle")
+    add_recipe(db, "Bread", {ids["flour"]: (500, "g"), ids["salt"]: (5, "g"), ids["oil"]: (1, "tbsp")})
+    # Far from the inventory, but uses the same staples
+    add_recipe(db, "Risotto", {ids["saffron"]: (1, "g"), ids["truffle"]: (20, "g"), ids["salt"]: (2, "g")})
+    stock(db, 1, {ids["flour"]: (1, "kg"), ids["salt"]: (1, "g"), ids["oil"]: (None, None)})
+    db.commit()
+    lookups = []
+    real = quantity_matching.find_shortfalls
+    monkeypatch.setattr(quantity_matching, "find_shortfalls", lambda rows, *args: lookups.append(rows) or real(rows, *args))
+
+    [bread] = find_quantity_matches_memory(db, 1, max_missing=1, limit=5)
+
+    assert [short["name"] for short in bread["shortfalls"]] == ["salt"]
+    assert sorted((row[0], row[1]) for row in lookups[0]) == [(1, ids["salt"]), (1, ids["flour"])]
+
+
+def test_find_shortfalls_compares_within_a_dimension():
+    available = {1: ("mass", 100.0), 2: ("volume", 1000.0), 3: ("mass", 50.0)}
+    rows = [
+        (10, 1, 250, "g", 2),        # short
+        (10, 2, 2, "cups", 2),       # enough: 473 ml of 1 l
+        (11, 1, 2, "cups", None),    # volume against mass: can't compare
+        (11, 3, 1, "pinch", None),   # unknown unit
+        (12, 3, 40, "g", 2),         # enough as written, short for four
+    ]
+
+    assert find_shortfalls(rows, available, None) == {
+        10: [{"ingredient_id": 1, "unit": "g", "needed": 250.0, "available": 100.0, "missing": 150.0}],
+    }
+    assert find_shortfalls(rows, available, 4)[12] == [
+        {"ingredient_id": 3, "unit": "g", "needed": 80.0, "available": 50.0, "missing": 30.0},
+    ]
+
+
+def test_scores_and_match_rows_agree_with_match(db, tmp_path):
+    ids = add_ingredients(db, "a", "b", "c", "d")
+    add_recipe(db, "AB", [ids["a"], ids["b"]], description="two", cooking_time=10)
+    add_recipe(db, "ABC", [ids["a"], ids["b"], ids["c"]])
+    add_recipe(db, "CD", [ids["c"], ids["d"]], cooking_time=5)
+    db.commit()
+    inventory = [ids["a"], ids["b"], ids["c"]]
+
+    path = str(tmp_path / "recipes.snapshot")
+    build_snapshot(db, path)
+    for index in (RecipeIndex.load(db), RecipeSnapshot(path)):
+        expected = index.match(inventory, max_missing=1, limit=10)
+        scores = index.scores(inventory, max_missing=1)
+        assert sorted(recipe_id for _, recipe_id, _, _ in scores) == sorted(m["id"] for m in expected)
+        rows = index.match_rows(inventory, [(pos, matched) for pos, _, _, matched in scores])
+        assert sorted(rows, key=lambda m: m["id"]) == sorted(expected, key=lambda m: m["id"])
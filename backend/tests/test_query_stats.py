@@ -0,0 +1,41 @@
+# backend/tests/test_query_stats.py
+import pytest
+
+from app import query_stats
+from app.query_stats import QueryBudgetExceeded, statement_shape, track_queries
+from app.models.recipe import Ingredient
+from tests.helpers import add_ingredients, stock
+
+
+def test_statement_shape_collapses_parameters():
+    a = statement_shape("SELECT * FROM t WHERE id IN (?, ?, ?) AND name = 'x'")
+    b = statement_shape("SELECT *  FROM t WHERE id IN (?) AND name = 'yy'")
+    assert a == b == "SELECT * FROM t WHERE id IN (...) AND name = ?"
+
+
+def test_repeated_shapes_are_flagged(db):
+    ids = add_ingredients(db, "salt", "pepper", "onion", "garlic")
+    db.commit()
+    with track_queries() as stats:
+        for ingredient_id in ids.values():
+            db.get(Ingredient, ingredient_id)
+    assert stats.count == len(ids)
+    assert [n for _, n in stats.repeated(threshold=3)] == [len(ids)]
+
+
+def test_inventory_listing_has_no_n_plus_one(client, db):
+    ids = add_ingredients(db, *(f"ingredient {i}" for i in range(20)))
+    stock(db, 1, {ingredient_id: (1, "g") for ingredient_id in ids.values()})
+    db.commit()
+
+    for params in ("", "?cursor=", "?cursor=&sort=name"):
+        response = client.get(f"/api/inventory/{params}")
+        assert response.status_code == 200
+        assert response.headers["X-Query-Repeated"] == "0"
+        assert int(response.headers["X-Query-Count"]) <= 2
+
+
+def test_strict_budget_fails_the_request(client, monkeypatch):
+    monkeypatch.setattr(query_stats, "QUERY_BUDGET", 1)
+    with pytest.raises(QueryBudgetExceeded):
+        client.post("/api/ingredients/", json={"name": "salt"})
@@ -0,0 +1,76 @@
+# backend/tests/test_read_routing.py
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app import database, read_routing
+from app.database import Base
+from app.http_cache import catalog_versions
+from app.main import app
+from app.read_routing import COOKIE_NAME, RecentWrites
+from tests.helpers import add_ingredients, stock
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """A second database standing in for a replica that hasn't caught up"""
+    engine = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(database, "_read_engines", [engine])
+    monkeypatch.setattr(read_routing, "recent_writes", RecentWrites(read_routing.READ_AFTER_WRITE_WINDOW))
+    # No catalog change seen recently
+    monkeypatch.setattr(catalog_versions, "changed_at", None)
+    yield engine
+    engine.dispose()
+
+
+def inventory_names(client, **params) -> list:
+    return [item["ingredient"] for item in client.get("/api/inventory/", params=params).json()]
+
+
+def test_reads_go_to_the_replica(client, db, replica):
+    ids = add_ingredients(db, "rice")
+    stock(db, 1, {ids["rice"]: (1, "kg")})
+    db.commit()
+
+    assert inventory_names(client) == []  # the replica lags
+
+
+def test_writes_pin_the_client_to_the_primary(db, replica):
+    ids = add_ingredients(db, "rice", "beans")
+    stock(db, 2, {ids["beans"]: (1, "can")})
+    db.commit()
+    client = TestClient(app)
+
+    response = client.post("/api/inventory/", params={"ingredient_id": ids["rice"], "quantity": 1, "unit": "kg"})
+    assert response.status_code < 400
+    assert COOKIE_NAME in response.cookies
+
+    # The cookie keeps this client on the primary
+    assert inventory_names(client) == ["rice"]
+
+    # Without the cookie, the worker still remembers user 1 wrote...
+    assert inventory_names(TestClient(app)) == ["rice"]
+    # ...but not for other users, whose reads stay on the replica
+    assert inventory_names(TestClient(app), user_id=2) == []
+
+
+def test_read_only_posts_and_failed_writes_dont_pin(db, replica):
+    client = TestClient(app)
+
+    client.post("/api/recipes/suggestions/batch", json={"user_ids": [1]})
+    failed = client.post("/api/inventory/", params={"ingredient_id": 999})
+
+    assert failed.status_code >= 400
+    assert COOKIE_NAME not in client.cookies
+    assert not read_routing.recent_writes.active("1")
+
+
+def test_catalog_changes_pin_every_client(client, db, replica):
+    ids = add_ingredients(db, "rice")
+    stock(db, 1, {ids["rice"]: (1, "kg")})
+    db.commit()
+
+    catalog_versions.invalidate()  # what a catalog write does
+
+    assert inventory_names(client) == ["rice"]
@@ -0,0 +1,50 @@
+# backend/tests/test_recipe_detail.py
+import pytest
+
+from app.routers import recipes as recipes_router
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+@pytest.fixture
+def recipe(db) -> int:
+    ids = add_ingredients(db, "flour", "water", "yeast", "salt")
+    recipe_id = add_recipe(
+        db, "Bread",
+        {ids["flour"]: (500, "g"), ids["water"]: (350, "ml"), ids["yeast"]: (7, "g"), ids["salt"]: (None, None)},
+        description="Basic loaf", cooking_time=45, servings=8,
+    )
+    stock(db, 1, {ids["flour"]: (1, "kg"), ids["water"]: (1, "l")})
+    db.commit()
+    return recipe_id
+
+
+def test_detail_is_one_query(client, recipe):
+    client.get(f"/api/recipes/{recipe}/detail")  # loads the catalog versions for the ETag
+    response = client.get(f"/api/recipes/{recipe}/detail")
+
+    assert response.status_code == 200
+    assert response.headers["X-Query-Count"] == "1"
+    body = response.json()
+    assert (body["name"], body["servings"]) == ("Bread", 8)
+    assert [(i["name"], i["quantity"], i["unit"]) for i in body["ingredients"]] == [
+        ("flour", 500.0, "g"), ("water", 350.0, "ml"), ("yeast", 7.0, "g"), ("salt", None, None),
+    ]
+    assert client.get("/api/recipes/999/detail").status_code == 404
+
+
+@pytest.mark.parametrize("path", [
+    "/api/recipes/{recipe}/detail",
+    "/api/recipes/suggestions?max_missing=2",
+    "/api/recipes/suggestions?check_quantities=true&max_missing=2",
+    "/api/recipes/search?q=bread",
+])
+def test_fast_json_matches_the_validated_response(client, recipe, monkeypatch, path):
+    path = path.format(recipe=recipe)
+    validated = client.get(path)
+
+    monkeypatch.setattr(recipes_router, "FAST_JSON", True)
+    fast = client.get(path)
+
+    assert fast.status_code == validated.status_code == 200
+    assert fast.json() == validated.json()
+    assert fast.headers.get("etag") == validated.headers.get("etag")
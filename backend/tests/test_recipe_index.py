@@ -0,0 +1,67 @@
+# backend/tests/test_recipe_index.py
+import random
+
+from app.services.recipe_index import RecipeIndex
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def expected_matches(recipes: dict, inventory: set, max_missing: int, limit: int) -> list:
+    """The ranking the SQL query produces, computed the slow way"""
+    rows = []
+    for recipe_id, ingredients in recipes.items():
+        matched = sum(1 for ing_id in ingredients if ing_id in inventory)
+        missing = len(ingredients) - matched
+        if missing <= max_missing:
+            percent = int(matched / len(ingredients) * 100 + 0.5)
+            rows.append((-percent, missing, recipe_id, matched))
+    return [(recipe_id, matched, -neg_percent) for neg_percent, _, recipe_id, matched in sorted(rows)[:limit]]
+
+
+def test_bitset_scores_match_a_brute_force_ranking():
+    rng = random.Random(7)
+    recipes = {}
+    index = RecipeIndex()
+    for recipe_id in range(1, 301):
+        ingredients = [rng.randrange(1, 60) for _ in range(rng.randint(1, 9))]  # duplicates included
+        recipes[recipe_id] = ingredients
+        index.add_recipe(recipe_id, f"Recipe {recipe_id}", None, None, [(i, f"ing {i}") for i in ingredients])
+
+    for _ in range(50):
+        inventory = set(rng.sample(range(1, 70), rng.randint(0, 40)))
+        max_missing = rng.randint(0, 5)
+        got = index.match(inventory, max_missing=max_missing, limit=15)
+        assert [(m["id"], m["matched_ingredients"], m["match_percent"]) for m in got] == \
+            expected_matches(recipes, inventory, max_missing, 15)
+        for match in got:
+            assert match["missing_ingredients"] == [
+                f"ing {i}" for i in sorted(recipes[match["id"]]) if i not in inventory
+            ]
+
+
+def test_add_recipe_replaces_and_removes():
+    index = RecipeIndex()
+    index.add_recipe(1, "Toast", None, 5, [(1, "bread"), (2, "butter")])
+    index.add_recipe(1, "Toast", "Plain", 3, [(1, "bread")])
+
+    [toast] = index.match({1}, max_missing=0)
+    assert (toast["description"], toast["cooking_time"], toast["total_ingredients"]) == ("Plain", 3, 1)
+    assert index.match({2}, max_missing=0) == []
+
+    index.add_recipe(1, "Toast", None, None, [])
+    assert index.match({1}, max_missing=0) == []
+
+
+def test_suggestions_from_the_memory_engine(client, db):
+    ids = add_ingredients(db, "pasta", "tomato", "basil", "cheese")
+    add_recipe(db, "Pasta al pomodoro", [ids["pasta"], ids["tomato"], ids["basil"]], cooking_time=20)
+    add_recipe(db, "Cheese pasta", [ids["pasta"], ids["cheese"]], cooking_time=15)
+    add_recipe(db, "Caprese", [ids["tomato"], ids["basil"], ids["cheese"]])
+    stock(db, 1, {ids["pasta"]: (500, "g"), ids["tomato"]: (4, None)})
+    db.commit()
+
+    matches = client.get("/api/recipes/suggestions?max_missing=1").json()
+
+    assert [(m["name"], m["match_percent"], m["missing_ingredients"]) for m in matches] == [
+        ("Pasta al pomodoro", 67.0, ["basil"]),
+        ("Cheese pasta", 50.0, ["cheese"]),
+    ]
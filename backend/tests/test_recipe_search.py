@@ -0,0 +1,55 @@
+# backend/tests/test_recipe_search.py
+from app.services.recipe_search import parse_query, tokenize
+from tests.helpers import add_ingredients, add_recipe
+
+
+def names(response) -> list:
+    assert response.status_code == 200
+    return [result["name"] for result in response.json()]
+
+
+def catalog(db) -> dict:
+    ids = add_ingredients(db, "onion", "beef", "bread")
+    add_recipe(db, "French onion soup", [ids["onion"], ids["bread"]], cooking_time=70,
+               description="Slow caramelised onions under a cheese crust")
+    add_recipe(db, "Beef stew", [ids["beef"], ids["onion"]], cooking_time=150,
+               description="Hearty and slow", instructions="Brown the beef, add onions and simmer")
+    add_recipe(db, "Quick soup", [ids["bread"]], cooking_time=15, description="Soup from the pantry")
+    db.commit()
+    return ids
+
+
+def test_name_matches_rank_above_instruction_matches(client, db):
+    catalog(db)
+
+    response = client.get("/api/recipes/search?q=onion")
+
+    assert names(response) == ["French onion soup", "Beef stew"]
+    first, second = response.json()
+    assert first["rank"] > second["rank"]
+    assert "<mark>onions</mark>" in first["snippet"]
+
+
+def test_terms_exclusions_and_filters(client, db):
+    ids = catalog(db)
+
+    assert names(client.get("/api/recipes/search?q=slow onion")) == ["French onion soup", "Beef stew"]
+    assert names(client.get("/api/recipes/search?q=soup -onion")) == ["Quick soup"]
+    assert names(client.get(f"/api/recipes/search?q=soup&ingredient_id={ids['onion']}")) == ["French onion soup"]
+    assert names(client.get("/api/recipes/search?q=soup&max_cooking_time=30")) == ["Quick soup"]
+    assert names(client.get("/api/recipes/search?q=the")) == []
+    assert client.get("/api/recipes/search?q=").status_code == 422
+
+
+def test_new_recipes_are_searchable(client, db):
+    ids = catalog(db)
+    assert names(client.get("/api/recipes/search?q=dumplings")) == []
+
+    client.post("/api/recipes/", json={"name": "Beef dumplings", "ingredients": [{"ingredient_id": ids["beef"]}]})
+
+    assert names(client.get("/api/recipes/search?q=dumpling")) == ["Beef dumplings"]
+
+
+def test_query_parsing():
+    assert tokenize("The Onions and Berries") == ["onion", "berry"]
+    assert parse_query('"red onion" -garlic') == ({"red", "onion"}, {"garlic"})
@@ -0,0 +1,94 @@
+# backend/tests/test_recipe_snapshot.py
+import threading
+import time
+
+import pytest
+
+from app.http_cache import RECIPES, bump_catalog_version
+from app.services import recipe_index, recipe_snapshot
+from app.services.recipe_index import RecipeIndex
+from app.services.recipe_snapshot import RecipeSnapshot, build_snapshot
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(recipe_snapshot, "RECIPE_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(recipe_index, "RECIPE_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(recipe_snapshot, "REFRESH_DELAY", 0.2)
+    recipe_snapshot.invalidate_snapshot()
+    yield tmp_path
+    wait_for_refresh()
+    recipe_snapshot.invalidate_snapshot()
+
+
+def wait_for_refresh(timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while recipe_snapshot._refresh_running:
+        assert time.monotonic() < deadline, "snapshot refresh didn't finish"
+        time.sleep(0.01)
+
+
+def catalog(db) -> dict:
+    ids = add_ingredients(db, "rice", "beans", "onion", "garlic", "lime", "salt")
+    add_recipe(db, "Rice", [ids["rice"]], cooking_time=20, servings=2)
+    add_recipe(db, "Rice and beans", [ids["rice"], ids["beans"], ids["onion"]], description="Filling")
+    add_recipe(db, "Garlic rice", [ids["rice"], ids["garlic"], ids["garlic"]], cooking_time=25)
+    add_recipe(db, "Lime beans", [ids["beans"], ids["lime"], ids["salt"], ids["onion"]])
+    add_recipe(db, "Everything", list(ids.values()))
+    db.commit()
+    return ids
+
+
+def test_snapshot_matches_like_the_index(db, tmp_path):
+    ids = catalog(db)
+    path = str(tmp_path / "recipes.csr")
+    build_snapshot(db, path)
+    snapshot, index = RecipeSnapshot(path), RecipeIndex.load(db)
+
+    for inventory in ([], [ids["rice"]], [ids["rice"], ids["beans"], ids["onion"]], list(ids.values())):
+        for max_missing in range(4):
+            assert snapshot.match(inventory, max_missing, limit=10) == index.match(inventory, max_missing, limit=10)
+            assert sorted(snapshot.near_misses(inventory, max_missing)) == sorted(index.near_misses(inventory, max_missing))
+            assert sorted(snapshot.missing_by_recipe(inventory, max_missing)) == sorted(index.missing_by_recipe(inventory, max_missing))
+
+
+def test_create_recipe_refreshes_in_the_background(client, db, snapshot_dir, monkeypatch):
+    ids = catalog(db)
+    stock(db, 1, {ids["lime"]: (None, None)})
+    db.commit()
+
+    first = client.get("/api/recipes/suggestions?max_missing=0").json()
+    assert [match["name"] for match in first] == []
+
+    built_by = []
+    build = recipe_snapshot.build_snapshot
+    monkeypatch.setattr(
+        recipe_snapshot, "build_snapshot",
+        lambda *args: built_by.append(threading.current_thread().name) or build(*args)
+    )
+
+    for name in ("Lime water", "Lime ice"):
+        response = client.post("/api/recipes/", json={"name": name, "ingredients": [{"ingredient_id": ids["lime"]}]})
+        assert response.status_code == 201
+    assert built_by == []  # not inside the POSTs
+
+    wait_for_refresh()
+    assert built_by == ["recipe-snapshot-refresh"]  # both writes, one rebuild
+    after = client.get("/api/recipes/suggestions?max_missing=0").json()
+    assert sorted(match["name"] for match in after) == ["Lime ice", "Lime water"]
+
+
+def test_stale_reader_keeps_the_old_mapping(db, snapshot_dir):
+    ids = catalog(db)
+    old = recipe_index.get_recipe_index(db)
+
+    add_recipe(db, "Plain salt", [ids["salt"]])
+    bump_catalog_version(db, RECIPES)
+    db.commit()
+
+    assert recipe_index.get_recipe_index(db) is old
+    wait_for_refresh()
+    new = recipe_index.get_recipe_index(db)
+    assert new is not old and new.version > old.version
+    assert [m["name"] for m in new.match([ids["salt"]], max_missing=0)] == ["Plain salt"]
@@ -0,0 +1,47 @@
+# backend/tests/test_recipe_summary.py
+from sqlalchemy import delete, select
+
+from app.models.recipe import RecipeIngredient, RecipeSummary
+from app.services.recipe_summary import refresh_recipe_summaries
+from tests.helpers import add_ingredients, add_recipe
+
+
+def summaries(db) -> dict:
+    return {
+        row.recipe_id: (row.total_ingredients, list(row.ingredient_ids), row.cooking_time)
+        for row in db.scalars(select(RecipeSummary))
+    }
+
+
+def test_create_recipe_writes_its_summary(client, db):
+    ids = add_ingredients(db, "onion", "garlic", "butter")
+    db.commit()
+
+    response = client.post("/api/recipes/", json={
+        "name": "Garlic butter",
+        "cooking_time": 5,
+        "ingredients": [{"ingredient_id": ids["butter"]}, {"ingredient_id": ids["garlic"]}],
+    })
+
+    assert summaries(db) == {
+        response.json()["id"]: (2, sorted([ids["butter"], ids["garlic"]]), 5),
+    }
+
+
+def test_refresh_replaces_only_the_given_recipes(db):
+    ids = add_ingredients(db, "a", "b", "c")
+    first = add_recipe(db, "First", [ids["a"], ids["b"]])
+    second = add_recipe(db, "Second", [ids["c"]], cooking_time=10)
+
+    db.execute(delete(RecipeIngredient).where(RecipeIngredient.recipe_id == first))
+    db.add(RecipeIngredient(recipe_id=second, ingredient_id=ids["a"]))
+    db.flush()
+    refresh_recipe_summaries(db, [first])
+
+    # First lost its ingredients and drops out; Second isn't refreshed yet
+    assert summaries(db) == {second: (1, [ids["c"]], 10)}
+
+    refresh_recipe_summaries(db)
+    assert summaries(db) == {second: (2, sorted([ids["a"], ids["c"]]), 10)}
+    refresh_recipe_summaries(db, [])
+    assert len(summaries(db)) == 1
@@ -0,0 +1,69 @@
+# backend/tests/test_shopping_list.py
+from app.services.shopping_list import build_shopping_list
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def by_name(items) -> dict:
+    return {item["name"]: item for item in items}
+
+
+def test_amounts_are_merged_across_units_and_recipes(db):
+    ids = add_ingredients(db, "milk", "flour", "salt", "saffron", category="pantry")
+    pancakes = add_recipe(db, "Pancakes", {ids["milk"]: (2, "cups"), ids["flour"]: (200, "g"), ids["salt"]: (None, None)}, servings=4)
+    sauce = add_recipe(db, "Sauce", {ids["milk"]: (8, "tbsp"), ids["saffron"]: (1, "pinch")}, servings=2)
+    stock(db, 1, {ids["flour"]: (1, "kg"), ids["salt"]: (1, "box"), ids["milk"]: (1, "cup")})
+    db.commit()
+
+    shopping = build_shopping_list(db, [(pancakes, None, 1), (sauce, None, 1)])
+
+    items, covered = by_name(shopping["items"]), by_name(shopping["covered"])
+    assert sorted(items) == ["milk", "saffron"] and sorted(covered) == ["flour", "salt"]
+    assert items["milk"]["needed"] == [{"quantity": 2.5, "unit": "cups"}]
+    assert items["milk"]["to_buy"] == [{"quantity": 1.5, "unit": "cups"}]
+    assert items["milk"]["recipe_ids"] == [pancakes, sauce]
+    # Unknown units are summed as they are and bought whole without stock
+    assert items["saffron"]["to_buy"] == [{"quantity": 1.0, "unit": "pinch"}]
+    assert covered["salt"]["needed"] == [{"quantity": None, "unit": None}]
+
+
+def test_stock_in_another_dimension_is_bought_in_full(db):
+    ids = add_ingredients(db, "flour", "sugar")
+    cake = add_recipe(db, "Cake", {ids["flour"]: (2, "cups"), ids["sugar"]: (100, "g")})
+    stock(db, 1, {ids["flour"]: (100, "g"), ids["sugar"]: (1, "bag")})
+    db.commit()
+
+    shopping = build_shopping_list(db, [(cake, None, 1)])
+
+    [flour] = shopping["items"]
+    assert flour["to_buy"] == [{"quantity": 2.0, "unit": "cups"}]
+    assert flour["in_inventory"] and flour["unit_mismatch"]
+    # A bag of unknown size still counts as having it
+    [sugar] = shopping["covered"]
+    assert sugar["name"] == "sugar" and not sugar["unit_mismatch"]
+
+
+def test_servings_and_multipliers_scale(db):
+    ids = add_ingredients(db, "rice")
+    recipe = add_recipe(db, "Rice", {ids["rice"]: (100, "g")}, servings=2)
+    db.commit()
+
+    shopping = build_shopping_list(db, [(recipe, 6, 1), (recipe, None, 2.5)])
+
+    # 3x for six servings, plus 2.5x the recipe as written
+    assert shopping["items"][0]["needed"] == [{"quantity": 550.0, "unit": "g"}]
+
+
+def test_shopping_list_endpoint(client, db):
+    ids = add_ingredients(db, "eggs", "bacon")
+    recipe = add_recipe(db, "Bacon and eggs", {ids["eggs"]: (2, None), ids["bacon"]: (100, "g")})
+    stock(db, 1, {ids["eggs"]: (12, None)})
+    db.commit()
+
+    response = client.post("/api/recipes/shopping-list", json={"recipes": [{"recipe_id": recipe}, {"recipe_id": 404}]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["name"] for item in body["items"]] == ["bacon"]
+    assert [item["name"] for item in body["covered"]] == ["eggs"]
+    assert body["unknown_recipe_ids"] == [404]
+    assert client.post("/api/recipes/shopping-list", json={"recipes": []}).status_code == 422
@@ -0,0 +1,92 @@
+# backend/tests/test_similarity.py
+import threading
+import time
+
+from app.services import similarity
+from app.services.similarity import SimilarityIndex, get_similarity_index, index_recipe_similarity
+from app.startup import warmup_steps
+from tests.helpers import add_ingredients, add_recipe
+
+
+def exact_jaccard(a, b) -> float:
+    return len(a & b) / len(a | b)
+
+
+def test_near_duplicates_are_found_and_ranked_exactly():
+    index = SimilarityIndex(bands=32, rows=3)
+    base = set(range(1, 11))
+    index.add(1, base)
+    index.add(2, base - {10} | {11})      # 9 of 11 shared
+    index.add(3, base - {9, 10} | {12})   # 8 of 11
+    index.add(4, {100, 101, 102})         # nothing shared
+
+    neighbours = index.similar(1, k=5)
+
+    assert [recipe_id for recipe_id, _, _ in neighbours] == [2, 3]
+    assert neighbours[0] == (2, exact_jaccard(base, base - {10} | {11}), 9)
+    assert index.similar(4) == []
+    assert index.similar(99) == []
+
+
+def test_replacing_a_recipe_moves_its_buckets():
+    index = SimilarityIndex(bands=8, rows=2)
+    index.add(1, {1, 2, 3})
+    index.add(2, {1, 2, 3})
+    index.add(2, {7, 8, 9})
+
+    assert index.similar(1) == []
+    index.add(2, [])
+    assert 2 not in index.signatures
+    assert all(2 not in bucket for band in index.buckets for bucket in band.values())
+
+
+def test_similar_endpoint(client, db):
+    ids = add_ingredients(db, "rice", "beans", "onion", "garlic", "flour")
+    first = add_recipe(db, "Rice and beans", [ids["rice"], ids["beans"], ids["onion"]])
+    second = add_recipe(db, "Rice, beans, garlic", [ids["rice"], ids["beans"], ids["onion"], ids["garlic"]])
+    add_recipe(db, "Bread", [ids["flour"]])
+    db.commit()
+
+    response = client.get(f"/api/recipes/{first}/similar")
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": second, "name": "Rice, beans, garlic", "description": None, "cooking_time": None,
+        "similarity": 0.75, "shared_ingredients": 3,
+    }]
+    assert client.get("/api/recipes/9999/similar").status_code == 404
+
+
+def test_index_is_built_at_startup(db):
+    steps = dict(warmup_steps())
+    assert similarity._index is None
+
+    steps["similarity_index"]()
+
+    assert similarity._index is not None
+
+
+def test_stale_index_is_served_while_it_rebuilds(db, monkeypatch):
+    ids = add_ingredients(db, "a", "b", "c")
+    add_recipe(db, "AB", [ids["a"], ids["b"]])
+    db.commit()
+    old = get_similarity_index(db)
+
+    # Hold the rebuild until the test lets it finish
+    release = threading.Event()
+    load = SimilarityIndex.load
+    monkeypatch.setattr(SimilarityIndex, "load", classmethod(lambda cls, db: release.wait(5) and load(db)))
+    monkeypatch.setattr(similarity, "MATCHING_INDEX_TTL", 1)
+    old.loaded_at -= 2
+
+    assert get_similarity_index(db) is old  # returned at once, not rebuilt inline
+    # Created after the rebuild started; the new index must keep it
+    index_recipe_similarity(42, [ids["a"], ids["b"], ids["c"]])
+    release.set()
+
+    deadline = time.monotonic() + 5
+    while similarity._index is old:
+        assert time.monotonic() < deadline, "rebuild didn't finish"
+        time.sleep(0.01)
+    new = similarity._index
+    assert 42 in new.signatures and len(new.signatures) == 2
+    assert not similarity._is_stale(new)
@@ -0,0 +1,146 @@
+# backend/tests/test_single_flight.py
+import threading
+import time
+
+import pytest
+
+from app.services import single_flight
+from app.services.single_flight import FileLockService, SingleFlight
+from app.services.suggestion_cache import suggestion_cache
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def run_concurrently(n, target):
+    results = [None] * n
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, target())) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_calls_share_one_computation():
+    flights = SingleFlight(timeout=5)
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return ["result"]
+
+    threads, results = run_concurrently(5, lambda: flights.do("key", compute))
+    while flights.stats()["calls"] < 5:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [["result"]] * 5
+    assert len(calls) == 1
+    stats = flights.stats()
+    assert (stats["computations"], stats["coalesced"], stats["in_flight"]) == (1, 4, 0)
+
+
+def test_waiters_see_the_leaders_error():
+    flights = SingleFlight(timeout=5)
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    leader = threading.Thread(target=lambda: pytest.raises(ValueError, flights.do, "key", fail))
+    leader.start()
+    started.wait(5)
+    with pytest.raises(ValueError):
+        flights.do("key", lambda: "never run")
+    leader.join()
+    assert flights.stats()["errors"] == 1
+
+
+def test_published_results_are_only_fetched_when_fresh(tmp_path):
+    locks = FileLockService(str(tmp_path), timeout=5)
+    before = time.time()
+    locks.publish("key", [{"id": 1}], started=before)
+
+    assert locks.fetch("key", finished_after=before, started_after=before) == [{"id": 1}]
+    assert locks.fetch("key", finished_after=time.time() + 1, started_after=0) is None
+    assert locks.fetch("key", finished_after=0, started_after=before + 1) is None
+    assert locks.fetch("other", finished_after=0, started_after=0) is None
+
+
+def test_threads_of_one_worker_exclude_each_other_on_a_shared_key(tmp_path):
+    flights = SingleFlight(timeout=5, locks=FileLockService(str(tmp_path), timeout=5))
+    release = threading.Event()
+    calls = []
+
+    def compute(name):
+        calls.append(name)
+        release.wait(5)
+        return [name]
+
+    # Local keys differ (say, the user's generation moved on); the shared key doesn't
+    first = threading.Thread(target=lambda: flights.do(("key", 1), lambda: compute("first"), shared_key="shared"))
+    first.start()
+    while not calls:
+        time.sleep(0.01)
+    threads, results = run_concurrently(1, lambda: flights.do(("key", 2), lambda: compute("second"), shared_key="shared"))
+    time.sleep(0.2)
+
+    assert calls == ["first"]  # still waiting for the lock
+    release.set()
+    first.join()
+    threads[0].join()
+    assert results == [["first"]]
+    assert flights.stats()["coalesced_across_workers"] == 1
+    assert flights.locks._local == {}
+
+
+def test_lock_times_out_for_another_thread(tmp_path):
+    locks = FileLockService(str(tmp_path), timeout=5)
+    assert locks.acquire("key", timeout=1)
+
+    threads, results = run_concurrently(1, lambda: locks.acquire("key", timeout=0.1))
+    threads[0].join()
+    locks.release("key")
+
+    assert results == [False]
+    assert locks.acquire("key", timeout=0.1)
+    locks.release("key")
+
+
+class OtherWorker(FileLockService):
+    """Lock service where another worker already published every result"""
+
+    def __init__(self, directory, value):
+        super().__init__(directory, timeout=5)
+        self.value = value
+        self.fetches = 0
+
+    def fetch(self, key, finished_after, started_after):
+        self.fetches += 1
+        return self.value
+
+
+def test_result_from_another_worker_is_cached_locally(client, db, tmp_path, monkeypatch):
+    ids = add_ingredients(db, "rice")
+    add_recipe(db, "Rice", [ids["rice"]])
+    stock(db, 1, {ids["rice"]: (1, "kg")})
+    db.commit()
+
+    shared = [{
+        "id": 99, "name": "From another worker", "description": None, "cooking_time": None,
+        "total_ingredients": 1, "matched_ingredients": 1, "missing_count": 0,
+        "match_percent": 100.0, "missing_ingredients": [],
+    }]
+    locks = OtherWorker(str(tmp_path), shared)
+    monkeypatch.setattr(single_flight.suggestion_flights, "locks", locks)
+
+    first = client.get("/api/recipes/suggestions")
+    hits = suggestion_cache.stats()["hits"]
+    second = client.get("/api/recipes/suggestions")
+
+    assert first.json() == second.json() == [{**shared[0], "shortfalls": []}]
+    assert locks.fetches == 1
+    assert suggestion_cache.stats()["hits"] == hits + 1
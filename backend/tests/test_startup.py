@@ -0,0 +1,58 @@
+# backend/tests/test_startup.py
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main
+from app import startup
+from app.main import app as application
+from app.startup import StartupState
+
+
+@pytest.fixture
+def state(monkeypatch):
+    state = StartupState()
+    monkeypatch.setattr(startup, "startup_state", state)
+    monkeypatch.setattr(app.main, "startup_state", state)
+    return state
+
+
+def test_import_does_not_touch_the_database():
+    env = dict(os.environ, DATABASE_URL="postgresql://nobody@127.0.0.1:1/nothing")
+    code = "import app.main, app.database as d; assert d._engine is None"
+    subprocess.run([sys.executable, "-c", code], check=True, env=env, cwd=os.path.dirname(os.path.dirname(__file__)), timeout=60)
+
+
+def test_lifespan_warms_up_every_step(state):
+    with TestClient(application) as client:
+        ready = client.get("/health/ready")
+
+    assert ready.status_code == 200
+    assert state.completed == {name for name, _ in startup.warmup_steps()}
+    assert {"recipe_index", "similarity_index"} <= set(state.timings_ms)
+    assert "startup_total" in state.timings_ms
+
+
+def test_failed_step_is_retried_by_the_readiness_probe(state, monkeypatch, client):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("index not reachable")
+
+    monkeypatch.setattr(startup, "warmup_steps", lambda: [("database_pool", startup.warm_pool), ("flaky", flaky)])
+    asyncio.run(state.warm_up())
+
+    assert not state.warmed_up
+    assert state.errors == {"flaky": "RuntimeError: index not reachable"}
+
+    ready = client.get("/health/ready")
+    assert ready.status_code == 200
+    assert ready.json()["checks"] == {"database": "ok", "warm_up": "ok"}
+    assert len(attempts) == 2 and state.errors == {}
+    assert client.get("/health/live").json() == {"status": "healthy"}
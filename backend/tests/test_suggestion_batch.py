@@ -0,0 +1,45 @@
+# backend/tests/test_suggestion_batch.py
+import json
+
+from app.services.suggestion_cache import suggestion_cache
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def test_batch_streams_one_line_per_user(client, db):
+    ids = add_ingredients(db, "eggs", "milk", "flour", "bacon")
+    add_recipe(db, "Pancakes", [ids["eggs"], ids["milk"], ids["flour"]])
+    add_recipe(db, "Bacon and eggs", [ids["bacon"], ids["eggs"]])
+    stock(db, 1, {ids["eggs"]: (6, None), ids["milk"]: (1, "l")})
+    stock(db, 2, {ids["bacon"]: (200, "g")})
+    db.commit()
+
+    response = client.post("/api/recipes/suggestions/batch", json={"user_ids": [2, 3, 1, 2], "max_missing": 1})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["user_id"] for line in lines] == [1, 2, 3]
+    for line in lines:
+        single = client.get(f"/api/recipes/suggestions?max_missing=1&user_id={line['user_id']}").json()
+        assert line["suggestions"] == single
+    assert [m["name"] for m in lines[0]["suggestions"]] == ["Pancakes", "Bacon and eggs"]
+    assert lines[2]["suggestions"] == []
+
+
+def test_batch_fills_and_reuses_the_cache(client, db):
+    ids = add_ingredients(db, "rice")
+    add_recipe(db, "Rice", [ids["rice"]])
+    stock(db, 1, {ids["rice"]: (1, "kg")})
+    db.commit()
+
+    client.post("/api/recipes/suggestions/batch", json={"user_ids": [1], "max_missing": 2, "limit": 10})
+    hits = suggestion_cache.stats()["hits"]
+    client.get("/api/recipes/suggestions")
+    client.post("/api/recipes/suggestions/batch", json={"user_ids": [1]})
+
+    assert suggestion_cache.stats()["hits"] == hits + 2
+
+
+def test_batch_validates_the_request(client):
+    assert client.post("/api/recipes/suggestions/batch", json={"user_ids": []}).status_code == 422
+    assert client.post("/api/recipes/suggestions/batch", json={"user_ids": [1], "limit": 51}).status_code == 422
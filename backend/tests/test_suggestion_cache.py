@@ -0,0 +1,79 @@
+# backend/tests/test_suggestion_cache.py
+import time
+
+from app.services import suggestion_cache as cache_module
+from app.services.suggestion_cache import SuggestionCache
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def test_lru_eviction_and_ttl():
+    cache = SuggestionCache(max_size=2, ttl=0.05)
+    for user_id in (1, 2, 3):
+        cache.put((user_id, 2, 10), [user_id], cache.generation(user_id))
+    assert cache.get((1, 2, 10)) is None
+    assert cache.get((3, 2, 10)) == [3]
+    assert cache.stats()["evictions"] == 1
+
+    time.sleep(0.06)
+    assert cache.get((3, 2, 10)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_values_are_returned_unchanged():
+    cache = SuggestionCache()
+    report = {"ingredients": [], "pairs": []}
+    cache.put((1, "unlocks", 10, True), report, cache.generation(1))
+    assert cache.get((1, "unlocks", 10, True)) == report
+
+
+def test_result_computed_before_an_invalidation_is_not_stored():
+    cache = SuggestionCache()
+    before = cache.generation(1)
+    cache.invalidate_user(1)
+    cache.put((1, 2, 10), ["stale"], before)
+    assert cache.get((1, 2, 10)) is None
+
+    cache.put((2, 2, 10), ["other user"], cache.generation(2))
+    cache.invalidate_user(1)
+    assert cache.get((2, 2, 10)) == ["other user"]
+
+    before = cache.generation(2)
+    cache.invalidate_all()
+    cache.put((2, 2, 10), ["stale"], before)
+    assert cache.get((2, 2, 10)) is None
+
+
+def test_idle_users_are_forgotten(monkeypatch):
+    monkeypatch.setattr(cache_module, "MAX_TRACKED_USERS", 10)
+    cache = SuggestionCache(max_size=4)
+    cache.put((0, 2, 10), ["kept"], cache.generation(0))
+    stale = {user_id: cache.generation(user_id) for user_id in range(100)}
+
+    for user_id in range(1, 100):
+        cache.invalidate_user(user_id)
+    assert cache.stats()["tracked_users"] <= 10
+
+    # Forgetting a user must not make an old generation current again
+    for user_id in range(1, 100):
+        cache.put((user_id, 2, 10), ["stale"], stale[user_id])
+        assert cache.get((user_id, 2, 10)) is None
+    assert cache.get((0, 2, 10)) == ["kept"]
+    cache.put((5, 2, 10), ["fresh"], cache.generation(5))
+    assert cache.get((5, 2, 10)) == ["fresh"]
+
+
+def test_repeat_suggestions_skip_the_database_until_the_inventory_changes(client, db):
+    ids = add_ingredients(db, "egg", "flour", "milk")
+    add_recipe(db, "Pancakes", [ids["egg"], ids["flour"], ids["milk"]])
+    stock(db, 1, {ids["egg"]: (6, "pieces"), ids["flour"]: (1, "kg")})
+    db.commit()
+
+    first = client.get("/api/recipes/suggestions")
+    repeat = client.get("/api/recipes/suggestions")
+    assert first.json() == repeat.json()
+    assert first.json()[0]["missing_ingredients"] == ["milk"]
+    assert repeat.headers["X-Query-Count"] == "0"
+
+    client.post(f"/api/inventory/?ingredient_id={ids['milk']}&quantity=1&unit=l")
+    after = client.get("/api/recipes/suggestions").json()
+    assert after[0]["missing_ingredients"] == []
@@ -0,0 +1,37 @@
+# backend/tests/test_unlocks.py
+from app.services.unlocks import rank_unlocks
+from tests.helpers import add_ingredients, add_recipe, stock
+
+
+def test_rank_unlocks_counts_singles_and_pairs():
+    singles, pairs = rank_unlocks([[1], [1], [2], [2, 3], [3]], k=3)
+    assert singles == [(1, 2), (2, 1), (3, 1)]
+    # {2, 3} completes [2], [2, 3] and [3]; ties go to the lower IDs
+    assert pairs[0] == ((1, 2), 3)
+    assert ((2, 3), 3) in pairs
+
+
+def test_rank_unlocks_without_pairs():
+    singles, pairs = rank_unlocks([[5], [4], [4]], k=1, include_pairs=False)
+    assert singles == [(4, 2)]
+    assert pairs == []
+
+
+def test_unlocks_endpoint_is_stable_across_cache_hits(client, db):
+    ids = add_ingredients(db, "pasta", "tomato", "basil", "garlic", "cheese")
+    add_recipe(db, "Pasta al pomodoro", [ids["pasta"], ids["tomato"], ids["basil"]])
+    add_recipe(db, "Garlic pasta", [ids["pasta"], ids["garlic"]])
+    add_recipe(db, "Caprese", [ids["tomato"], ids["basil"], ids["cheese"]])
+    stock(db, 1, {ids["pasta"]: (500, "g"), ids["tomato"]: (4, "pieces")})
+    db.commit()
+
+    first = client.get("/api/recipes/unlocks?k=3")
+    second = client.get("/api/recipes/unlocks?k=3")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    report = first.json()
+    assert [item["name"] for item in report["ingredients"]] == ["basil", "garlic"]
+    pairs = {tuple(pair["names"]): pair["recipes_unlocked"] for pair in report["pairs"]}
+    assert pairs[("basil", "cheese")] == 2
+    assert pairs[("basil", "garlic")] == 2